@@ -19,12 +19,13 @@ import json
 import sys
 import os
 from typing import Dict, Any, Optional, List
-import psycopg2
 from dotenv import load_dotenv
+from utils.db_pool import get_pool
 
 # Import our modules
 from retrieval.hybrid_retriever import HybridRetriever
 from retrieval.context_assembly import ContextAssembler
+from retrieval.search_hit import SearchHit
 from retrieval.prompts import PromptBuilder
 from ontology.nl_mapping import NLMapper
 from retrieval.llm_client import LLMClient
@@ -33,6 +34,13 @@ from retrieval.llm_client import LLMClient
 load_dotenv()
 
 
+def _json_default(value: Any) -> Any:
+    """json.dumps default (SearchHit → dict, 그 외 Decimal/날짜 등은 문자열)"""
+    if isinstance(value, SearchHit):
+        return value.to_dict()
+    return str(value)
+
+
 class InsuranceCLI:
     """CLI 인터페이스 클래스"""
 
@@ -52,7 +60,7 @@ class InsuranceCLI:
         else:
             model = os.getenv("OLLAMA_MODEL", "qwen3:8b")
         self.llm_client = LLMClient(backend=backend, model=model)
-        self.pg_conn = psycopg2.connect(self.postgres_url)
+        self.pool = get_pool(self.postgres_url)
 
     def hybrid_query(
         self,
@@ -244,7 +252,7 @@ class InsuranceCLI:
         Returns:
             문서 리스트
         """
-        with self.pg_conn.cursor() as cur:
+        with self.pool.connection() as conn, conn.cursor() as cur:
             if doc_type:
                 cur.execute("""
                     SELECT
@@ -368,7 +376,7 @@ class InsuranceCLI:
         Returns:
             제약 조건 텍스트
         """
-        with self.pg_conn.cursor() as cur:
+        with self.pool.connection() as conn, conn.cursor() as cur:
             cur.execute("""
                 SELECT dc.clause_text
                 FROM document_clause dc
@@ -511,8 +519,6 @@ class InsuranceCLI:
 
     def close(self):
         """리소스 정리"""
-        if self.pg_conn:
-            self.pg_conn.close()
         if self.assembler:
             self.assembler.close()
         if self.nl_mapper:
@@ -630,7 +636,7 @@ Examples:
 
             if args.format == "json":
                 print("\n📄 Result (JSON):")
-                print(json.dumps(result, ensure_ascii=False, indent=2))
+                print(json.dumps(result, ensure_ascii=False, indent=2, default=_json_default))
             else:
                 print("\n📄 Answer:")
                 print(result.get("answer", "No answer generated"))
@@ -664,7 +670,7 @@ Examples:
             )
 
             if args.format == "json":
-                print(json.dumps(result, ensure_ascii=False, indent=2))
+                print(json.dumps(result, ensure_ascii=False, indent=2, default=_json_default))
 
     finally:
         cli.close()
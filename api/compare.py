@@ -14,9 +14,9 @@ Usage:
 """
 
 import os
-import psycopg2
 from typing import Dict, List, Any, Optional
 from dotenv import load_dotenv
+from utils.db_pool import get_pool
 from retrieval.hybrid_retriever import HybridRetriever
 
 # Load environment variables from .env file
@@ -43,7 +43,7 @@ class ProductComparer:
         self.postgres_url = postgres_url or os.getenv("POSTGRES_URL")
         if not self.postgres_url:
             raise ValueError("POSTGRES_URL environment variable is required. Check .env file.")
-        self.pg_conn = psycopg2.connect(self.postgres_url)
+        self.pool = get_pool(self.postgres_url)
 
         if hybrid_retriever:
             self.retriever = hybrid_retriever
@@ -374,7 +374,7 @@ class ProductComparer:
         if not product_id:
             return None
 
-        with self.pg_conn.cursor() as cur:
+        with self.pool.connection() as conn, conn.cursor() as cur:
             cur.execute("""
                 SELECT product_name
                 FROM product
@@ -411,7 +411,7 @@ class ProductComparer:
                 break
 
 
-        with self.pg_conn.cursor() as cur:
+        with self.pool.connection() as conn, conn.cursor() as cur:
             # 해당 담보가 언급된 약관 조회 (base_coverage로 검색)
             cur.execute("""
                 SELECT dc.clause_text
@@ -554,7 +554,7 @@ class ProductComparer:
 
         # DB에서 coverage/benefit 데이터 직접 조회
         # 모든 키워드가 포함된 담보 찾기
-        with self.pg_conn.cursor() as cur:
+        with self.pool.connection() as conn, conn.cursor() as cur:
             # 동적으로 LIKE 조건 생성
             like_conditions = " AND ".join([f"cov.coverage_name LIKE %s" for _ in keywords])
             like_params = [f'%{kw}%' for kw in keywords]
@@ -728,7 +728,7 @@ class ProductComparer:
         """
         sources = []
 
-        with self.pg_conn.cursor() as cur:
+        with self.pool.connection() as conn, conn.cursor() as cur:
             # Coverage와 관련된 document_clause 조회 (회사당 1개만)
             query = """
                 SELECT DISTINCT
@@ -855,8 +855,6 @@ class ProductComparer:
 
     def close(self):
         """리소스 정리"""
-        if self.pg_conn:
-            self.pg_conn.close()
         if self.retriever:
             self.retriever.close()
 
@@ -7,9 +7,13 @@
 - 가입나이
 - 면책사항
 - 갱신기간 및 비율
+
+AsyncInfoExtractor는 FastAPI async 핸들러용으로, 조회를 스레드에서 실행해
+이벤트 루프를 막지 않습니다.
 """
 
 import re
+import asyncio
 from typing import Dict, Any, Optional, List
 import psycopg2
 from psycopg2.extras import RealDictCursor
@@ -954,3 +958,24 @@ class InfoExtractor:
                     return sent.strip()[:200]
 
         return "갱신형 (상세 정보는 약관 참조)"
+
+
+class AsyncInfoExtractor(InfoExtractor):
+    """
+    InfoExtractor의 asyncio 버전
+
+    정보 타입별 추출 로직(조회 → 패턴 파싱)이 단계마다 동기 연결을 사용하므로
+    extract_info() 전체를 스레드에서 실행합니다.
+    """
+
+    async def extract_info(
+        self,
+        company: str,
+        coverage_keyword: str,
+        info_type: str,
+        query_keywords: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """InfoExtractor.extract_info 참고"""
+        return await asyncio.to_thread(
+            super().extract_info, company, coverage_keyword, info_type, query_keywords
+        )
@@ -16,15 +16,22 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 import os
+import asyncio
 from dotenv import load_dotenv
 
 # Import existing retrieval modules
 from retrieval.hybrid_retriever import HybridRetriever
-from retrieval.context_assembly import ContextAssembler
+from retrieval.async_hybrid_retriever import AsyncHybridRetriever
+from retrieval.context_assembly import AsyncContextAssembler
 from retrieval.prompts import PromptBuilder
-from ontology.nl_mapping import NLMapper
+from ontology.nl_mapping import AsyncNLMapper
+from ontology.catalog import peek_catalog, refresh_catalog
 from retrieval.llm_client import LLMClient
-from api.info_extractor import InfoExtractor
+from retrieval.tracing import SearchTrace, span, SEARCH_METRICS
+from api.info_extractor import AsyncInfoExtractor
+from utils.db_pool import close_all_pools
+from utils.async_db_pool import close_all_async_pools
+from utils.corpus_version import CorpusVersionListener, get_corpus_version_cache
 
 load_dotenv()
 
@@ -156,6 +163,7 @@ class HybridSearchRequest(BaseModel):
     lastCoverage: Optional[str] = Field(None, description="이전 대화에서 언급된 담보명 (컨텍스트 유지용)")
     templateId: Optional[str] = Field(None, description="선택된 템플릿 ID")
     searchParams: Optional[SearchParams] = Field(None, description="템플릿 기반 구조화된 검색 파라미터")
+    trace: Optional[bool] = Field(False, description="true이면 단계별 소요 시간/ef_search/fallback tier를 응답의 trace에 포함")
 
 
 class HybridSearchResponse(BaseModel):
@@ -164,6 +172,7 @@ class HybridSearchResponse(BaseModel):
     comparisonTable: Optional[List[ComparisonResult]] = None
     sources: Optional[List[Dict[str, Any]]] = None
     coverage: Optional[str] = Field(None, description="이번 응답에서 사용된 담보명 (다음 요청 시 컨텍스트로 전달)")
+    trace: Optional[Dict[str, Any]] = Field(None, description="검색 트레이스 (요청의 trace가 true일 때만)")
 
 
 class CompareRequest(BaseModel):
@@ -243,28 +252,48 @@ def extract_benefit_amount(text: str) -> str:
 
 # ========== Global Instances ==========
 
+# 요청 경로는 async 버전 사용 (DB/임베딩 대기 중 이벤트 루프가 막히지 않음)
+# 동기 retriever는 ProductComparer(스레드에서 실행), 디버깅용 엔드포인트에서 사용
 retriever: Optional[HybridRetriever] = None
-assembler: Optional[ContextAssembler] = None
+async_retriever: Optional[AsyncHybridRetriever] = None
+assembler: Optional[AsyncContextAssembler] = None
 prompt_builder: Optional[PromptBuilder] = None
-nl_mapper: Optional[NLMapper] = None
+nl_mapper: Optional[AsyncNLMapper] = None
+corpus_listener: Optional[CorpusVersionListener] = None
 llm_client: Optional[LLMClient] = None
-info_extractor: Optional[InfoExtractor] = None
+info_extractor: Optional[AsyncInfoExtractor] = None
 
 
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 초기화"""
-    global retriever, assembler, prompt_builder, nl_mapper, llm_client, info_extractor
+    global retriever, async_retriever, assembler, prompt_builder, nl_mapper, llm_client, info_extractor
+    global corpus_listener
 
     postgres_url = os.getenv("POSTGRES_URL")
     if not postgres_url:
         raise RuntimeError("POSTGRES_URL environment variable is required. Check .env file.")
 
     retriever = HybridRetriever(postgres_url=postgres_url)
-    assembler = ContextAssembler(postgres_url=postgres_url)
+    async_retriever = AsyncHybridRetriever(postgres_url=postgres_url)
+    assembler = AsyncContextAssembler(postgres_url=postgres_url)
     prompt_builder = PromptBuilder()
-    nl_mapper = NLMapper(postgres_url=postgres_url)
-    info_extractor = InfoExtractor(postgres_url=postgres_url)
+    # 엔티티 카탈로그는 프로세스 공유 스냅샷 1개 (retriever/async_retriever/nl_mapper 공용, 쿼리 1회)
+    nl_mapper = async_retriever.nl_mapper
+    await nl_mapper.load()
+
+    # 수집/담보/임베딩 스크립트의 corpus_version NOTIFY → 카탈로그 스냅샷 백그라운드 재로드 후 교체
+    # 콜백 순서: mmap 인덱스 재오픈 → 검색 캐시 키의 버전 갱신 → 카탈로그 재로드
+    # (리스너가 없으면 버전 캐시 TTL 0, 검색마다 버전 조회)
+    if os.getenv("CATALOG_HOT_RELOAD", "1") != "0":
+        corpus_listener = CorpusVersionListener(postgres_url)
+        # --export-mmap 재내보내기 → VECTOR_BACKEND=mmap 인덱스 재오픈
+        corpus_listener.add_callback(lambda version, reason: retriever.reload_mmap_index())
+        corpus_listener.add_callback(lambda version, reason: async_retriever.reload_mmap_index())
+        get_corpus_version_cache(postgres_url).attach(corpus_listener)
+        corpus_listener.add_callback(lambda version, reason: refresh_catalog(postgres_url))
+        corpus_listener.start()
+    info_extractor = AsyncInfoExtractor(postgres_url=postgres_url)
     # LLM client initialization - model selection based on backend
     backend = os.getenv("LLM_BACKEND", "ollama")
     if backend == "openai":
@@ -280,6 +309,10 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """서버 종료 시 정리"""
+    if corpus_listener:
+        corpus_listener.stop()
+    close_all_pools()
+    await close_all_async_pools()
     print("🔴 Insurance Ontology API shutting down")
 
 
@@ -298,11 +331,20 @@ async def root():
 @app.get("/health")
 async def health_check():
     """상세 헬스 체크"""
+    catalog = peek_catalog(async_retriever.postgres_url) if async_retriever else None
     return {
         "status": "healthy",
         "postgres": "connected" if retriever else "disconnected",
         "llm": os.getenv("LLM_BACKEND", "ollama"),
-        "vector_backend": os.getenv("VECTOR_BACKEND", "pgvector")
+        "vector_backend": os.getenv("VECTOR_BACKEND", "pgvector"),
+        "vector_index": retriever.mmap_index.info() if retriever and retriever.mmap_index else {},
+        "embedding_cache": retriever.embedder.cache_stats() if retriever else {},
+        "search_cache": retriever.search_cache.stats() if retriever and retriever.search_cache else {},
+        "db_pool": retriever.pool.stats() if retriever else {},
+        "async_db_pool": async_retriever.pool.stats() if async_retriever else {},
+        "entity_catalog": catalog.stats() if catalog else {},
+        "entity_cache": nl_mapper.entity_memo.stats() if nl_mapper else {},
+        "search_metrics": SEARCH_METRICS.stats()
     }
 
 
@@ -319,7 +361,7 @@ async def test_search(query: str = "삼성 암진단비"):
         return {
             "query": query,
             "result_count": len(results),
-            "results": results[:3]  # First 3 results
+            "results": [result.to_dict() for result in results[:3]]  # First 3 results
         }
     except Exception as e:
         import traceback
@@ -339,9 +381,11 @@ async def hybrid_search(request: HybridSearchRequest):
     3. LLM으로 자연어 응답 생성
     4. 비교 테이블 생성 (상품/보장 비교)
     """
-    if not all([retriever, nl_mapper, llm_client]):
+    if not all([retriever, async_retriever, nl_mapper, llm_client]):
         raise HTTPException(status_code=503, detail="Service not initialized")
 
+    trace = SearchTrace() if request.trace else None
+
     try:
         # 1. Extract age from user profile
         age = None
@@ -352,7 +396,8 @@ async def hybrid_search(request: HybridSearchRequest):
 
         # 2. NL Mapping: Extract entities from query
         # 항상 쿼리에서 엔티티 추출 먼저 수행
-        nl_entities = nl_mapper.extract_entities(request.query)
+        with span(trace, "api.entities"):
+            nl_entities = nl_mapper.extract_entities(request.query)
         print(f"[DEBUG] NL entities from query: {nl_entities}")
 
         # 템플릿 기반 검색이면 템플릿 파라미터를 폴백으로 사용
@@ -459,12 +504,13 @@ async def hybrid_search(request: HybridSearchRequest):
             print(f"[DEBUG] Query keywords from NL: {query_keywords}")
 
             try:
-                info_result = info_extractor.extract_info(
-                    company=company,
-                    coverage_keyword=coverage_keyword,
-                    info_type=info_type,
-                    query_keywords=query_keywords if query_keywords else None
-                )
+                with span(trace, "api.info_extract", info_type=info_type):
+                    info_result = await info_extractor.extract_info(
+                        company=company,
+                        coverage_keyword=coverage_keyword,
+                        info_type=info_type,
+                        query_keywords=query_keywords if query_keywords else None
+                    )
 
                 # Initialize variables
                 coverage_name = coverage_keyword  # Default to query coverage
@@ -500,7 +546,7 @@ async def hybrid_search(request: HybridSearchRequest):
 
                     # Generate LLM answer
                     print(f"[DEBUG] Generating LLM answer for info extraction")
-                    llm_answer = llm_client.generate(prompt)
+                    llm_answer = await asyncio.to_thread(llm_client.generate, prompt, trace=trace)
 
                     # Build final answer with header
                     answer_parts = [
@@ -539,7 +585,8 @@ async def hybrid_search(request: HybridSearchRequest):
                     answer=answer,
                     comparisonTable=None,
                     sources=sources if sources else None,
-                    coverage=coverage_name
+                    coverage=coverage_name,
+                    trace=trace.finish() if trace else None
                 )
 
             except Exception as e:
@@ -567,14 +614,16 @@ async def hybrid_search(request: HybridSearchRequest):
             comparer = ProductComparer(hybrid_retriever=retriever)
 
             try:
-                comparison_result = comparer.compare_products(
-                    companies=company_names_in_query,
-                    coverage=valid_coverages,  # Pass list of coverages
-                    include_sources=True,
-                    include_recommendation=True,
-                    exclude_keywords=exclude_keywords if exclude_keywords else None,
-                    query_keywords=query_keywords if query_keywords else None
-                )
+                with span(trace, "api.compare_products", companies=len(company_names_in_query)):
+                    comparison_result = await asyncio.to_thread(
+                        comparer.compare_products,
+                        companies=company_names_in_query,
+                        coverage=valid_coverages,  # Pass list of coverages
+                        include_sources=True,
+                        include_recommendation=True,
+                        exclude_keywords=exclude_keywords if exclude_keywords else None,
+                        query_keywords=query_keywords if query_keywords else None
+                    )
 
                 # Convert ProductComparer result to HybridSearchResponse format
                 coverages_list = comparison_result["coverages"]
@@ -704,7 +753,8 @@ async def hybrid_search(request: HybridSearchRequest):
                     answer=llm_answer,
                     comparisonTable=comparison_table_data if comparison_table_data else None,
                     sources=sources[:5] if sources else None,
-                    coverage=", ".join(coverages_list)  # Join multiple coverages
+                    coverage=", ".join(coverages_list),  # Join multiple coverages
+                    trace=trace.finish() if trace else None
                 )
 
             except Exception as e:
@@ -712,12 +762,13 @@ async def hybrid_search(request: HybridSearchRequest):
                 import traceback
                 traceback.print_exc()
                 # Fallback to original multi-company search
-                results_by_company = retriever.search_multi_company(
+                results_by_company = await async_retriever.search_multi_company(
                     query=request.query,
                     company_names=company_names_in_query,
                     coverage_name=valid_coverages[0] if valid_coverages else None,
                     top_k=5,
-                    search_top_k=20
+                    search_top_k=20,
+                    trace=trace
                 )
 
                 # Flatten results
@@ -738,16 +789,15 @@ async def hybrid_search(request: HybridSearchRequest):
 
             print(f"[DEBUG] Single company search, filters: {filters}")
 
-            # NOTE: clause_embedding metadata doesn't have company_id, only product_id
-            # So company_id filter won't work. We need to use product_id instead.
-            # For now, just do general vector search without company filter
-            # TODO: Add company_id to clause_embedding metadata OR convert company_id to product_ids
+            # NOTE: retriever.search()가 쿼리에서 추출한 company_id/product_id 필터를
+            # clause_embedding의 비정규화 컬럼으로 직접 적용하므로 여기서는 추가 필터 없음
 
             print(f"[DEBUG] Using general search (coverage_ids ignored due to NL mapper inaccuracy)")
-            retrieved_clauses = retriever.search(
+            retrieved_clauses = await async_retriever.search(
                 query=request.query,
                 top_k=20,
-                filters={}  # Empty filters for now - metadata doesn't support company_id
+                filters={},
+                trace=trace
             )
 
             print(f"[DEBUG] Retrieved {len(retrieved_clauses)} clauses")
@@ -759,43 +809,38 @@ async def hybrid_search(request: HybridSearchRequest):
             company_names = nl_entities.get("company_names", [])
 
             if coverage_kw and company_names:
-                import psycopg2
-                conn = psycopg2.connect(os.getenv("POSTGRES_URL"))
-                try:
-                    cur = conn.cursor()
-                    cur.execute("""
-                        SELECT
-                            comp.company_name,
-                            p.product_name,
-                            cov.coverage_name,
-                            b.benefit_amount
-                        FROM coverage cov
-                        JOIN product p ON cov.product_id = p.id
-                        JOIN company comp ON p.company_id = comp.id
-                        LEFT JOIN benefit b ON cov.id = b.coverage_id
-                        WHERE comp.company_name = ANY(%s)
-                          AND cov.coverage_name LIKE %s
-                        ORDER BY comp.company_name, cov.coverage_name
-                        LIMIT 20
-                    """, (company_names, f'%{coverage_kw}%'))
-
-                    rows = cur.fetchall()
-                    if rows:
-                        fallback_context = "\n\n## 담보 정보 (Coverage Information)\n\n"
-                        for row in rows:
-                            comp, prod, cov, amt = row
-                            amt_str = f"{int(amt):,}원" if amt else "N/A"
-                            fallback_context += f"- **{comp}** | {prod}\n  - 담보: {cov}\n  - 보장금액: {amt_str}\n\n"
-
-                    cur.close()
-                finally:
-                    conn.close()
+                with span(trace, "api.coverage_fallback"):
+                    async with async_retriever.pool.connection() as conn, conn.cursor() as cur:
+                        await cur.execute("""
+                            SELECT
+                                comp.company_name,
+                                p.product_name,
+                                cov.coverage_name,
+                                b.benefit_amount
+                            FROM coverage cov
+                            JOIN product p ON cov.product_id = p.id
+                            JOIN company comp ON p.company_id = comp.id
+                            LEFT JOIN benefit b ON cov.id = b.coverage_id
+                            WHERE comp.company_name = ANY(%s)
+                              AND cov.coverage_name LIKE %s
+                            ORDER BY comp.company_name, cov.coverage_name
+                            LIMIT 20
+                        """, (company_names, f'%{coverage_kw}%'))
+
+                        rows = await cur.fetchall()
+                if rows:
+                    fallback_context = "\n\n## 담보 정보 (Coverage Information)\n\n"
+                    for row in rows:
+                        comp, prod, cov, amt = row
+                        amt_str = f"{int(amt):,}원" if amt else "N/A"
+                        fallback_context += f"- **{comp}** | {prod}\n  - 담보: {cov}\n  - 보장금액: {amt_str}\n\n"
 
         # 5b. Assemble context
-        context = assembler.assemble(
+        context = await assembler.assemble(
             vector_results=retrieved_clauses,
             query=request.query,
-            max_context_length=4000
+            max_context_length=4000,
+            trace=trace
         )
 
         # 6. Build prompt
@@ -830,7 +875,7 @@ async def hybrid_search(request: HybridSearchRequest):
         print(f"[DEBUG] Starting LLM generation with prompt length: {len(prompt)}")
         import time
         start_time = time.time()
-        llm_answer = llm_client.generate(prompt)
+        llm_answer = await asyncio.to_thread(llm_client.generate, prompt, trace=trace)
         elapsed = time.time() - start_time
         print(f"[DEBUG] LLM generation completed in {elapsed:.2f}s")
 
@@ -857,7 +902,8 @@ async def hybrid_search(request: HybridSearchRequest):
         return HybridSearchResponse(
             answer=llm_answer,
             comparisonTable=comparison_table if comparison_table else None,
-            sources=sources
+            sources=sources,
+            trace=trace.finish() if trace else None
         )
 
     except Exception as e:
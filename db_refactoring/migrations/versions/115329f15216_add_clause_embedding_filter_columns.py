@@ -0,0 +1,87 @@
+"""add_clause_embedding_filter_columns
+
+Revision ID: 115329f15216
+Revises: e70cdd9c14e8
+Create Date: 2025-12-17
+
+clause_embedding 필터 컬럼 비정규화:
+- company_id, product_id, doc_type, clause_type 컬럼 추가 (기존: metadata JSONB + document 조인)
+- 필터 조합용 B-tree 인덱스
+- doc_type별 partial HNSW 인덱스 (필터된 벡터 검색이 작은 인덱스를 직접 사용)
+
+적용 후 신규 임베딩은 vector_index/build_index.py가 컬럼을 함께 채웁니다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '115329f15216'
+down_revision: Union[str, Sequence[str], None] = 'e70cdd9c14e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# partial HNSW 인덱스를 생성할 doc_type (HybridRetriever에서 필터로 사용하는 값)
+PARTIAL_INDEX_DOC_TYPES = ['proposal', 'product_summary', 'business_spec', 'terms']
+
+
+def upgrade() -> None:
+    """
+    1. 필터 컬럼 추가
+    2. document_clause/document에서 기존 데이터 backfill
+    3. B-tree 인덱스 + doc_type별 partial HNSW 인덱스 생성
+    """
+    # 1. 필터 컬럼
+    op.add_column('clause_embedding', sa.Column('company_id', sa.Integer(), nullable=True,
+                                                comment='보험사 ID (document.company_id 비정규화)'))
+    op.add_column('clause_embedding', sa.Column('product_id', sa.Integer(), nullable=True,
+                                                comment='상품 ID (document.product_id 비정규화)'))
+    op.add_column('clause_embedding', sa.Column('doc_type', sa.String(50), nullable=True,
+                                                comment='문서 타입 (document.doc_type 비정규화)'))
+    op.add_column('clause_embedding', sa.Column('clause_type', sa.String(50), nullable=True,
+                                                comment='조항 타입 (document_clause.clause_type 비정규화)'))
+
+    # 2. 기존 임베딩 backfill
+    op.execute("""
+        UPDATE clause_embedding ce
+        SET company_id = d.company_id,
+            product_id = d.product_id,
+            doc_type = d.doc_type,
+            clause_type = dc.clause_type
+        FROM document_clause dc
+        JOIN document d ON dc.document_id = d.id
+        WHERE ce.clause_id = dc.id
+    """)
+
+    # 3. 인덱스
+    op.create_index('ix_clause_embedding_company_doc_type', 'clause_embedding',
+                    ['company_id', 'doc_type', 'clause_type'])
+    op.create_index('ix_clause_embedding_product_id', 'clause_embedding', ['product_id'])
+
+    for doc_type in PARTIAL_INDEX_DOC_TYPES:
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_clause_embedding_hnsw_{doc_type}
+            ON clause_embedding
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+            WHERE doc_type = '{doc_type}'
+        """)
+
+    op.execute("ANALYZE clause_embedding")
+
+
+def downgrade() -> None:
+    """필터 컬럼 및 인덱스 삭제"""
+    for doc_type in PARTIAL_INDEX_DOC_TYPES:
+        op.execute(f"DROP INDEX IF EXISTS idx_clause_embedding_hnsw_{doc_type}")
+
+    op.drop_index('ix_clause_embedding_product_id', table_name='clause_embedding')
+    op.drop_index('ix_clause_embedding_company_doc_type', table_name='clause_embedding')
+
+    op.drop_column('clause_embedding', 'clause_type')
+    op.drop_column('clause_embedding', 'doc_type')
+    op.drop_column('clause_embedding', 'product_id')
+    op.drop_column('clause_embedding', 'company_id')
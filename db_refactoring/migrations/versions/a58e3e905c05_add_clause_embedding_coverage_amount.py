@@ -0,0 +1,39 @@
+"""add_clause_embedding_coverage_amount
+
+Revision ID: a58e3e905c05
+Revises: 115329f15216
+Create Date: 2025-12-17
+
+clause_embedding.coverage_amount (bigint) 추가:
+- 기존: 검색 시 metadata->'structured_data'->>'coverage_amount' 문자열을
+  매 행마다 CASE ... REGEXP_REPLACE로 파싱
+- 변경: 인덱싱 시 한 번 파싱하여 저장, B-tree 범위 조건으로 필터
+
+값 채우기 (ingestion의 TableParser.parse_amount 사용):
+    python -m vector_index.build_index --backfill-amounts
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a58e3e905c05'
+down_revision: Union[str, Sequence[str], None] = '115329f15216'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """coverage_amount 컬럼 + 부분 B-tree 인덱스 생성"""
+    op.add_column('clause_embedding', sa.Column('coverage_amount', sa.BigInteger(), nullable=True,
+                                                comment='가입금액 (원, structured_data.coverage_amount 파싱 결과)'))
+    op.create_index('ix_clause_embedding_coverage_amount', 'clause_embedding', ['coverage_amount'],
+                    postgresql_where=sa.text('coverage_amount IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """coverage_amount 컬럼 삭제"""
+    op.drop_index('ix_clause_embedding_coverage_amount', table_name='clause_embedding')
+    op.drop_column('clause_embedding', 'coverage_amount')
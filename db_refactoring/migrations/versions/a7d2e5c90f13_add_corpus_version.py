@@ -0,0 +1,44 @@
+"""add_corpus_version
+
+Revision ID: a7d2e5c90f13
+Revises: f6a3c8d21e47
+Create Date: 2025-12-18
+
+검색 코퍼스 버전 카운터 (HybridRetriever 검색 결과 캐시 무효화):
+- 단일 행(id = 1) 테이블, version은 수집/임베딩 스크립트가 종료 시 1씩 증가
+  (utils/corpus_version.bump_corpus_version)
+- 검색 결과 캐시 키에 version이 포함되므로 데이터가 바뀌면 이전 결과는 조회되지 않음
+- reason/updated_at은 마지막으로 버전을 올린 스크립트 확인용
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e5c90f13'
+down_revision: Union[str, Sequence[str], None] = 'f6a3c8d21e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """corpus_version 테이블 생성 + 초기 행 삽입"""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS corpus_version (
+            id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+            version BIGINT NOT NULL DEFAULT 1,
+            reason TEXT,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        INSERT INTO corpus_version (id, version, reason)
+        VALUES (1, 1, 'initial')
+        ON CONFLICT (id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """corpus_version 테이블 삭제"""
+    op.execute("DROP TABLE IF EXISTS corpus_version")
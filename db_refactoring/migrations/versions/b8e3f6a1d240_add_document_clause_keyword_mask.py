@@ -0,0 +1,96 @@
+"""add_document_clause_keyword_mask
+
+Revision ID: b8e3f6a1d240
+Revises: a7d2e5c90f13
+Create Date: 2025-12-19
+
+WARNING: 다운타임 - ADD COLUMN ... GENERATED ALWAYS ... STORED는 ACCESS EXCLUSIVE 잠금을 잡고
+document_clause 전체를 재작성합니다. 업그레이드가 끝날 때까지 이 테이블의 모든 읽기/쓰기
+(검색 포함)가 막히므로 점검 시간에 실행하세요 (아래 "NOTE: 비용" 참고).
+
+WARNING: 이 파일의 KEYWORD_MASK_TERMS / AMOUNT_PATTERNS는
+retrieval/hybrid_retriever.py의 KEYWORD_MASK_TERMS / AMOUNT_PATTERNS와 항상 함께 수정해야 합니다
+(순서 포함, 새 마이그레이션으로 컬럼 재생성).
+
+document_clause.keyword_mask (HybridRetriever 키워드 부스팅용 비트마스크):
+- 비트 i = KEYWORD_MASK_TERMS[i]가 clause_text에 포함되는지 여부 (대소문자 무시)
+- 비트 62 = AMOUNT_PATTERNS 중 하나라도 포함되는지 여부 (금액 정보 있는 조항)
+- GENERATED ALWAYS ... STORED 컬럼이므로 수집 스크립트 변경 없이 INSERT/UPDATE 시 자동 계산
+
+벡터/lexical 후보 조회는 조항 텍스트 대신 이 컬럼만 가져오고, 재순위화 후 남은
+top_k 조항의 텍스트만 조회합니다.
+
+NOTE: 어휘 순서는 retrieval/hybrid_retriever.py의 KEYWORD_MASK_TERMS와, 금액 패턴은
+같은 파일의 AMOUNT_PATTERNS와 같아야 합니다.
+HybridRetriever는 시작 시 이 컬럼의 생성 식(pg_get_expr)에서 어휘를 읽어 비교하고,
+다르면 RuntimeError로 실패합니다 (check_keyword_mask_vocabulary).
+어휘를 바꾸려면 새 마이그레이션에서 컬럼을 다시 생성하세요 (어휘에 없는 부스팅 키워드는
+검색 시 SQL strpos로 계산되므로 결과는 같고 속도만 다름).
+
+NOTE: 비용
+- 62개 어휘 + 금액 패턴의 strpos(lower(clause_text))가 document_clause의 모든
+  INSERT와 UPDATE(clause_text 외 컬럼 변경 포함)마다 실행됩니다 (대량 수집 시 행당 CPU 증가).
+- STORED generated column 추가는 ACCESS EXCLUSIVE 잠금으로 테이블 전체를 재작성하므로,
+  업그레이드 동안 document_clause 읽기/쓰기가 모두 막힙니다 (검색 중단, 점검 시간에 실행).
+  컬럼을 다시 생성하는 마이그레이션도 같습니다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f6a1d240'
+down_revision: Union[str, Sequence[str], None] = 'a7d2e5c90f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 비트 순서 고정 (COVERAGE_BOOST_KEYWORDS 확장 키워드 + NLMapper 도메인 키워드)
+# retrieval/hybrid_retriever.py KEYWORD_MASK_TERMS와 같은 순서로 함께 수정
+KEYWORD_MASK_TERMS = [
+    '수술', '수술비', '수술담보', '입원', '입원비', '입원일당', '입원담보',
+    '진단', '진단금', '진단비', '진단담보',
+    '암', '암진단', '암수술', '암입원', '암치료', '유사암', '재진단암',
+    '뇌', '뇌출혈', '뇌졸중', '뇌경색', '뇌혈관',
+    '심장', '심근경색', '급성심근경색', '심혈관',
+    '사망', '사망보험금', '사망담보', '후유장해', '장해', '장해급여',
+    '치료', '치료비', '직접치료',
+    '제자리암', '경계성종양', '4대유사암', '갑상선암', '기타피부암',
+    '일반암', '소액암', '고액암',
+    '보장', '통원', '질병', '상해', '면책', '감액', '지급', '한도', '제한',
+    '가입', '나이', '기간', '금액', '조건', '다빈치', '로봇',
+]
+
+# retrieval/hybrid_retriever.py AMOUNT_PATTERNS와 함께 수정
+AMOUNT_PATTERNS = ['가입금액:', '가입금액 :', '만원,', '천만원', '백만원']
+AMOUNT_BIT = 62
+
+
+def _contains(term: str) -> str:
+    """소문자 clause_text에 term이 포함되면 true인 SQL 식"""
+    return f"strpos(lower(coalesce(clause_text, '')), '{term.lower()}') > 0"
+
+
+def upgrade() -> None:
+    """keyword_mask generated column 추가 (기존 행은 테이블 재작성 시 계산)"""
+    assert len(KEYWORD_MASK_TERMS) < AMOUNT_BIT
+
+    bits = [
+        f"(({_contains(term)})::int::bigint << {bit})"
+        for bit, term in enumerate(KEYWORD_MASK_TERMS)
+    ]
+    amount_condition = " OR ".join(_contains(pattern) for pattern in AMOUNT_PATTERNS)
+    bits.append(f"(({amount_condition})::int::bigint << {AMOUNT_BIT})")
+
+    op.execute(f"""
+        ALTER TABLE document_clause
+        ADD COLUMN IF NOT EXISTS keyword_mask BIGINT
+        GENERATED ALWAYS AS ({" | ".join(bits)}) STORED
+    """)
+    op.execute("ANALYZE document_clause")
+
+
+def downgrade() -> None:
+    """keyword_mask 컬럼 삭제"""
+    op.execute("ALTER TABLE document_clause DROP COLUMN IF EXISTS keyword_mask")
@@ -0,0 +1,40 @@
+"""add_document_clause_trgm_index
+
+Revision ID: c41d7a2e9b03
+Revises: a58e3e905c05
+Create Date: 2025-12-17
+
+document_clause.clause_text trigram GIN 인덱스 (HybridRetriever lexical 채널):
+- 정확한 용어 질의("다빈치 로봇 수술", KCD 코드 "C73")를 ILIKE '%용어%'로 검색
+- 한국어는 공백 단위 tsvector(simple)로는 복합어 내부 용어를 찾지 못하므로 trigram 사용
+- trigram은 3글자 이상 용어에서만 인덱스를 사용 (짧은 용어는 점수 계산에만 사용)
+
+NOTE: pg_trgm은 LC_CTYPE 기준으로 문자를 판단하므로 DB 로케일이 UTF-8
+(예: en_US.utf8, pgvector 이미지 기본값)이어야 한글 trigram이 생성됩니다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7a2e9b03'
+down_revision: Union[str, Sequence[str], None] = 'a58e3e905c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """pg_trgm 확장 + clause_text GIN trigram 인덱스 생성"""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_document_clause_clause_text_trgm
+        ON document_clause
+        USING gin (clause_text gin_trgm_ops)
+    """)
+    op.execute("ANALYZE document_clause")
+
+
+def downgrade() -> None:
+    """trigram 인덱스 삭제 (pg_trgm 확장은 다른 객체가 사용할 수 있으므로 유지)"""
+    op.execute("DROP INDEX IF EXISTS ix_document_clause_clause_text_trgm")
@@ -0,0 +1,48 @@
+"""add_coverage_name_catalog
+
+Revision ID: c9f4a7b2e351
+Revises: b8e3f6a1d240
+Create Date: 2025-12-20
+
+coverage_name_catalog materialized view (NLMapper 엔티티 카탈로그의 담보명 표면형):
+- clause_embedding.metadata->structured_data->>'coverage_name'의 서로 다른 값
+  (coverage 테이블에 없는 담보명 보완용)
+- 카탈로그 로드는 전체 임베딩 행 DISTINCT 대신 이 뷰의 unique 인덱스만 스캔
+- 임베딩 파이프라인(vector_index/build_index.py)이 임베딩/메타데이터를 쓴 뒤
+  REFRESH MATERIALIZED VIEW CONCURRENTLY로 갱신 (ontology/catalog.refresh_coverage_name_catalog)
+- CONCURRENTLY 갱신에는 unique 인덱스가 필요하며, 갱신 중에도 조회가 막히지 않음
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f4a7b2e351'
+down_revision: Union[str, Sequence[str], None] = 'b8e3f6a1d240'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """coverage_name_catalog materialized view + unique 인덱스 생성"""
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS coverage_name_catalog AS
+        SELECT
+            ce.metadata->'structured_data'->>'coverage_name' AS coverage_name,
+            COUNT(*) AS embedding_count
+        FROM clause_embedding ce
+        WHERE ce.metadata->'structured_data'->>'coverage_name' IS NOT NULL
+          AND ce.metadata->'structured_data'->>'coverage_name' != ''
+        GROUP BY 1
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_coverage_name_catalog_coverage_name
+        ON coverage_name_catalog (coverage_name)
+    """)
+    op.execute("ANALYZE coverage_name_catalog")
+
+
+def downgrade() -> None:
+    """coverage_name_catalog 삭제 (카탈로그 로드는 clause_embedding DISTINCT로 되돌아감)"""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS coverage_name_catalog")
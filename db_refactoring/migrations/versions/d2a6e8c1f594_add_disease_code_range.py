@@ -0,0 +1,47 @@
+"""add_disease_code_range
+
+Revision ID: d2a6e8c1f594
+Revises: c9f4a7b2e351
+Create Date: 2025-12-21
+
+disease_code_range 테이블 (질병코드 집합의 코드 구간):
+- 질병코드 집합(예: 악성신생물 C00-C97)을 코드마다 disease_code 행으로 펼치지 않고
+  (start_code, end_code) 구간 1행으로 저장 (단일 코드는 start_code = end_code)
+- end_code는 하위 코드 포함 (C97 → C97, C97.x 모두 포함)
+- 메모리 인덱스(ontology/disease_index.DiseaseCodeIndex)가 구간을 정렬 배열로 만들어
+  코드 → 집합 조회를 bisect로 처리
+- disease_code에는 집합별 3자리 코드(Neo4j DiseaseCode 노드용)와
+  KCD 전체 코드/설명(`load_disease_codes --kcd-csv`, 'KCD' 집합)을 저장
+- 업그레이드 후 `python -m ingestion.load_disease_codes`를 다시 실행하면 구간이 채워짐
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6e8c1f594'
+down_revision: Union[str, Sequence[str], None] = 'c9f4a7b2e351'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """disease_code_range 테이블 생성"""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS disease_code_range (
+            id SERIAL PRIMARY KEY,
+            code_set_id INTEGER NOT NULL REFERENCES disease_code_set(id) ON DELETE CASCADE,
+            start_code VARCHAR(20) NOT NULL,
+            end_code VARCHAR(20) NOT NULL,
+            code_type VARCHAR(10),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (code_set_id, start_code, end_code)
+        )
+    """)
+    op.execute("COMMENT ON TABLE disease_code_range IS '질병코드 집합의 코드 구간 (end_code 하위 코드 포함)'")
+
+
+def downgrade() -> None:
+    """disease_code_range 테이블 삭제"""
+    op.execute("DROP TABLE IF EXISTS disease_code_range")
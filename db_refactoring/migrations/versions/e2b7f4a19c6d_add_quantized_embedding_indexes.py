@@ -0,0 +1,75 @@
+"""add_quantized_embedding_indexes
+
+Revision ID: e2b7f4a19c6d
+Revises: c41d7a2e9b03
+Create Date: 2025-12-17
+
+clause_embedding.embedding 양자화 HNSW 표현식 인덱스 (HybridRetriever VECTOR_QUANTIZATION):
+- halfvec: embedding::halfvec(1536) (float16, 인덱스 크기 약 1/2)
+  + HybridRetriever가 필터로 사용하는 doc_type별 partial 인덱스
+- binary: binary_quantize(embedding)::bit(1536) (1bit, 인덱스 크기 약 1/32, hamming 거리)
+
+표현식 인덱스이므로 별도 컬럼 없이 build_index.py가 INSERT하는 행이 자동으로 색인됩니다.
+검색은 양자화 인덱스로 top_k × VECTOR_RESCORE_FACTOR개 후보를 찾고 float32 벡터로 재정렬합니다.
+
+pgvector 0.7.0 이상 필요 (halfvec, binary_quantize).
+
+이 마이그레이션은 float32 HNSW 인덱스를 그대로 두므로 인덱스 메모리는 오히려 늘어납니다.
+양자화 모드로 전환한 뒤
+`VECTOR_QUANTIZATION=halfvec python -m vector_index.build_index --drop-float32-indexes`로
+float32 HNSW 인덱스(idx_clause_embedding_hnsw, _{doc_type})를 삭제하세요
+(VECTOR_QUANTIZATION=none으로 되돌릴 때는 --create-float32-indexes).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7f4a19c6d'
+down_revision: Union[str, Sequence[str], None] = 'c41d7a2e9b03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# text-embedding-3-small 차원 (표현식 인덱스의 캐스팅 타입과 검색 SQL이 일치해야 함)
+EMBEDDING_DIMENSION = 1536
+
+# partial halfvec 인덱스를 생성할 doc_type (115329f15216과 동일)
+PARTIAL_INDEX_DOC_TYPES = ['proposal', 'product_summary', 'business_spec', 'terms']
+
+
+def upgrade() -> None:
+    """halfvec / binary 양자화 HNSW 인덱스 생성"""
+    op.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_clause_embedding_hnsw_halfvec
+        ON clause_embedding
+        USING hnsw ((embedding::halfvec({EMBEDDING_DIMENSION})) halfvec_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+    for doc_type in PARTIAL_INDEX_DOC_TYPES:
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_clause_embedding_hnsw_halfvec_{doc_type}
+            ON clause_embedding
+            USING hnsw ((embedding::halfvec({EMBEDDING_DIMENSION})) halfvec_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+            WHERE doc_type = '{doc_type}'
+        """)
+
+    op.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_clause_embedding_hnsw_binary
+        ON clause_embedding
+        USING hnsw ((binary_quantize(embedding)::bit({EMBEDDING_DIMENSION})) bit_hamming_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+    op.execute("ANALYZE clause_embedding")
+
+
+def downgrade() -> None:
+    """양자화 인덱스 삭제"""
+    op.execute("DROP INDEX IF EXISTS idx_clause_embedding_hnsw_binary")
+    for doc_type in PARTIAL_INDEX_DOC_TYPES:
+        op.execute(f"DROP INDEX IF EXISTS idx_clause_embedding_hnsw_halfvec_{doc_type}")
+    op.execute("DROP INDEX IF EXISTS idx_clause_embedding_hnsw_halfvec")
@@ -0,0 +1,64 @@
+"""add_matryoshka_coarse_index
+
+Revision ID: f6a3c8d21e47
+Revises: e2b7f4a19c6d
+Create Date: 2025-12-17
+
+clause_embedding 앞 256차원(Matryoshka) HNSW 표현식 인덱스 (HybridRetriever VECTOR_COARSE_DIMENSIONS):
+- text-embedding-3 모델은 앞 N차원만 잘라 써도 의미가 유지되도록 학습됨
+- subvector(embedding, 1, 256)::vector(256) 인덱스로 1단계 top-N 후보 검색
+  (그래프/거리 계산 비용 약 1/6) 후 1536차원 전체 벡터로 재정렬
+- 전체 + HybridRetriever가 필터로 사용하는 doc_type별 partial 인덱스
+
+다른 차원을 쓰려면 같은 식으로 인덱스를 추가하고 VECTOR_COARSE_DIMENSIONS를 맞춰야 합니다.
+(인덱스 식과 검색 SQL의 차원이 다르면 1단계가 전체 스캔이 됩니다)
+
+pgvector 0.7.0 이상 필요 (subvector).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a3c8d21e47'
+down_revision: Union[str, Sequence[str], None] = 'e2b7f4a19c6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 1단계 검색 차원 (HybridRetriever VECTOR_COARSE_DIMENSIONS와 일치해야 함)
+COARSE_DIMENSIONS = 256
+
+# partial 인덱스를 생성할 doc_type (115329f15216과 동일)
+PARTIAL_INDEX_DOC_TYPES = ['proposal', 'product_summary', 'business_spec', 'terms']
+
+
+def upgrade() -> None:
+    """앞 COARSE_DIMENSIONS 차원 HNSW 인덱스 생성"""
+    expression = f"(subvector(embedding, 1, {COARSE_DIMENSIONS})::vector({COARSE_DIMENSIONS}))"
+
+    op.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_clause_embedding_hnsw_coarse{COARSE_DIMENSIONS}
+        ON clause_embedding
+        USING hnsw ({expression} vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+    for doc_type in PARTIAL_INDEX_DOC_TYPES:
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_clause_embedding_hnsw_coarse{COARSE_DIMENSIONS}_{doc_type}
+            ON clause_embedding
+            USING hnsw ({expression} vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+            WHERE doc_type = '{doc_type}'
+        """)
+
+    op.execute("ANALYZE clause_embedding")
+
+
+def downgrade() -> None:
+    """Matryoshka 인덱스 삭제"""
+    for doc_type in PARTIAL_INDEX_DOC_TYPES:
+        op.execute(f"DROP INDEX IF EXISTS idx_clause_embedding_hnsw_coarse{COARSE_DIMENSIONS}_{doc_type}")
+    op.execute(f"DROP INDEX IF EXISTS idx_clause_embedding_hnsw_coarse{COARSE_DIMENSIONS}")
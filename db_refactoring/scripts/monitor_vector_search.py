@@ -4,6 +4,7 @@
 
 용도: pgvector HNSW 인덱스 성능 모니터링 및 벤치마크
 실행: python db_refactoring/scripts/monitor_vector_search.py [--benchmark] [--stats]
+      python db_refactoring/scripts/monitor_vector_search.py --two-stage [--coarse-dims 256] [--rescore-factors 2,4,8]
 """
 
 import os
@@ -173,6 +174,111 @@ class VectorSearchMonitor:
 
         return results
 
+    def benchmark_two_stage(self, num_queries: int = 20, top_k: int = 10,
+                            coarse_dims: int = 256, rescore_factors: list = None,
+                            ef_search: int = 100) -> dict:
+        """
+        Matryoshka 2단계 검색 recall/latency 리포트
+
+        정답: 1536차원 전체 벡터 exact 검색 (인덱스 미사용)
+        비교: 전체 벡터 HNSW 1단계 검색, 앞 coarse_dims 차원 HNSW 후보(top_k × factor) + 전체 벡터 재정렬
+        """
+        if rescore_factors is None:
+            rescore_factors = [2, 4, 8]
+
+        sample_embeddings = self.get_sample_embeddings(num_queries)
+        if not sample_embeddings:
+            return {'error': '임베딩 데이터가 없습니다. build_index를 먼저 실행하세요.'}
+
+        coarse_expr = f"subvector(embedding, 1, {coarse_dims})::vector({coarse_dims})"
+        coarse_query = f"subvector(%(q)s::vector, 1, {coarse_dims})::vector({coarse_dims})"
+
+        # config 이름 → (SQL, 1단계 후보 수)
+        configs = {'hnsw_full': ("""
+            SELECT clause_id FROM clause_embedding
+            ORDER BY embedding <=> %(q)s::vector
+            LIMIT %(k)s
+        """, top_k)}
+        for factor in rescore_factors:
+            configs[f'coarse{coarse_dims}_x{factor}'] = (f"""
+                SELECT clause_id FROM (
+                    SELECT clause_id, embedding FROM clause_embedding
+                    ORDER BY {coarse_expr} <=> {coarse_query}
+                    LIMIT %(n)s
+                ) c
+                ORDER BY embedding <=> %(q)s::vector
+                LIMIT %(k)s
+            """, top_k * factor)
+
+        conn = self.get_connection()
+        cur = conn.cursor()
+
+        latencies = {name: [] for name in configs}
+        recalls = {name: [] for name in configs}
+
+        for _, embedding in sample_embeddings:
+            # psycopg2는 vector를 '[...]' 문자열로 반환하므로 그대로 파라미터로 사용
+            params = {'q': embedding, 'k': top_k}
+
+            # 정답 (exact)
+            cur.execute("SET enable_indexscan = off")
+            cur.execute("""
+                SELECT clause_id FROM clause_embedding
+                ORDER BY embedding <=> %(q)s::vector
+                LIMIT %(k)s
+            """, params)
+            exact_ids = {row[0] for row in cur.fetchall()}
+            cur.execute("RESET enable_indexscan")
+            cur.execute(f"SET hnsw.ef_search = {max(ef_search, top_k * max(rescore_factors))}")
+
+            for name, (sql, candidates) in configs.items():
+                start_time = time.perf_counter()
+                cur.execute(sql, {**params, 'n': candidates})
+                ids = {row[0] for row in cur.fetchall()}
+                latencies[name].append((time.perf_counter() - start_time) * 1000)
+                recalls[name].append(len(ids & exact_ids) / len(exact_ids) if exact_ids else 1.0)
+
+        cur.close()
+        conn.close()
+
+        return {
+            name: {
+                'recall_at_k': round(statistics.mean(recalls[name]), 4),
+                'latency_ms': {
+                    'mean': round(statistics.mean(latencies[name]), 2),
+                    'median': round(statistics.median(latencies[name]), 2),
+                    'max': round(max(latencies[name]), 2),
+                },
+                'num_queries': len(latencies[name]),
+                'top_k': top_k,
+            }
+            for name in configs
+        }
+
+    def print_two_stage_report(self, num_queries: int = 20, coarse_dims: int = 256,
+                               rescore_factors: list = None):
+        """Matryoshka 2단계 검색 리포트 출력"""
+        print("\n" + "=" * 60)
+        print(f"2단계 검색 리포트 (coarse {coarse_dims}d → 1536d rescoring)")
+        print("=" * 60)
+
+        results = self.benchmark_two_stage(
+            num_queries=num_queries, coarse_dims=coarse_dims, rescore_factors=rescore_factors
+        )
+        if 'error' in results:
+            print(f"\n❌ {results['error']}")
+            return
+
+        print("\n" + "-" * 60)
+        print(f"{'config':<20} {'recall@k':>10} {'mean(ms)':>10} {'median(ms)':>12} {'max(ms)':>10}")
+        print("-" * 60)
+        for name, data in results.items():
+            lat = data['latency_ms']
+            print(f"{name:<20} {data['recall_at_k']:>10.4f} {lat['mean']:>10.2f} {lat['median']:>12.2f} {lat['max']:>10.2f}")
+        print("-" * 60)
+        print("\n💡 recall이 hnsw_full과 같은 가장 작은 배수를 VECTOR_RESCORE_FACTOR로 사용하세요.")
+        print("\n" + "=" * 60)
+
     def check_index_usage(self) -> dict:
         """인덱스 사용 여부 확인"""
         conn = self.get_connection()
@@ -317,12 +423,21 @@ def main():
     parser.add_argument('--save', action='store_true', help='벤치마크 결과 저장')
     parser.add_argument('--queries', type=int, default=10, help='벤치마크 쿼리 수 (기본: 10)')
     parser.add_argument('--json', action='store_true', help='JSON 형식으로 출력')
+    parser.add_argument('--two-stage', action='store_true', help='Matryoshka 2단계 검색 recall/latency 리포트')
+    parser.add_argument('--coarse-dims', type=int, default=256, help='1단계 검색 차원 (기본: 256)')
+    parser.add_argument('--rescore-factors', type=str, default='2,4,8', help='후보 배수 목록 (기본: 2,4,8)')
 
     args = parser.parse_args()
 
     monitor = VectorSearchMonitor()
 
-    if args.json:
+    rescore_factors = [int(f) for f in args.rescore_factors.split(',') if f]
+
+    if args.two_stage:
+        monitor.print_two_stage_report(
+            num_queries=args.queries, coarse_dims=args.coarse_dims, rescore_factors=rescore_factors
+        )
+    elif args.json:
         result = {
             'stats': monitor.get_index_stats(),
         }
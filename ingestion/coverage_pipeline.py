@@ -18,6 +18,8 @@ import logging
 import argparse
 from dotenv import load_dotenv
 
+from utils.corpus_version import bump_corpus_version_url
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -373,6 +375,10 @@ def main():
         print(f"  Carrier: {summary['carrier']}")
         print(f"  Total extracted: {summary['total_extracted']}")
         print(f"  Inserted: {summary['inserted']}")
+
+        # 검색 결과 캐시 무효화
+        if summary['inserted']:
+            bump_corpus_version_url(db_url, "coverage_pipeline")
     else:
         logger.warning(f"Mode '{args.mode}' not yet implemented")
 
@@ -17,6 +17,7 @@ from typing import Dict
 import logging
 import argparse
 from dotenv import load_dotenv
+from utils.corpus_version import bump_corpus_version_url
 
 # Load environment variables from .env file
 load_dotenv()
@@ -273,6 +274,10 @@ def main():
     print(f"   Inserted: {summary['inserted']}")
     print(f"   Skipped: {summary['skipped']}")
 
+    # 검색 결과 캐시 무효화 + 장기 실행 프로세스에 변경 알림 (NOTIFY)
+    if summary['inserted']:
+        bump_corpus_version_url(db_url, "extract_benefits")
+
     # Show stats
     stats = extractor.get_benefit_stats()
     print(f"\n📊 Benefit Statistics:")
@@ -31,6 +31,7 @@ load_dotenv()
 from ingestion.parsers import TextParser, TableParser
 from ingestion.parsers.hybrid_parser_v2 import HybridParserV2
 from ingestion.parsers.parser_factory import ParserFactory
+from utils.corpus_version import bump_corpus_version_url
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -594,6 +595,9 @@ def main():
     pipeline = DocumentIngestionPipeline(db_url)
     pipeline.ingest_all_documents(metadata_json)
 
+    # 검색 결과 캐시 무효화
+    bump_corpus_version_url(db_url, "ingest_v3")
+
 
 if __name__ == '__main__':
     main()
@@ -23,6 +23,8 @@ import json
 import re
 from dotenv import load_dotenv
 
+from utils.corpus_version import bump_corpus_version_url
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -498,6 +500,9 @@ def main():
         print(f"   Matched: {summary['matched']}")
         print(f"   Skipped: {summary['skipped']}")
 
+    # 검색 결과 캐시 무효화 (clause_coverage 매핑 변경)
+    bump_corpus_version_url(db_url, f"link_clauses:{args.method}")
+
     # Show final stats
     stats = linker.get_mapping_stats()
     print(f"\n📊 Mapping Statistics:")
@@ -5,23 +5,37 @@ Purpose: Extract and load disease code sets from insurance terms documents
 Strategy:
   1. Extract ICD/KCD code references from document_clause
   2. Parse code ranges (e.g., C00-C97)
-  3. Create disease_code_set and disease_code entries
-  4. Support major disease categories:
+  3. Create disease_code_set and disease_code_range entries
+     (ranges are stored as one row each; ontology/disease_index.DiseaseCodeIndex
+      resolves membership with bisect)
+  4. Also write the 3-character codes of each range to disease_code
+     (graph_loader.sync_disease_codes builds DiseaseCode nodes from them)
+  5. Optionally load KCD code descriptions from a CSV (--kcd-csv)
+     (code, description_kr[, description_en]) into the 'KCD' code set and copy
+     the descriptions to the set codes; risk_event_extractor matches Korean
+     disease names against them when a clause has no code notation
+  6. Support major disease categories:
      - 악성신생물 (Malignant neoplasms): C00-C97
      - 제자리신생물 (In situ neoplasms): D00-D09
      - 뇌혈관질환 (Cerebrovascular): I60-I69
      - 심장질환 (Heart disease): I20-I25
 
+Usage:
+    python -m ingestion.load_disease_codes [--kcd-csv data/kcd8.csv]
+
 Design: Phase 2.2 of TODO.md
 """
 
 import os
 import re
+import csv
+import argparse
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from typing import List, Dict, Tuple
 import logging
 from dotenv import load_dotenv
+from utils.corpus_version import bump_corpus_version_url
 
 # Load environment variables from .env file
 load_dotenv()
@@ -33,6 +47,9 @@ logger = logging.getLogger(__name__)
 class DiseaseCodeLoader:
     """Extract and load disease codes from terms documents"""
 
+    # Code set holding the full KCD catalog loaded from --kcd-csv (no ranges)
+    KCD_CODE_SET = 'KCD'
+
     # Predefined disease code sets based on standard insurance categories
     DISEASE_CODE_SETS = {
         '악성신생물': {
@@ -89,6 +106,9 @@ class DiseaseCodeLoader:
         """
         Expand ICD/KCD code range into individual codes
 
+        Membership lookups use the ranges (load_code_ranges); the expanded
+        3-character codes are written to disease_code for the graph sync.
+
         Args:
             start: Start code (e.g., 'C00')
             end: End code (e.g., 'C97'), or None for single code
@@ -175,6 +195,41 @@ class DiseaseCodeLoader:
         logger.info(f"Loaded {inserted}/{len(codes)} codes for code_set_id={code_set_id}")
         return inserted
 
+    def load_code_ranges(self, code_set_id: int, code_ranges: List[Tuple[str, ...]], code_type: str = 'KCD') -> int:
+        """
+        Load code ranges of a code set (one row per range)
+
+        Args:
+            code_set_id: ID of the code set
+            code_ranges: [(start, end)] or [(code,)] for a single code
+            code_type: 'KCD' or 'ICD'
+
+        Returns:
+            Number of inserted ranges
+        """
+        conn = psycopg2.connect(self.db_url)
+        cur = conn.cursor()
+
+        inserted = 0
+        for code_range in code_ranges:
+            start_code = code_range[0]
+            end_code = code_range[1] if len(code_range) > 1 else start_code
+            cur.execute("""
+                INSERT INTO disease_code_range (code_set_id, start_code, end_code, code_type)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (code_set_id, start_code, end_code) DO NOTHING
+            """, (code_set_id, start_code, end_code, code_type))
+
+            if cur.rowcount > 0:
+                inserted += 1
+
+        conn.commit()
+        cur.close()
+        conn.close()
+
+        logger.info(f"Loaded {inserted}/{len(code_ranges)} ranges for code_set_id={code_set_id}")
+        return inserted
+
     def load_all_disease_code_sets(self) -> Dict:
         """
         Load all predefined disease code sets
@@ -184,6 +239,7 @@ class DiseaseCodeLoader:
         """
         summary = {
             'total_sets': 0,
+            'total_ranges': 0,
             'total_codes': 0,
             'sets': []
         }
@@ -197,48 +253,131 @@ class DiseaseCodeLoader:
                 description=config['description']
             )
 
-            # Expand code ranges
-            all_codes = []
-            for code_range in config['code_ranges']:
-                if len(code_range) == 1:
-                    all_codes.extend(self.expand_code_range(code_range[0]))
-                else:
-                    all_codes.extend(self.expand_code_range(code_range[0], code_range[1]))
+            # Load code ranges
+            inserted = self.load_code_ranges(
+                code_set_id=code_set_id,
+                code_ranges=config['code_ranges'],
+                code_type=config['code_type']
+            )
 
-            # Load codes
-            inserted = self.load_disease_codes(
+            # Load expanded 3-character codes (DiseaseCode nodes in Neo4j)
+            codes = []
+            for code_range in config['code_ranges']:
+                codes.extend(self.expand_code_range(*code_range))
+            code_count = self.load_disease_codes(
                 code_set_id=code_set_id,
-                codes=all_codes,
+                codes=codes,
                 code_type=config['code_type']
             )
 
             summary['total_sets'] += 1
-            summary['total_codes'] += inserted
+            summary['total_ranges'] += inserted
+            summary['total_codes'] += code_count
             summary['sets'].append({
                 'name': set_name,
                 'code_set_id': code_set_id,
-                'code_count': inserted
+                'range_count': inserted,
+                'code_count': code_count,
+                'ranges': ['-'.join(r) for r in config['code_ranges']]
             })
 
         return summary
 
+    def load_kcd_descriptions(self, csv_path: str) -> Dict:
+        """
+        Load KCD code descriptions from a CSV file
+
+        Rows: code, description_kr[, description_en] (a header row is skipped).
+        All codes go into the 'KCD' code set (no ranges, so set membership is
+        unchanged); the descriptions are then copied to the same codes in the
+        other code sets (matched without dots: C16.9 = C169).
+
+        Args:
+            csv_path: KCD CSV path (UTF-8)
+
+        Returns:
+            Summary dictionary
+        """
+        rows = {}
+        with open(csv_path, encoding='utf-8-sig', newline='') as f:
+            for record in csv.reader(f):
+                if len(record) < 2 or not re.match(r'^[A-Z]\d{2}', record[0].strip().upper()):
+                    continue
+                code = record[0].strip().upper()
+                description_en = record[2].strip() if len(record) > 2 and record[2].strip() else None
+                rows.setdefault(code, (code, record[1].strip() or None, description_en))
+
+        code_set_id = self.create_disease_code_set(
+            set_name=self.KCD_CODE_SET,
+            description='KCD 전체 분류 (질병명 조회용)'
+        )
+
+        conn = psycopg2.connect(self.db_url)
+        cur = conn.cursor()
+
+        execute_values(cur, """
+            INSERT INTO disease_code (code_set_id, code, code_type, description_kr, description_en)
+            VALUES %s
+            ON CONFLICT (code_set_id, code) DO UPDATE
+            SET description_kr = EXCLUDED.description_kr,
+                description_en = EXCLUDED.description_en
+        """, [(code_set_id, code, 'KCD', kr, en) for code, kr, en in rows.values()], page_size=1000)
+
+        cur.execute("""
+            UPDATE disease_code dc
+            SET description_kr = kcd.description_kr,
+                description_en = COALESCE(kcd.description_en, dc.description_en)
+            FROM disease_code kcd
+            WHERE kcd.code_set_id = %s
+              AND dc.code_set_id <> %s
+              AND REPLACE(kcd.code, '.', '') = REPLACE(dc.code, '.', '')
+              AND kcd.description_kr IS NOT NULL
+        """, (code_set_id, code_set_id))
+        described = cur.rowcount
+
+        conn.commit()
+        cur.close()
+        conn.close()
+
+        logger.info(f"Loaded {len(rows)} KCD codes, described {described} set codes")
+        return {'kcd_codes': len(rows), 'described_codes': described}
+
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Load disease code sets')
+    parser.add_argument('--kcd-csv', help='KCD CSV (code, description_kr[, description_en]) to load descriptions')
+    args = parser.parse_args()
+
     db_url = os.getenv('POSTGRES_URL')
     if not db_url:
         raise ValueError("POSTGRES_URL environment variable is required. Check .env file.")
 
     loader = DiseaseCodeLoader(db_url)
     summary = loader.load_all_disease_code_sets()
+    kcd_summary = loader.load_kcd_descriptions(args.kcd_csv) if args.kcd_csv else None
+
+    # 엔티티 카탈로그(질병코드/집합) 갱신 알림 (NOTIFY)
+    if summary['total_ranges'] or summary['total_codes'] or kcd_summary:
+        bump_corpus_version_url(db_url, "load_disease_codes")
 
     print(f"\n✅ Disease Code Loading Complete")
     print(f"   Total Sets: {summary['total_sets']}")
+    print(f"   Total Ranges: {summary['total_ranges']}")
     print(f"   Total Codes: {summary['total_codes']}\n")
 
     print("📋 Code Sets:")
     for s in summary['sets']:
-        print(f"   - {s['name']}: {s['code_count']} codes (id={s['code_set_id']})")
+        print(
+            f"   - {s['name']}: {', '.join(s['ranges'])} "
+            f"({s['range_count']} new ranges, {s['code_count']} new codes, id={s['code_set_id']})"
+        )
+
+    if kcd_summary:
+        print(f"\n📚 KCD: {kcd_summary['kcd_codes']} codes, {kcd_summary['described_codes']} set codes described")
+    else:
+        print("\nℹ️  No --kcd-csv: disease codes have no Korean descriptions "
+              "(risk_event_extractor name matching finds nothing)")
 
 
 if __name__ == '__main__':
@@ -6,6 +6,7 @@ Strategy:
   1. Parse document_clause for clauses with "정의" in title
   2. Extract risk event types (cancer, cerebrovascular, cardiovascular, etc.)
   3. Extract ICD codes from clause text
+     (falls back to Korean disease names matched against the full KCD index)
   4. Insert into risk_event table
 
 Usage:
@@ -20,6 +21,7 @@ from typing import Dict, List, Optional, Tuple
 import logging
 import argparse
 from dotenv import load_dotenv
+from ontology.disease_index import load_disease_index
 
 load_dotenv()
 
@@ -141,6 +143,15 @@ class RiskEventExtractor:
     def __init__(self, db_url: str):
         self.db_url = db_url
         self.conn = psycopg2.connect(db_url)
+        # 전체 KCD 코드 인덱스 (한글 질병명 → 코드 오토마톤 포함)
+        self.disease_index = load_disease_index(self.conn)
+        index_stats = self.disease_index.stats()
+        logger.info(f"Loaded disease code index: {index_stats}")
+        if not index_stats["described_codes"]:
+            logger.warning(
+                "disease_code has no Korean descriptions; disease-name fallback is disabled "
+                "(run python -m ingestion.load_disease_codes --kcd-csv <KCD CSV>)"
+            )
 
     def extract_all(self, carrier: Optional[str] = None, dry_run: bool = False) -> Dict:
         """
@@ -250,6 +261,10 @@ class RiskEventExtractor:
             for match in matches:
                 icd_codes.append(match)
 
+        # 코드 표기가 없으면 본문의 한글 질병명으로 코드 조회
+        if not icd_codes:
+            icd_codes = self.disease_index.match_descriptions(text)
+
         # Generate event name from title
         event_name = self._extract_event_name(title, text)
         if not event_name:
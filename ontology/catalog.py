@@ -0,0 +1,557 @@
+"""
+Entity Catalog
+
+NLMapper가 사용하는 엔티티 카탈로그(회사, 상품, 담보, 질병 코드, 회사 별칭)의
+불변 스냅샷과 프로세스 전역 공유 레지스트리입니다.
+
+- 스냅샷 1개 = 엔티티 튜플 + 이름/ID 해시 인덱스 + 엔티티 매칭 오토마톤
+  (생성 후 수정하지 않으므로 여러 스레드/코루틴이 잠금 없이 읽음)
+- postgres_url별로 프로세스에 스냅샷 1개만 로드 (NLMapper/AsyncNLMapper 인스턴스가
+  여러 개여도 시작 시 캐시 쿼리는 1번, 메모리도 1벌)
+- refresh_catalog()는 새 스냅샷을 만든 뒤 참조만 교체하므로, 진행 중인 추출은
+  기존 스냅샷으로 끝까지 일관되게 실행됩니다. API 서버는 수집 스크립트의
+  corpus_version NOTIFY를 받으면 백그라운드 스레드에서 호출합니다
+  (utils/corpus_version.CorpusVersionListener, CATALOG_HOT_RELOAD).
+
+Usage:
+    from ontology.catalog import get_catalog, refresh_catalog
+
+    catalog = get_catalog(postgres_url)       # 없으면 로드 (공유 풀)
+    catalog.company_id("삼성")                # O(1)
+    catalog.coverage_id("암진단비")
+    catalog.disease_index.code_sets("C16.9")  # ("악성신생물",) bisect
+
+    # asyncio (FastAPI 시작 시)
+    catalog = await get_catalog_async(postgres_url)
+
+    # 수집 후 갱신 (원자적 교체)
+    refresh_catalog(postgres_url)
+
+    # 임베딩 파이프라인 (clause_embedding 메타데이터 쓰기 후, bump_corpus_version 전)
+    refresh_coverage_name_catalog(pg_conn)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple, Mapping
+
+from psycopg2 import errors as pg_errors
+
+from utils.db_pool import get_pool
+from utils.async_db_pool import get_async_pool
+from utils.corpus_version import UNDEFINED_TABLE_SQLSTATE
+from utils.text_matcher import AhoCorasickMatcher
+from ontology.disease_index import (
+    DiseaseCodeIndex,
+    DISEASE_CODE_SQL,
+    DISEASE_CODE_RANGE_SQL,
+    EXPANDED_DISEASE_CODE_RANGE_SQL,
+)
+
+logger = logging.getLogger(__name__)
+
+# 엔티티 카탈로그 로드 쿼리
+COMPANY_CACHE_SQL = "SELECT id, company_name, company_code FROM company"
+
+PRODUCT_CACHE_SQL = """
+    SELECT p.id, p.product_name, p.business_type, c.company_name
+    FROM product p
+    JOIN company c ON p.company_id = c.id
+"""
+
+COVERAGE_CACHE_SQL = """
+    SELECT DISTINCT c.id, c.coverage_name, c.coverage_category
+    FROM coverage c
+    ORDER BY c.coverage_name
+"""
+
+# structured_data 담보명 (coverage 테이블에 없는 담보 보완)
+# coverage_name_catalog materialized view (마이그레이션 c9f4a7b2e351)의 unique 인덱스 스캔
+COVERAGE_NAME_CATALOG_SQL = """
+    SELECT coverage_name
+    FROM coverage_name_catalog
+    ORDER BY coverage_name
+"""
+
+# 뷰가 없을 때(마이그레이션 미적용) 사용하는 clause_embedding 전체 DISTINCT
+STRUCTURED_COVERAGE_NAMES_SQL = """
+    SELECT DISTINCT
+        ce.metadata->'structured_data'->>'coverage_name' as coverage_name
+    FROM clause_embedding ce
+    WHERE ce.metadata->'structured_data'->>'coverage_name' IS NOT NULL
+      AND ce.metadata->'structured_data'->>'coverage_name' != ''
+"""
+
+# 전체 KCD 코드 로드 (오토마톤 매칭이므로 코드 수가 늘어도 질의당 추출 비용은 같음)
+DISEASE_CACHE_SQL = DISEASE_CODE_SQL
+
+# 회사명 별칭 매핑 (alias → DB company_name)
+COMPANY_ALIASES = MappingProxyType({
+    # 삼성
+    '삼성화재': '삼성',
+    '삼성생명': '삼성',
+    '삼성손보': '삼성',
+    '삼성손해보험': '삼성',
+    # DB (구 동부)
+    '동부': 'DB',
+    '동부화재': 'DB',
+    '동부손보': 'DB',
+    '동부손해보험': 'DB',
+    'DB손보': 'DB',
+    'DB손해보험': 'DB',
+    'DB화재': 'DB',
+    # 현대
+    '현대해상': '현대',
+    '현대생명': '현대',
+    '현대손보': '현대',
+    '현대손해보험': '현대',
+    # 한화
+    '한화손보': '한화',
+    '한화손해보험': '한화',
+    '한화생명': '한화',
+    '한화화재': '한화',
+    # 롯데
+    '롯데손보': '롯데',
+    '롯데손해보험': '롯데',
+    '롯데화재': '롯데',
+    # KB
+    'KB손보': 'KB',
+    'KB손해보험': 'KB',
+    'KB생명': 'KB',
+    # 메리츠
+    '메리츠화재': '메리츠',
+    '메리츠손보': '메리츠',
+    '메리츠손해보험': '메리츠',
+    # 흥국
+    '흥국화재': '흥국',
+    '흥국생명': '흥국',
+    '흥국손보': '흥국',
+})
+
+# 핵심 키워드 부분 매칭 (예: "삼성" → "삼성", 별칭/DB 회사명 매칭 이후 적용)
+COMPANY_CORE_KEYWORDS = MappingProxyType({
+    '삼성': '삼성',
+    '동부': 'DB',  # 동부 → DB
+    'DB': 'DB',
+    '롯데': '롯데',
+    '메리츠': '메리츠',
+    '한화': '한화',
+    '현대': '현대',
+    'KB': 'KB',
+    '흥국': '흥국',
+})
+
+# 보험 관련 키워드 패턴 (구체적 키워드를 먼저 배치하여 우선 매칭)
+# 순서: 구체적 → 일반적 (제자리암 > 유사암 > 암)
+INSURANCE_KEYWORDS = (
+    # 구체적 암 종류 (우선순위 높음)
+    '제자리암', '경계성종양', '유사암', '4대유사암',
+    '갑상선암', '기타피부암', '재진단암',
+    '일반암', '소액암', '고액암',
+    # 일반 보장 타입
+    '보장', '진단', '수술', '입원', '통원',
+    # 일반 암/질병 (구체적 암 키워드 이후에 매칭)
+    '암', '뇌출혈', '급성심근경색', '질병', '상해',
+    # 조건 관련
+    '면책', '감액', '지급', '한도', '제한',
+    '가입', '나이', '기간', '금액', '조건',
+    # 특수 담보
+    '다빈치', '로봇'
+)
+
+# 엔티티 오토마톤 스캔 구간: 원문 질의 / 공백 제거 질의 (담보명 접미사 제거형 매칭용)
+# 두 구간을 매칭될 수 없는 구분 문자로 이어 한 번에 스캔합니다.
+RAW_SEGMENT = 0
+NORMALIZED_SEGMENT = 1
+SEGMENT_SEPARATOR = "\x00"
+
+
+def _index_first(entries: Tuple[Mapping[str, Any], ...], key: str, value: str) -> Mapping[Any, Any]:
+    """entries[key] → entries[value] 인덱스 (같은 키는 첫 항목 우선, 기존 선형 탐색과 동일)"""
+    index: Dict[Any, Any] = {}
+    for entry in entries:
+        index.setdefault(entry[key], entry[value])
+    return MappingProxyType(index)
+
+
+class EntityCatalog:
+    """
+    엔티티 카탈로그 불변 스냅샷
+
+    엔티티는 읽기 전용 dict(MappingProxyType)의 튜플이고, 인덱스도 읽기 전용입니다.
+    """
+
+    __slots__ = (
+        "companies", "products", "coverages", "diseases",
+        "company_aliases", "company_core_keywords", "insurance_keywords",
+        "_company_ids", "_product_ids", "_coverage_ids", "_companies_by_id", "_products_by_id",
+        "disease_index", "matcher", "loaded_at",
+    )
+
+    def __init__(
+        self,
+        companies: List[Dict[str, Any]],
+        products: List[Dict[str, Any]],
+        coverages: List[Dict[str, Any]],
+        diseases: List[Dict[str, Any]],
+        disease_ranges: List[tuple] = ()
+    ):
+        """
+        Args:
+            companies: [{"id", "company_name", "company_code"}]
+            products: [{"id", "name", "product_type", "company_name"}]
+            coverages: [{"id", "name", "coverage_group"}]
+            diseases: [{"code", "name"}]
+            disease_ranges: 질병코드 집합 구간 [(set_name, start_code, end_code)]
+        """
+        self.companies = tuple(MappingProxyType(dict(c)) for c in companies)
+        self.products = tuple(MappingProxyType(dict(p)) for p in products)
+        self.coverages = tuple(MappingProxyType(dict(c)) for c in coverages)
+        self.diseases = tuple(MappingProxyType(dict(d)) for d in diseases)
+        self.company_aliases = COMPANY_ALIASES
+        self.company_core_keywords = COMPANY_CORE_KEYWORDS
+        self.insurance_keywords = INSURANCE_KEYWORDS
+
+        # 이름 → ID, ID → 엔티티 해시 인덱스
+        self._company_ids = _index_first(self.companies, "company_name", "id")
+        self._product_ids = _index_first(self.products, "name", "id")
+        self._coverage_ids = _index_first(self.coverages, "name", "id")
+        self._companies_by_id = MappingProxyType({c["id"]: c for c in self.companies})
+        self._products_by_id = MappingProxyType({p["id"]: p for p in self.products})
+
+        # 질병 코드/집합 bisect 인덱스 (질병명은 아래 엔티티 오토마톤에서 매칭)
+        self.disease_index = DiseaseCodeIndex(
+            ((d["code"], d["name"]) for d in self.diseases),
+            disease_ranges,
+            build_matcher=False,
+        )
+
+        self.matcher = self._build_matcher()
+        self.loaded_at = time.time()
+
+    @classmethod
+    def from_rows(
+        cls,
+        company_rows: List[tuple],
+        product_rows: List[tuple],
+        coverage_rows: List[tuple],
+        structured_rows: List[tuple],
+        disease_rows: List[tuple],
+        disease_range_rows: List[tuple] = ()
+    ) -> "EntityCatalog":
+        """카탈로그 로드 쿼리 결과 → 스냅샷"""
+        return cls(
+            companies=_build_companies(company_rows),
+            products=_build_products(product_rows),
+            coverages=_build_coverages(coverage_rows, structured_rows),
+            diseases=_build_diseases(disease_rows),
+            disease_ranges=disease_range_rows,
+        )
+
+    def company_id(self, company_name: str) -> Optional[int]:
+        """회사명 → company_id"""
+        return self._company_ids.get(company_name)
+
+    def product_id(self, product_name: str) -> Optional[int]:
+        """상품명 → product_id"""
+        return self._product_ids.get(product_name)
+
+    def coverage_id(self, coverage_name: str) -> Optional[int]:
+        """담보명 → coverage_id (structured_data에서만 발견된 담보는 None)"""
+        return self._coverage_ids.get(coverage_name)
+
+    def company(self, company_id: int) -> Optional[Mapping[str, Any]]:
+        """company_id → 회사"""
+        return self._companies_by_id.get(company_id)
+
+    def product(self, product_id: int) -> Optional[Mapping[str, Any]]:
+        """product_id → 상품"""
+        return self._products_by_id.get(product_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """엔티티 수, 오토마톤 패턴 수, 로드 시각"""
+        return {
+            "companies": len(self.companies),
+            "products": len(self.products),
+            "coverages": len(self.coverages),
+            "diseases": len(self.diseases),
+            "disease_code_sets": len(self.disease_index.set_names),
+            "surface_forms": len(self.matcher),
+            "loaded_at": self.loaded_at,
+        }
+
+    def _build_matcher(self) -> AhoCorasickMatcher:
+        """
+        엔티티 + 별칭/키워드의 모든 표면형 → Aho-Corasick 오토마톤
+
+        payload: (종류, 우선순위, 추출 값, 스캔 구간)
+        """
+        matcher = AhoCorasickMatcher()
+
+        # 회사: 1) 별칭 (긴 별칭부터 매칭하여 정확도 향상)
+        sorted_aliases = sorted(self.company_aliases.keys(), key=len, reverse=True)
+        for rank, alias in enumerate(sorted_aliases):
+            matcher.add(alias, ("companies", (0, rank), self.company_aliases[alias], RAW_SEGMENT))
+
+        # 회사: 2) DB의 회사명 정확 매칭 / 코드 매칭 (대소문자 무시)
+        for index, company in enumerate(self.companies):
+            payload = ("companies", (1, index), company['company_name'], RAW_SEGMENT)
+            matcher.add(company['company_name'], payload)
+            if company['company_code']:
+                matcher.add(company['company_code'], payload, ignore_case=True)
+
+        # 회사: 3) 핵심 키워드 부분 매칭
+        for rank, (keyword, company_name) in enumerate(self.company_core_keywords.items()):
+            matcher.add(keyword, ("companies", (2, rank), company_name, RAW_SEGMENT))
+
+        # 상품명 부분 매칭 (예: "마이헬스", "리얼속속" 등)
+        for index, product in enumerate(self.products):
+            matcher.add(product['name'], ("products", (index,), product['name'], RAW_SEGMENT))
+
+        # 담보명: 정확한 매칭 + 부분 매칭 (예: "암 진단" → "암진단비")
+        for index, coverage in enumerate(self.coverages):
+            name = coverage['name']
+            matcher.add(name, ("coverages", (index,), name, RAW_SEGMENT))
+            name_without_suffix = name.replace('금', '').replace('비', '').replace('담보', '')
+            matcher.add(name_without_suffix, ("coverages", (index,), name, NORMALIZED_SEGMENT))
+
+        # 질병명 / 질병 코드
+        for index, disease in enumerate(self.diseases):
+            payload = ("diseases", (index,), disease['name'], RAW_SEGMENT)
+            matcher.add(disease['name'], payload)
+            matcher.add(disease['code'], payload)
+
+        # 핵심 키워드 (보험 도메인 용어)
+        for index, keyword in enumerate(self.insurance_keywords):
+            matcher.add(keyword, ("keywords", (index,), keyword, RAW_SEGMENT))
+
+        return matcher.build()
+
+
+def _build_companies(rows: List[tuple]) -> List[Dict[str, Any]]:
+    """COMPANY_CACHE_SQL 결과 → 회사 목록"""
+    return [
+        {"id": row[0], "company_name": row[1], "company_code": row[2]}
+        for row in rows
+    ]
+
+
+def _build_products(rows: List[tuple]) -> List[Dict[str, Any]]:
+    """PRODUCT_CACHE_SQL 결과 → 상품 목록"""
+    return [
+        {
+            "id": row[0],
+            "name": row[1],
+            "product_type": row[2],
+            "company_name": row[3]
+        }
+        for row in rows
+    ]
+
+
+def _build_coverages(
+    coverage_rows: List[tuple],
+    structured_rows: List[tuple]
+) -> List[Dict[str, Any]]:
+    """COVERAGE_CACHE_SQL + STRUCTURED_COVERAGE_NAMES_SQL 결과 → 담보 목록"""
+    # 1. coverage 테이블의 기본 담보
+    coverages = [
+        {"id": row[0], "name": row[1], "coverage_group": row[2]}
+        for row in coverage_rows
+    ]
+
+    # 기존 담보명 set 생성 (중복 방지)
+    existing_names = {c['name'] for c in coverages}
+
+    # 2. structured_data의 담보명 추가 (중복 제외)
+    for row in structured_rows:
+        coverage_name = row[0]
+        if coverage_name and coverage_name not in existing_names:
+            # ID는 None (coverage 테이블에 없는 담보)
+            coverages.append({
+                "id": None,
+                "name": coverage_name,
+                "coverage_group": "기타"
+            })
+            existing_names.add(coverage_name)
+
+    return coverages
+
+
+def _build_diseases(rows: List[tuple]) -> List[Dict[str, Any]]:
+    """DISEASE_CACHE_SQL 결과 → 질병 코드 목록"""
+    return [
+        {"code": row[0], "name": row[1] or row[0]}
+        for row in rows
+    ]
+
+
+CATALOG_QUERIES = (
+    COMPANY_CACHE_SQL,
+    PRODUCT_CACHE_SQL,
+    COVERAGE_CACHE_SQL,
+    COVERAGE_NAME_CATALOG_SQL,
+    DISEASE_CACHE_SQL,
+    DISEASE_CODE_RANGE_SQL,
+)
+
+# 대상 테이블/뷰가 없을 때 대신 실행할 쿼리: 쿼리 → (테이블/뷰 이름, 대체 쿼리)
+FALLBACK_QUERIES = {
+    COVERAGE_NAME_CATALOG_SQL: ("coverage_name_catalog", STRUCTURED_COVERAGE_NAMES_SQL),
+    DISEASE_CODE_RANGE_SQL: ("disease_code_range", EXPANDED_DISEASE_CODE_RANGE_SQL),
+}
+
+REFRESH_COVERAGE_NAME_CATALOG_SQL = "REFRESH MATERIALIZED VIEW CONCURRENTLY coverage_name_catalog"
+
+
+def _fallback_query(sql: str) -> str:
+    """테이블/뷰 미생성 경고 후 대체 쿼리 반환 (마이그레이션 권장)"""
+    relation, fallback_sql = FALLBACK_QUERIES[sql]
+    logger.warning("%s not found (run alembic upgrade head); using fallback query", relation)
+    return fallback_sql
+
+
+def load_catalog(postgres_url: str) -> EntityCatalog:
+    """카탈로그 로드 쿼리 실행 → 새 스냅샷 (공유 풀 연결 1개)"""
+    with get_pool(postgres_url).connection() as conn, conn.cursor() as cur:
+        rows = []
+        for sql in CATALOG_QUERIES:
+            try:
+                cur.execute(sql)
+            except pg_errors.UndefinedTable:
+                if sql not in FALLBACK_QUERIES:
+                    raise
+                conn.rollback()
+                cur.execute(_fallback_query(sql))
+            rows.append(cur.fetchall())
+    return EntityCatalog.from_rows(*rows)
+
+
+async def load_catalog_async(postgres_url: str) -> EntityCatalog:
+    """카탈로그 로드 쿼리 실행 → 새 스냅샷 (async 풀, 쿼리는 연결별로 동시 실행)"""
+    pool = get_async_pool(postgres_url)
+
+    async def fetch_all(sql: str) -> List[tuple]:
+        async with pool.connection() as conn, conn.cursor() as cur:
+            try:
+                await cur.execute(sql)
+            except Exception as e:
+                # psycopg 3 예외는 sqlstate로 판별 (psycopg2 errors 클래스와 다름)
+                if getattr(e, "sqlstate", None) != UNDEFINED_TABLE_SQLSTATE or sql not in FALLBACK_QUERIES:
+                    raise
+                await conn.rollback()
+                await cur.execute(_fallback_query(sql))
+            return await cur.fetchall()
+
+    rows = await asyncio.gather(*(fetch_all(sql) for sql in CATALOG_QUERIES))
+    return EntityCatalog.from_rows(*rows)
+
+
+# 프로세스 전역 스냅샷 (postgres_url별 1개)
+_catalogs: Dict[str, EntityCatalog] = {}
+_catalogs_lock = threading.Lock()
+# 동시 첫 로드/갱신을 1번으로 합치는 로드 잠금 (조회 경로는 잠그지 않음)
+_load_lock = threading.Lock()
+
+
+def _resolve_url(postgres_url: Optional[str]) -> str:
+    postgres_url = postgres_url or os.getenv("POSTGRES_URL")
+    if not postgres_url:
+        raise ValueError("POSTGRES_URL environment variable is required. Check .env file.")
+    return postgres_url
+
+
+def peek_catalog(postgres_url: str = None) -> Optional[EntityCatalog]:
+    """현재 스냅샷 반환 (로드되지 않았으면 None, DB 조회 없음)"""
+    return _catalogs.get(_resolve_url(postgres_url))
+
+
+def set_catalog(postgres_url: str, catalog: EntityCatalog):
+    """스냅샷 원자적 교체 (이후 조회부터 새 스냅샷 사용)"""
+    with _catalogs_lock:
+        _catalogs[_resolve_url(postgres_url)] = catalog
+
+
+def get_catalog(postgres_url: str = None) -> EntityCatalog:
+    """
+    공유 스냅샷 반환 (없으면 로드)
+
+    Args:
+        postgres_url: PostgreSQL 연결 문자열 (기본: POSTGRES_URL)
+    """
+    postgres_url = _resolve_url(postgres_url)
+    catalog = _catalogs.get(postgres_url)
+    if catalog is not None:
+        return catalog
+
+    with _load_lock:
+        catalog = _catalogs.get(postgres_url)
+        if catalog is None:
+            catalog = load_catalog(postgres_url)
+            set_catalog(postgres_url, catalog)
+        return catalog
+
+
+async def get_catalog_async(postgres_url: str = None) -> EntityCatalog:
+    """공유 스냅샷 반환 (없으면 async 풀로 로드)"""
+    postgres_url = _resolve_url(postgres_url)
+    catalog = _catalogs.get(postgres_url)
+    if catalog is None:
+        # 동시에 로드되면 나중 스냅샷이 남음 (내용은 같음)
+        catalog = await load_catalog_async(postgres_url)
+        set_catalog(postgres_url, catalog)
+    return catalog
+
+
+def refresh_catalog(postgres_url: str = None) -> EntityCatalog:
+    """
+    카탈로그를 다시 로드해 스냅샷 교체 (수집/담보 변경 후)
+
+    로드 중에도 조회는 기존 스냅샷으로 계속 처리됩니다.
+    """
+    postgres_url = _resolve_url(postgres_url)
+    with _load_lock:
+        catalog = load_catalog(postgres_url)
+        set_catalog(postgres_url, catalog)
+    return catalog
+
+
+async def refresh_catalog_async(postgres_url: str = None) -> EntityCatalog:
+    """refresh_catalog()의 asyncio 버전"""
+    postgres_url = _resolve_url(postgres_url)
+    catalog = await load_catalog_async(postgres_url)
+    set_catalog(postgres_url, catalog)
+    return catalog
+
+
+def refresh_coverage_name_catalog(pg_conn) -> bool:
+    """
+    coverage_name_catalog materialized view 갱신 (커밋 포함)
+
+    clause_embedding 메타데이터를 쓰는 파이프라인이 bump_corpus_version() 전에 호출합니다
+    (NOTIFY를 받은 프로세스가 새 담보명으로 카탈로그를 다시 만들도록).
+    CONCURRENTLY 갱신이므로 갱신 중에도 카탈로그 로드가 막히지 않습니다.
+
+    Args:
+        pg_conn: PostgreSQL 연결 (psycopg2)
+
+    Returns:
+        갱신 여부 (뷰가 없으면 False)
+    """
+    cur = pg_conn.cursor()
+    try:
+        cur.execute(REFRESH_COVERAGE_NAME_CATALOG_SQL)
+        pg_conn.commit()
+    except pg_errors.UndefinedTable:
+        pg_conn.rollback()
+        logger.warning("coverage_name_catalog not found (run alembic upgrade head); refresh skipped")
+        return False
+    finally:
+        cur.close()
+
+    logger.info("coverage_name_catalog refreshed")
+    return True
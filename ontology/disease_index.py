@@ -0,0 +1,240 @@
+"""
+Disease Code Index
+
+KCD/ICD 질병 코드 전체를 담는 메모리 인덱스입니다.
+(NLMapper 카탈로그, ingestion/risk_event_extractor.py에서 사용)
+
+- 코드/설명: 정규화 코드 정렬 배열 + 같은 순서의 설명 배열 → bisect 조회
+  (코드당 문자열 2개, 전체 KCD 코드도 수 MB)
+- 질병코드 집합: disease_code_range의 (start_code, end_code) 구간을 겹치지 않는
+  기본 구간으로 분할한 경계 정렬 배열 → 코드 1개의 소속 집합을 bisect 1번으로 조회
+  (C00-C97을 코드마다 펼치지 않음, end_code는 하위 코드 포함)
+- 한글 질병명: Aho-Corasick 오토마톤 → 텍스트 1회 스캔으로 언급된 질병 코드 추출
+- 텍스트의 코드 표기(C16.9, I60-I69 등)는 find_codes()로 추출
+
+Usage:
+    from ontology.disease_index import load_disease_index
+
+    index = load_disease_index(pg_conn)
+    index.description("C16.9")             # "위의 악성신생물, 상세불명" (없으면 상위 코드 설명)
+    index.code_sets("I61.0")               # ("뇌출혈", "뇌졸중")
+    index.in_set("C73", "갑상선암")         # True
+    index.match_descriptions("급성심근경색증으로 진단")   # ["I21"]
+    index.find_codes("뇌출혈(I60~I62) 및 C73")           # ["I60-I62", "C73"]
+"""
+
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+from psycopg2 import errors as pg_errors
+
+from utils.text_matcher import AhoCorasickMatcher
+
+
+# 질병 코드 (code, description_kr), 코드 순 (같은 코드는 설명이 있는 행 우선)
+DISEASE_CODE_SQL = """
+    SELECT DISTINCT dc.code, dc.description_kr
+    FROM disease_code dc
+    ORDER BY dc.code, dc.description_kr NULLS LAST
+"""
+
+# 질병코드 집합 구간 (set_name, start_code, end_code), 마이그레이션 d2a6e8c1f594
+DISEASE_CODE_RANGE_SQL = """
+    SELECT dcs.set_name, dcr.start_code, dcr.end_code
+    FROM disease_code_range dcr
+    JOIN disease_code_set dcs ON dcr.code_set_id = dcs.id
+    ORDER BY dcs.id, dcr.start_code
+"""
+
+# 구간 테이블이 없을 때: 기존 방식으로 펼쳐 저장된 disease_code 행을 단일 코드 구간으로 사용
+EXPANDED_DISEASE_CODE_RANGE_SQL = """
+    SELECT dcs.set_name, dc.code, dc.code
+    FROM disease_code dc
+    JOIN disease_code_set dcs ON dc.code_set_id = dcs.id
+    ORDER BY dcs.id, dc.code
+"""
+
+# 코드 표기: 영문 1자 + 숫자 2자리 (+ 세분류), 선택적으로 "-"/"~" 구간
+CODE_PATTERN = r"[A-Z]\d{2}(?:\.?\d{1,2})?"
+CODE_MENTION_RE = re.compile(
+    rf"(?<![A-Za-z0-9])({CODE_PATTERN})(?:\s*[-~]\s*({CODE_PATTERN}))?(?![0-9])"
+)
+
+# 구간 끝 표시 (정규화 코드에 쓰이는 영문/숫자보다 큰 문자) → end_code의 하위 코드 포함
+_RANGE_END = "\uffff"
+
+
+def normalize_code(code: str) -> str:
+    """질병 코드 정규화 (대문자, 점/공백 제거: "c16.9" → "C169")"""
+    return code.upper().replace(".", "").replace(" ", "")
+
+
+class DiseaseCodeIndex:
+    """
+    질병 코드 / 질병코드 집합 / 한글 질병명 인덱스 (불변)
+
+    모든 배열은 생성 후 수정하지 않으므로 여러 스레드가 잠금 없이 읽습니다.
+    """
+
+    __slots__ = (
+        "_keys", "codes", "descriptions",
+        "set_names", "_bounds", "_segment_sets", "_set_ranges",
+        "matcher",
+    )
+
+    def __init__(
+        self,
+        codes: Iterable[Tuple[str, Optional[str]]],
+        ranges: Iterable[Tuple[str, str, Optional[str]]] = (),
+        build_matcher: bool = True
+    ):
+        """
+        Args:
+            codes: (code, description_kr) 목록
+            ranges: (set_name, start_code, end_code) 목록 (end_code None이면 단일 코드)
+            build_matcher: 한글 질병명 오토마톤 생성 여부
+                (엔티티 카탈로그처럼 질병명을 자체 오토마톤에 넣는 경우 False)
+        """
+        # 1. 코드 → 설명 (정규화 코드 정렬, 같은 코드는 첫 항목 우선)
+        by_key: Dict[str, Tuple[str, Optional[str]]] = {}
+        for code, description in codes:
+            if code:
+                by_key.setdefault(normalize_code(code), (code, description or None))
+        self._keys = tuple(sorted(by_key))
+        # 원본 코드가 이미 정규화 형태면 같은 문자열 객체를 공유
+        self.codes = tuple(key if by_key[key][0] == key else by_key[key][0] for key in self._keys)
+        self.descriptions = tuple(by_key[key][1] for key in self._keys)
+
+        # 2. 집합 구간 → 겹치지 않는 기본 구간 [bounds[i], bounds[i+1])별 소속 집합
+        intervals: List[Tuple[str, str, str]] = []
+        set_ranges: Dict[str, List[Tuple[str, str]]] = {}
+        for set_name, start_code, end_code in ranges:
+            end_code = end_code or start_code
+            intervals.append((normalize_code(start_code), normalize_code(end_code) + _RANGE_END, set_name))
+            set_ranges.setdefault(set_name, []).append((start_code, end_code))
+        self.set_names = tuple(set_ranges)
+        self._set_ranges = {name: tuple(spans) for name, spans in set_ranges.items()}
+
+        self._bounds = tuple(sorted({lo for lo, _, _ in intervals} | {hi for _, hi, _ in intervals}))
+        self._segment_sets = tuple(
+            tuple(dict.fromkeys(
+                name for lo, hi, name in intervals if lo <= self._bounds[i] and self._bounds[i + 1] <= hi
+            ))
+            for i in range(len(self._bounds) - 1)
+        )
+
+        # 3. 한글 질병명 → 코드
+        self.matcher = self._build_matcher() if build_matcher else None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, code: object) -> bool:
+        return isinstance(code, str) and self._position(code) is not None
+
+    def _position(self, code: str) -> Optional[int]:
+        """정규화 코드의 배열 위치 (없으면 None)"""
+        key = normalize_code(code)
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        return None
+
+    def description(self, code: str) -> Optional[str]:
+        """
+        코드 → 한글 설명
+
+        세분류 코드(C16.9)가 없으면 상위 3자리 코드(C16)의 설명을 반환합니다.
+        """
+        i = self._position(code)
+        if i is None and len(normalize_code(code)) > 3:
+            i = self._position(normalize_code(code)[:3])
+        return self.descriptions[i] if i is not None else None
+
+    def codes_with_prefix(self, prefix: str) -> Tuple[str, ...]:
+        """정규화 코드가 prefix로 시작하는 코드 (예: "C16" → C16, C16.0, ..., C16.9)"""
+        key = normalize_code(prefix)
+        lo = bisect_left(self._keys, key)
+        hi = bisect_left(self._keys, key + _RANGE_END)
+        return self.codes[lo:hi]
+
+    def code_sets(self, code: str) -> Tuple[str, ...]:
+        """코드가 속한 질병코드 집합 이름 (구간 적재 순서)"""
+        i = bisect_right(self._bounds, normalize_code(code)) - 1
+        if 0 <= i < len(self._segment_sets):
+            return self._segment_sets[i]
+        return ()
+
+    def in_set(self, code: str, set_name: str) -> bool:
+        """코드가 질병코드 집합에 속하는지"""
+        return set_name in self.code_sets(code)
+
+    def set_ranges(self, set_name: str) -> Tuple[Tuple[str, str], ...]:
+        """질병코드 집합의 (start_code, end_code) 구간"""
+        return self._set_ranges.get(set_name, ())
+
+    def match_descriptions(self, text: str) -> List[str]:
+        """텍스트에 언급된 한글 질병명 → 코드 (코드 순, 중복 제거)"""
+        if self.matcher is None:
+            raise RuntimeError("DiseaseCodeIndex was built without a description matcher")
+        positions = {position for _, _, position in self.matcher.finditer(text)}
+        return [self.codes[i] for i in sorted(positions)]
+
+    def find_codes(self, text: str) -> List[str]:
+        """
+        텍스트의 코드 표기 추출 (출현 순, 중복 제거)
+
+        구간 표기는 "C00-C97" 형태로 반환합니다 (구간 안의 코드를 펼치지 않음).
+        """
+        found = []
+        for match in CODE_MENTION_RE.finditer(text):
+            start_code, end_code = match.groups()
+            found.append(f"{start_code}-{end_code}" if end_code else start_code)
+        return list(dict.fromkeys(found))
+
+    def stats(self) -> Dict[str, Any]:
+        """코드/설명/구간 수, 배열 메모리 (문자열 포함 근사치)"""
+        arrays = (self._keys, self.codes, self.descriptions, self._bounds)
+        values = {id(value): value for array in arrays for value in array if value is not None}
+        size = sum(sys.getsizeof(array) for array in arrays)
+        size += sum(sys.getsizeof(value) for value in values.values())
+        return {
+            "codes": len(self._keys),
+            "described_codes": sum(1 for description in self.descriptions if description),
+            "code_sets": len(self.set_names),
+            "segments": len(self._segment_sets),
+            "approx_bytes": size,
+        }
+
+    def _build_matcher(self) -> AhoCorasickMatcher:
+        """한글 질병명 오토마톤 (payload: 코드 배열 위치)"""
+        matcher = AhoCorasickMatcher()
+        for position, description in enumerate(self.descriptions):
+            if description:
+                matcher.add(description, position)
+        return matcher.build()
+
+
+def load_disease_index(pg_conn, build_matcher: bool = True) -> DiseaseCodeIndex:
+    """
+    disease_code / disease_code_range 전체 로드 → 인덱스
+
+    Args:
+        pg_conn: PostgreSQL 연결 (psycopg2)
+        build_matcher: 한글 질병명 오토마톤 생성 여부
+
+    Returns:
+        DiseaseCodeIndex
+    """
+    with pg_conn.cursor() as cur:
+        cur.execute(DISEASE_CODE_SQL)
+        code_rows = cur.fetchall()
+        try:
+            cur.execute(DISEASE_CODE_RANGE_SQL)
+        except pg_errors.UndefinedTable:
+            pg_conn.rollback()
+            cur.execute(EXPANDED_DISEASE_CODE_RANGE_SQL)
+        range_rows = cur.fetchall()
+    return DiseaseCodeIndex(code_rows, range_rows, build_matcher=build_matcher)
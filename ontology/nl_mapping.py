@@ -7,7 +7,15 @@ Uses pattern matching and database lookups for entity extraction.
 주요 기능:
 - 질의에서 엔티티 추출 (담보명, 상품명, 회사명, 질병명 등)
 - DB 조회를 통한 정확한 매칭
+- 엔티티 카탈로그 로드 시 모든 표면형(이름, 별칭, 접미사 제거형, 질병 코드, 도메인 키워드)을
+  Aho-Corasick 오토마톤 하나로 컴파일 → 질의 1회 스캔으로 전체 엔티티 추출
+  (카탈로그 크기와 무관하게 질의 길이에 비례)
+- 카탈로그는 프로세스 전역 불변 스냅샷을 공유 (ontology/catalog.py, 인스턴스별 캐시 없음)
 - 매핑된 엔티티를 필터로 변환하여 벡터 검색에 활용
+- 추출 결과는 정규화 질의(NFC + 공백 압축)별로 프로세스 공유 LRU에 memo
+  (서버/검색/부스팅/회사별 비교 검색이 같은 질의를 여러 번 추출해도 매칭은 1번,
+   카탈로그 스냅샷이 교체되면 비움, 호출자에게는 복사본 반환)
+- 금액/나이 정규식은 클래스 로드 시 1번 컴파일
 
 Usage:
     from ontology.nl_mapping import NLMapper
@@ -20,63 +28,165 @@ Usage:
     #   "coverages": ["암진단금"],
     #   "filters": {"company_id": 1, "product_id": 5}
     # }
+
+    # asyncio (FastAPI 핸들러 등)
+    mapper = AsyncNLMapper()
+    await mapper.load()  # 공유 카탈로그가 이미 로드되었으면 DB 조회 없음
+    entities = mapper.extract_entities("삼성화재 마이헬스 암진단금은?")
+
+    # 평가/리플레이 (서로 다른 질의만 1번씩 추출, 입력 순서대로 반환)
+    results = mapper.extract_entities_batch(queries)
+
+설정 (환경 변수):
+    NL_ENTITY_CACHE_SIZE: 엔티티 추출 결과 LRU 크기 (기본: 1024, 0이면 비활성화)
 """
 
 import re
 import os
-import psycopg2
-from typing import Dict, List, Any, Optional
+import copy
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Iterable
 from dotenv import load_dotenv
+from ontology.catalog import (
+    EntityCatalog,
+    get_catalog,
+    get_catalog_async,
+    peek_catalog,
+    COMPANY_ALIASES,
+    RAW_SEGMENT,
+    SEGMENT_SEPARATOR,
+)
 
 # Load environment variables from .env file
 load_dotenv()
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """memo 키/추출용 질의 정규화 (NFC + 공백 압축, 임베딩/검색 캐시 키와 동일)"""
+    if not query:
+        return ""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", query)).strip()
+
+
+class EntityMemo:
+    """
+    엔티티 추출 결과 LRU (postgres_url별 1개, 프로세스 공유)
+
+    결과는 추출에 사용한 카탈로그 스냅샷에 대한 것이므로, 다른 스냅샷으로
+    조회/저장하면 기존 항목을 모두 비웁니다 (핫 리로드 후 이전 결과 미사용).
+    """
+
+    def __init__(self, max_entries: int = None):
+        """
+        Args:
+            max_entries: 최대 항목 수 (기본: NL_ENTITY_CACHE_SIZE 또는 1024)
+        """
+        if max_entries is None:
+            max_entries = int(os.getenv("NL_ENTITY_CACHE_SIZE", "1024"))
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._catalog: Optional[EntityCatalog] = None
+        # 정규화 질의 -> 추출 결과 (호출자와 공유하지 않는 원본)
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "resets": 0}
+
+    def _sync_catalog(self, catalog: EntityCatalog):
+        """스냅샷이 바뀌었으면 비움 (잠금 안에서 호출)"""
+        if catalog is not self._catalog:
+            if self._memory:
+                self._memory.clear()
+                self._counters["resets"] += 1
+            self._catalog = catalog
+
+    def get(self, catalog: EntityCatalog, query: str) -> Optional[Dict[str, Any]]:
+        """
+        조회
+
+        Returns:
+            추출 결과 복사본 (호출자가 수정해도 memo에 영향 없음) 또는 None (미스)
+        """
+        with self._lock:
+            self._sync_catalog(catalog)
+            entities = self._memory.get(query)
+            if entities is None:
+                self._counters["misses"] += 1
+                return None
+            self._memory.move_to_end(query)
+            self._counters["hits"] += 1
+            return copy.deepcopy(entities)
+
+    def put(self, catalog: EntityCatalog, query: str, entities: Dict[str, Any]):
+        """저장 (복사본 저장, 오래된 항목부터 제거)"""
+        if self.max_entries <= 0:
+            return
+        entities = copy.deepcopy(entities)
+        with self._lock:
+            self._sync_catalog(catalog)
+            self._memory[query] = entities
+            self._memory.move_to_end(query)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def clear(self):
+        """전체 비우기"""
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """항목 수, 히트/미스/제거 카운터"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+# postgres_url → EntityMemo
+_entity_memos: Dict[str, EntityMemo] = {}
+_entity_memos_lock = threading.Lock()
+
+
+def get_entity_memo(postgres_url: str) -> EntityMemo:
+    """postgres_url의 공유 엔티티 추출 memo (없으면 생성)"""
+    memo = _entity_memos.get(postgres_url)
+    if memo is None:
+        with _entity_memos_lock:
+            memo = _entity_memos.setdefault(postgres_url, EntityMemo())
+    return memo
+
 
 class NLMapper:
     """자연어 → 온톨로지 엔티티 매핑 클래스"""
 
-    # 회사명 별칭 매핑 (alias → DB company_name)
-    COMPANY_ALIASES = {
-        # 삼성
-        '삼성화재': '삼성',
-        '삼성생명': '삼성',
-        '삼성손보': '삼성',
-        '삼성손해보험': '삼성',
-        # DB (구 동부)
-        '동부': 'DB',
-        '동부화재': 'DB',
-        '동부손보': 'DB',
-        '동부손해보험': 'DB',
-        'DB손보': 'DB',
-        'DB손해보험': 'DB',
-        'DB화재': 'DB',
-        # 현대
-        '현대해상': '현대',
-        '현대생명': '현대',
-        '현대손보': '현대',
-        '현대손해보험': '현대',
-        # 한화
-        '한화손보': '한화',
-        '한화손해보험': '한화',
-        '한화생명': '한화',
-        '한화화재': '한화',
-        # 롯데
-        '롯데손보': '롯데',
-        '롯데손해보험': '롯데',
-        '롯데화재': '롯데',
-        # KB
-        'KB손보': 'KB',
-        'KB손해보험': 'KB',
-        'KB생명': 'KB',
-        # 메리츠
-        '메리츠화재': '메리츠',
-        '메리츠손보': '메리츠',
-        '메리츠손해보험': '메리츠',
-        # 흥국
-        '흥국화재': '흥국',
-        '흥국생명': '흥국',
-        '흥국손보': '흥국',
-    }
+    # 회사명 별칭 매핑 (alias → DB company_name, 카탈로그 스냅샷과 공유)
+    COMPANY_ALIASES = COMPANY_ALIASES
+
+    # 금액 패턴 (정규식, 원 단위 변환), 앞 패턴부터 적용
+    AMOUNT_PATTERNS = (
+        # "1억", "2억5천만원" (먼저 처리)
+        (re.compile(r'(\d+)억(?:(\d+)천)?(?:(\d+)백)?만?원?'), lambda m: (
+            int(m.group(1)) * 100000000 +
+            (int(m.group(2)) * 10000000 if m.group(2) else 0) +
+            (int(m.group(3)) * 1000000 if m.group(3) else 0)
+        )),
+        # "3천만원", "2천5백만원"
+        (re.compile(r'(\d+)천(?:(\d+)백)?만원'), lambda m: (int(m.group(1)) * 1000 + (int(m.group(2)) * 100 if m.group(2) else 0)) * 10000),
+        # "3000만원", "3,000만원" (순수 숫자+만원)
+        (re.compile(r'(\d{1,4}),?(\d{3})만원'), lambda m: int(m.group(1) + m.group(2)) * 10000),
+    )
+
+    # 나이 패턴: 금액 단위가 있으면 명확한 나이 표현("40세", "40살")만
+    AGE_PATTERN = re.compile(r'(\d{1,2})(?:세|살)?')
+    EXPLICIT_AGE_PATTERN = re.compile(r'(\d{1,2})(?:세|살)')
 
     def __init__(self, postgres_url: str = None):
         """
@@ -86,21 +196,66 @@ class NLMapper:
         self.postgres_url = postgres_url or os.getenv("POSTGRES_URL")
         if not self.postgres_url:
             raise ValueError("POSTGRES_URL environment variable is required. Check .env file.")
-        self.pg_conn = psycopg2.connect(self.postgres_url)
+        self.entity_memo = get_entity_memo(self.postgres_url)
 
-        # 엔티티 캐시 (성능 최적화)
-        self._company_cache = None
-        self._product_cache = None
-        self._coverage_cache = None
-        self._disease_cache = None
+    @property
+    def catalog(self) -> EntityCatalog:
+        """프로세스 공유 엔티티 카탈로그 스냅샷 (없으면 로드)"""
+        return get_catalog(self.postgres_url)
 
     def extract_entities(self, query: str) -> Dict[str, Any]:
         """
-        질의에서 엔티티 추출
+        질의에서 엔티티 추출 (정규화 질의별 memo)
 
         Args:
             query: 자연어 질의
 
+        Returns:
+            추출된 엔티티와 필터 딕셔너리 (호출마다 새 복사본)
+        """
+        # 추출 중 카탈로그가 교체되어도 한 스냅샷으로 일관되게 처리
+        catalog = self.catalog
+        query = normalize_query(query)
+
+        entities = self.entity_memo.get(catalog, query)
+        if entities is None:
+            entities = self._extract_entities(query, catalog)
+            self.entity_memo.put(catalog, query, entities)
+        return entities
+
+    def extract_entities_batch(self, queries: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        여러 질의의 엔티티 추출 (평가/리플레이용)
+
+        한 카탈로그 스냅샷으로 서로 다른 정규화 질의만 1번씩 추출합니다.
+
+        Args:
+            queries: 자연어 질의 목록
+
+        Returns:
+            입력 순서대로 추출 결과 (같은 질의도 항목마다 별도 복사본)
+        """
+        catalog = self.catalog
+        normalized = [normalize_query(query) for query in queries]
+
+        extracted: Dict[str, Dict[str, Any]] = {}
+        for query in dict.fromkeys(normalized):
+            entities = self.entity_memo.get(catalog, query)
+            if entities is None:
+                entities = self._extract_entities(query, catalog)
+                self.entity_memo.put(catalog, query, entities)
+            extracted[query] = entities
+
+        return [copy.deepcopy(extracted[query]) for query in normalized]
+
+    def _extract_entities(self, query: str, catalog: EntityCatalog) -> Dict[str, Any]:
+        """
+        엔티티 추출 본체 (memo 미사용)
+
+        Args:
+            query: 정규화된 질의
+            catalog: 사용할 카탈로그 스냅샷
+
         Returns:
             추출된 엔티티와 필터 딕셔너리
         """
@@ -122,29 +277,32 @@ class NLMapper:
             "filters": {}
         }
 
+        # 회사/상품/담보/질병/키워드 표면형을 한 번에 매칭
+        matched = self._match_entities(query, catalog)
+
         # 1. 회사명 추출
-        companies = self._extract_companies(query)
+        companies = matched["companies"]
         if companies:
             entities["companies"] = companies
             entities["entities"]["companies"] = companies  # Also populate nested structure
-            entities["filters"]["company_id"] = self._get_company_id(companies[0])
+            entities["filters"]["company_id"] = catalog.company_id(companies[0])
 
         # 2. 상품명 추출
-        products = self._extract_products(query)
+        products = matched["products"]
         if products:
             entities["products"] = products
-            entities["filters"]["product_id"] = self._get_product_id(products[0])
+            entities["filters"]["product_id"] = catalog.product_id(products[0])
 
         # 3. 담보명 추출
-        coverages = self._extract_coverages(query)
+        coverages = matched["coverages"]
         if coverages:
             entities["coverages"] = coverages
             # Note: coverage_id는 벡터 검색 메타데이터 필터로 사용 가능
-            coverage_ids = [self._get_coverage_id(c) for c in coverages]
+            coverage_ids = [catalog.coverage_id(c) for c in coverages]
             entities["filters"]["coverage_ids"] = [cid for cid in coverage_ids if cid]
 
         # 4. 질병명 추출
-        diseases = self._extract_diseases(query)
+        diseases = matched["diseases"]
         if diseases:
             entities["diseases"] = diseases
 
@@ -167,146 +325,76 @@ class NLMapper:
             entities["filters"]["age"] = age_filter
 
         # 8. 핵심 키워드 추출
-        keywords = self._extract_keywords(query)
-        entities["keywords"] = keywords
+        entities["keywords"] = matched["keywords"]
 
         return entities
 
-    def _extract_companies(self, query: str) -> List[str]:
-        """회사명 추출 (별칭 매핑 + 부분 매칭 지원)"""
-        if not self._company_cache:
-            self._load_company_cache()
-
-        found = []
-        found_set = set()  # 중복 방지
-
-        # 1. 별칭 매핑 우선 처리 (긴 별칭부터 매칭하여 정확도 향상)
-        sorted_aliases = sorted(self.COMPANY_ALIASES.keys(), key=len, reverse=True)
-        for alias in sorted_aliases:
-            if alias in query:
-                company_name = self.COMPANY_ALIASES[alias]
-                if company_name not in found_set:
-                    found.append(company_name)
-                    found_set.add(company_name)
-
-        # 2. DB의 회사명/코드 직접 매칭
-        for company in self._company_cache:
-            company_name = company['company_name']
-            company_code = company['company_code']
-
-            if company_name in found_set:
-                continue
-
-            # 전체 이름 정확 매칭
-            if company_name in query:
-                found.append(company_name)
-                found_set.add(company_name)
-                continue
-
-            # 코드 매칭 (대소문자 무시)
-            if company_code and company_code.lower() in query.lower():
-                found.append(company_name)
-                found_set.add(company_name)
-                continue
-
-        # 3. 핵심 키워드 부분 매칭 (예: "삼성" → "삼성")
-        core_keywords = {
-            '삼성': '삼성',
-            '동부': 'DB',  # 동부 → DB
-            'DB': 'DB',
-            '롯데': '롯데',
-            '메리츠': '메리츠',
-            '한화': '한화',
-            '현대': '현대',
-            'KB': 'KB',
-            '흥국': '흥국',
-        }
-        for keyword, company_name in core_keywords.items():
-            if keyword in query and company_name not in found_set:
-                found.append(company_name)
-                found_set.add(company_name)
-
-        return found
-
-    def _extract_products(self, query: str) -> List[str]:
-        """상품명 추출"""
-        if not self._product_cache:
-            self._load_product_cache()
+    def _match_entities(self, query: str, catalog: Optional[EntityCatalog] = None) -> Dict[str, List[str]]:
+        """
+        카탈로그 오토마톤으로 질의를 한 번 스캔해 종류별 엔티티 추출
 
-        found = []
-        for product in self._product_cache:
-            # 상품명 부분 매칭 (예: "마이헬스", "리얼속속" 등)
-            if product['name'] in query:
-                found.append(product['name'])
+        결과 순서는 기존 종류별 선형 탐색과 같습니다:
+        - companies: 별칭(긴 별칭 우선) → DB 회사명/코드 → 핵심 키워드, 회사명 중복 제거
+        - products / diseases: 카탈로그 순서 (diseases는 이름 또는 코드 매칭)
+          + disease_code에 없지만 질병코드 집합 구간(예: C00-C97)에 속하는 코드 표기 (출현 순)
+        - coverages: 카탈로그 순서, 담보명 중복 제거 (정확 매칭 또는 공백 제거 질의에서 접미사 제거형 매칭)
+        - keywords: INSURANCE_KEYWORDS 순서
 
-        return found
+        Args:
+            query: 자연어 질의
+            catalog: 사용할 카탈로그 스냅샷 (기본: 현재 공유 스냅샷)
 
-    def _extract_coverages(self, query: str) -> List[str]:
-        """담보명 추출 (키워드 기반)"""
-        if not self._coverage_cache:
-            self._load_coverage_cache()
+        Returns:
+            {"companies": [...], "products": [...], "coverages": [...], "diseases": [...], "keywords": [...]}
+        """
+        catalog = catalog or self.catalog
 
-        query_normalized = query.replace(' ', '')
-        found = []
+        raw_end = len(query)
+        text = query + SEGMENT_SEPARATOR + query.replace(' ', '')
 
-        for coverage in self._coverage_cache:
-            name = coverage['name']
+        # 종류 → {우선순위: 값}
+        hits: Dict[str, Dict[tuple, str]] = {
+            "companies": {}, "products": {}, "coverages": {}, "diseases": {}, "keywords": {}
+        }
+        for _, end, (kind, priority, value, segment) in catalog.matcher.finditer(text):
+            if (end <= raw_end) == (segment == RAW_SEGMENT):
+                hits[kind][priority] = value
 
-            # 정확한 매칭
-            if name in query:
-                found.append(name)
-                continue
+        matched = {
+            kind: [value for _, value in sorted(kind_hits.items())]
+            for kind, kind_hits in hits.items()
+        }
+        matched["companies"] = list(dict.fromkeys(matched["companies"]))
+        matched["coverages"] = list(dict.fromkeys(matched["coverages"]))
+
+        # 구간으로만 저장된 코드 (disease_code 행 없음) → 질병코드 집합 bisect 조회
+        disease_index = catalog.disease_index
+        for mention in disease_index.find_codes(query):
+            for code in mention.split("-"):
+                if (code not in disease_index and code not in matched["diseases"]
+                        and disease_index.code_sets(code)):
+                    matched["diseases"].append(code)
+        return matched
 
-            # 부분 매칭 (예: "암 진단" → "암진단비")
-            name_without_suffix = name.replace('금', '').replace('비', '').replace('담보', '')
-            if name_without_suffix in query_normalized:
-                found.append(name)
-                continue
+    def _extract_companies(self, query: str) -> List[str]:
+        """회사명 추출 (별칭 매핑 + 부분 매칭 지원)"""
+        return self._match_entities(query)["companies"]
 
-        # 키워드 기반 매핑 (일반 용어 → 표준 담보명)
-        # 정확한 매칭이 없을 때만 키워드 기반 검색
-        # if not found:  # 제거 - 항상 키워드 검색 스킵하여 중복 방지
+    def _extract_products(self, query: str) -> List[str]:
+        """상품명 추출"""
+        return self._match_entities(query)["products"]
 
-        return list(set(found))  # 중복 제거
+    def _extract_coverages(self, query: str) -> List[str]:
+        """담보명 추출 (키워드 기반)"""
+        return self._match_entities(query)["coverages"]
 
     def _extract_diseases(self, query: str) -> List[str]:
         """질병명 추출"""
-        if not self._disease_cache:
-            self._load_disease_cache()
-
-        found = []
-        for disease in self._disease_cache:
-            if disease['name'] in query or disease['code'] in query:
-                found.append(disease['name'])
-
-        return found
+        return self._match_entities(query)["diseases"]
 
     def _extract_keywords(self, query: str) -> List[str]:
         """핵심 키워드 추출 (보험 도메인 용어)"""
-        # 보험 관련 키워드 패턴 (구체적 키워드를 먼저 배치하여 우선 매칭)
-        # 순서: 구체적 → 일반적 (제자리암 > 유사암 > 암)
-        insurance_keywords = [
-            # 구체적 암 종류 (우선순위 높음)
-            '제자리암', '경계성종양', '유사암', '4대유사암',
-            '갑상선암', '기타피부암', '재진단암',
-            '일반암', '소액암', '고액암',
-            # 일반 보장 타입
-            '보장', '진단', '수술', '입원', '통원',
-            # 일반 암/질병 (구체적 암 키워드 이후에 매칭)
-            '암', '뇌출혈', '급성심근경색', '질병', '상해',
-            # 조건 관련
-            '면책', '감액', '지급', '한도', '제한',
-            '가입', '나이', '기간', '금액', '조건',
-            # 특수 담보
-            '다빈치', '로봇'
-        ]
-
-        found = []
-        for keyword in insurance_keywords:
-            if keyword in query:
-                found.append(keyword)
-
-        return found
+        return self._match_entities(query)["keywords"]
 
     def _extract_amount(self, query: str) -> Optional[Dict[str, int]]:
         """
@@ -321,25 +409,10 @@ class NLMapper:
         Returns:
             {"min": int, "max": int} 또는 None
         """
-        import re
-
-        # 패턴 1: "N천만원", "N억원", "N만원"
-        patterns = [
-            # "1억", "2억5천만원" (먼저 처리)
-            (r'(\d+)억(?:(\d+)천)?(?:(\d+)백)?만?원?', lambda m: (
-                int(m.group(1)) * 100000000 +
-                (int(m.group(2)) * 10000000 if m.group(2) else 0) +
-                (int(m.group(3)) * 1000000 if m.group(3) else 0)
-            )),
-            # "3천만원", "2천5백만원"
-            (r'(\d+)천(?:(\d+)백)?만원', lambda m: (int(m.group(1)) * 1000 + (int(m.group(2)) * 100 if m.group(2) else 0)) * 10000),
-            # "3000만원", "3,000만원" (순수 숫자+만원)
-            (r'(\d{1,4}),?(\d{3})만원', lambda m: int(m.group(1) + m.group(2)) * 10000),
-        ]
-
+        # 패턴: "N억원", "N천만원", "N만원" (AMOUNT_PATTERNS)
         amounts = []
-        for pattern, converter in patterns:
-            for match in re.finditer(pattern, query):
+        for pattern, converter in self.AMOUNT_PATTERNS:
+            for match in pattern.finditer(query):
                 try:
                     amount = converter(match)
                     amounts.append(amount)
@@ -389,17 +462,15 @@ class NLMapper:
         Returns:
             {"min": int, "max": int} 또는 None
         """
-        import re
-
         # 금액 단위가 있으면 나이 추출 건너뛰기
         if any(keyword in query for keyword in ['만원', '억', '천만', '백만']):
             # 명확한 나이 표현만 추출
-            age_pattern = r'(\d{1,2})(?:세|살)'
+            age_pattern = self.EXPLICIT_AGE_PATTERN
         else:
             # 일반 패턴
-            age_pattern = r'(\d{1,2})(?:세|살)?'
+            age_pattern = self.AGE_PATTERN
 
-        matches = list(re.finditer(age_pattern, query))
+        matches = list(age_pattern.finditer(query))
         if not matches:
             return None
 
@@ -424,111 +495,15 @@ class NLMapper:
 
     def _get_company_id(self, company_name: str) -> Optional[int]:
         """회사명으로 company_id 조회"""
-        if not self._company_cache:
-            self._load_company_cache()
-
-        for company in self._company_cache:
-            if company['company_name'] == company_name:  # Fixed: was 'name'
-                return company['id']
-        return None
+        return self.catalog.company_id(company_name)
 
     def _get_product_id(self, product_name: str) -> Optional[int]:
         """상품명으로 product_id 조회"""
-        if not self._product_cache:
-            self._load_product_cache()
-
-        for product in self._product_cache:
-            if product['name'] == product_name:
-                return product['id']
-        return None
+        return self.catalog.product_id(product_name)
 
     def _get_coverage_id(self, coverage_name: str) -> Optional[int]:
         """담보명으로 coverage_id 조회"""
-        if not self._coverage_cache:
-            self._load_coverage_cache()
-
-        for coverage in self._coverage_cache:
-            if coverage['name'] == coverage_name:
-                return coverage['id']
-        return None
-
-    def _load_company_cache(self):
-        """회사 정보 캐시 로드"""
-        with self.pg_conn.cursor() as cur:
-            cur.execute("SELECT id, company_name, company_code FROM company")
-            self._company_cache = [
-                {"id": row[0], "company_name": row[1], "company_code": row[2]}  # Fixed: match dict keys to usage
-                for row in cur.fetchall()
-            ]
-
-    def _load_product_cache(self):
-        """상품 정보 캐시 로드"""
-        with self.pg_conn.cursor() as cur:
-            cur.execute("""
-                SELECT p.id, p.product_name, p.business_type, c.company_name
-                FROM product p
-                JOIN company c ON p.company_id = c.id
-            """)
-            self._product_cache = [
-                {
-                    "id": row[0],
-                    "name": row[1],
-                    "product_type": row[2],
-                    "company_name": row[3]
-                }
-                for row in cur.fetchall()
-            ]
-
-    def _load_coverage_cache(self):
-        """담보 정보 캐시 로드 (coverage 테이블 + structured_data)"""
-        with self.pg_conn.cursor() as cur:
-            # 1. coverage 테이블에서 기본 담보 로드
-            cur.execute("""
-                SELECT DISTINCT c.id, c.coverage_name, c.coverage_category
-                FROM coverage c
-                ORDER BY c.coverage_name
-            """)
-            self._coverage_cache = [
-                {"id": row[0], "name": row[1], "coverage_group": row[2]}
-                for row in cur.fetchall()
-            ]
-
-            # 2. clause_embedding.metadata->structured_data에서 추가 담보명 로드
-            cur.execute("""
-                SELECT DISTINCT
-                    ce.metadata->'structured_data'->>'coverage_name' as coverage_name
-                FROM clause_embedding ce
-                WHERE ce.metadata->'structured_data'->>'coverage_name' IS NOT NULL
-                  AND ce.metadata->'structured_data'->>'coverage_name' != ''
-            """)
-
-            # 기존 담보명 set 생성 (중복 방지)
-            existing_names = {c['name'] for c in self._coverage_cache}
-
-            # structured_data의 담보명 추가 (중복 제외)
-            for row in cur.fetchall():
-                coverage_name = row[0]
-                if coverage_name and coverage_name not in existing_names:
-                    # ID는 None (coverage 테이블에 없는 담보)
-                    self._coverage_cache.append({
-                        "id": None,
-                        "name": coverage_name,
-                        "coverage_group": "기타"
-                    })
-                    existing_names.add(coverage_name)
-
-    def _load_disease_cache(self):
-        """질병 코드 정보 캐시 로드"""
-        with self.pg_conn.cursor() as cur:
-            cur.execute("""
-                SELECT DISTINCT dc.code, dc.description_kr
-                FROM disease_code dc
-                LIMIT 1000  -- 성능을 위해 제한
-            """)
-            self._disease_cache = [
-                {"code": row[0], "name": row[1] or row[0]}
-                for row in cur.fetchall()
-            ]
+        return self.catalog.coverage_id(coverage_name)
 
     def get_filtered_search_params(
         self,
@@ -619,9 +594,7 @@ class NLMapper:
         return "\n".join(lines)
 
     def close(self):
-        """리소스 정리"""
-        if self.pg_conn:
-            self.pg_conn.close()
+        """리소스 정리 (연결은 공유 풀 소유이므로 반환할 것 없음)"""
 
     def __enter__(self):
         return self
@@ -630,6 +603,32 @@ class NLMapper:
         self.close()
 
 
+class AsyncNLMapper(NLMapper):
+    """
+    NLMapper의 asyncio 버전
+
+    DB 조회는 엔티티 카탈로그 로드뿐이므로 load()에서 공유 카탈로그를 async 풀로 로드하고,
+    extract_entities()는 NLMapper의 메모리 매칭을 그대로 사용합니다 (DB 대기 없음).
+    """
+
+    @property
+    def loaded(self) -> bool:
+        """공유 엔티티 카탈로그가 로드되었는지 여부"""
+        return peek_catalog(self.postgres_url) is not None
+
+    async def load(self):
+        """공유 엔티티 카탈로그 로드 (이미 로드되었으면 생략, 쿼리는 연결별로 동시 실행)"""
+        await get_catalog_async(self.postgres_url)
+
+    @property
+    def catalog(self) -> EntityCatalog:
+        """공유 카탈로그 스냅샷 (동기 로드는 이벤트 루프를 막으므로 load() 필요)"""
+        catalog = peek_catalog(self.postgres_url)
+        if catalog is None:
+            raise RuntimeError("Entity catalog is not loaded (await AsyncNLMapper.load() first)")
+        return catalog
+
+
 # 편의 함수
 def extract_entities_from_query(query: str, postgres_url: str = None) -> Dict[str, Any]:
     """
@@ -0,0 +1,519 @@
+"""
+Async Hybrid Retriever
+
+HybridRetriever의 asyncio 버전입니다. FastAPI async 핸들러에서 호출해도
+DB/임베딩 대기 중 이벤트 루프가 막히지 않으므로, 워커 1개가 여러 요청을 동시에 처리합니다.
+
+- DB: psycopg 3 async 연결 풀 (utils/async_db_pool.py)
+- SQL 생성, 필터, 재순위화, 결과 캐시는 HybridRetriever 로직을 그대로 사용
+- 벡터/lexical 채널과 다중 branch 검색(Amount 쿼리 doc_type별 검색, fallback tier,
+  회사별 비교 검색)은 branch마다 연결을 빌려 asyncio.gather로 동시에 실행
+  (UNION ALL 한 문장 대신 branch별 ef_search 적용)
+- 쿼리 임베딩(OpenAI 동기 클라이언트 + 임베딩 캐시)과 mmap exact 검색은 스레드에서 실행
+
+Usage:
+    from retrieval.async_hybrid_retriever import AsyncHybridRetriever
+
+    retriever = AsyncHybridRetriever()
+    results = await retriever.search("삼성화재 암 진단금 3000만원", top_k=5)
+    by_company = await retriever.search_multi_company("암진단", ["삼성", "DB"], "암진단비")
+"""
+
+import os
+import time
+import asyncio
+from typing import Dict, List, Any, Optional, Tuple
+
+from utils.async_db_pool import get_async_pool
+from ontology.nl_mapping import AsyncNLMapper
+from vector_index.openai_embedder import OpenAIEmbedder
+from retrieval.ef_search_policy import AsyncEfSearchPolicy
+from retrieval.tracing import span, traced
+from retrieval.search_hit import SearchHit
+from retrieval.hybrid_retriever import (
+    HybridRetriever,
+    COMPANY_IDS_BY_NAMES_SQL,
+    EXTRA_KEYWORD_MATCHES_SQL,
+    KEYWORD_MASK_EXPRESSION_SQL,
+    check_keyword_mask_vocabulary,
+)
+
+
+class AsyncHybridRetriever(HybridRetriever):
+    """하이브리드 검색 엔진 (asyncio)"""
+
+    def __init__(self, postgres_url: str = None):
+        """
+        Args:
+            postgres_url: PostgreSQL 연결 문자열
+        """
+        self.postgres_url = postgres_url or os.getenv("POSTGRES_URL")
+        if not self.postgres_url:
+            raise ValueError("POSTGRES_URL environment variable is required. Check .env file.")
+        self.pool = get_async_pool(self.postgres_url)
+        self.ef_search_policy = AsyncEfSearchPolicy(self.pool)
+        self.embedder = OpenAIEmbedder()
+        self.nl_mapper = AsyncNLMapper(self.postgres_url)
+        self._init_search_settings()
+        self._keyword_mask_verified = False
+
+    async def _verify_keyword_mask(self):
+        """DB keyword_mask 어휘 확인 (첫 검색 시 1회, 불일치 시 RuntimeError)"""
+        if self._keyword_mask_verified:
+            return
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(KEYWORD_MASK_EXPRESSION_SQL)
+            row = await cur.fetchone()
+        check_keyword_mask_vocabulary(row[0] if row else None)
+        self._keyword_mask_verified = True
+
+    @traced("search")
+    async def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """
+        하이브리드 검색 실행 (인자/반환값은 HybridRetriever.search와 동일)
+        """
+        if self.search_cache is None:
+            return await self._search_uncached(query, top_k, filters, query_embedding, trace)
+
+        with span(trace, "search.cache_lookup") as stage:
+            cache_key, results = self._lookup_cached(
+                query, top_k, filters, await self.corpus_version_cache.get_async(self.pool), trace
+            )
+            stage["hit"] = results is not None
+        if results is not None:
+            return results
+
+        start = time.perf_counter()
+        results = await self._search_uncached(query, top_k, filters, query_embedding, trace)
+        if cache_key is not None:
+            self.search_cache.put(cache_key, results, compute_ms=(time.perf_counter() - start) * 1000)
+        return results
+
+    async def _search_uncached(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        query_embedding: Optional[List[float]],
+        trace: Optional[Dict[str, Any]]
+    ) -> List[SearchHit]:
+        """search() 본체 (HybridRetriever._search_uncached와 같은 단계)"""
+        # 1. 엔티티 추출 (캐시 로드 후 메모리 매칭) + 2. 필터/부스팅 키워드/후보 풀 크기 결정
+        with span(trace, "search.entities"):
+            await self.nl_mapper.load()
+            await self._verify_keyword_mask()
+            entities = self.nl_mapper.extract_entities(query)
+            prepared = self._prepare_search(query, top_k, filters, entities)
+        search_filters = prepared["filters"]
+
+        # 3. 쿼리 임베딩 생성
+        if query_embedding is None:
+            with span(trace, "search.embed"):
+                query_embedding = await asyncio.to_thread(self.embedder.embed_query, query)
+
+        await self.ef_search_policy.refresh()
+
+        # 4. 벡터 검색 (Amount 쿼리는 doc_type별 branch 포함)
+        # 4.5. 벡터/lexical 채널은 서로 독립이므로 동시에 실행 후 RRF 병합
+        if prepared["lexical_terms"]:
+            results, lexical_results = await asyncio.gather(
+                self._vector_channel_search(query_embedding, prepared, prepared["vector_top_k"], trace),
+                self._lexical_search(
+                    query_embedding=query_embedding,
+                    terms=prepared["lexical_terms"],
+                    filters=search_filters,
+                    top_k=prepared["vector_top_k"],
+                    trace=trace
+                )
+            )
+            if lexical_results:
+                results = self._fuse_rrf(results, lexical_results, prepared["search_top_k"])
+            elif prepared["vector_top_k"] < prepared["search_top_k"]:
+                # lexical 결과가 없으면 줄인 벡터 후보 풀을 search_top_k로 다시 검색
+                results = await self._vector_channel_search(
+                    query_embedding, prepared, prepared["search_top_k"], trace
+                )
+        else:
+            results = await self._vector_channel_search(
+                query_embedding, prepared, prepared["search_top_k"], trace
+            )
+
+        # Zero-result fallback (coverage 쿼리)
+        if prepared["has_coverage_query"] and len(results) == 0:
+            results = await self._tiered_vector_search(
+                query_embedding=query_embedding,
+                tier_filters=self._build_fallback_tiers(search_filters),
+                top_k=prepared["search_top_k"],
+                trace=trace
+            )
+
+        # 5. 키워드 부스팅으로 재순위화
+        with span(trace, "search.rerank", candidates=len(results)):
+            extra_matches = await self._count_extra_keyword_matches(results, prepared["boost_keywords"])
+            results = self._rerank_with_keyword_boost(
+                results, prepared["boost_keywords"], top_k,
+                require_amount=prepared["is_amount_query"],
+                extra_matches=extra_matches
+            )
+
+        # 6. 최종 top_k 조항 텍스트만 조회
+        with span(trace, "search.clause_text", rows=len(results)):
+            await self._attach_clause_texts([results])
+        return results
+
+    @traced("search.lexical")
+    async def _lexical_search(
+        self,
+        query_embedding: List[float],
+        terms: List[str],
+        filters: Dict[str, Any],
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """pg_trgm 인덱스 기반 lexical 검색 (HybridRetriever._lexical_search 참고)"""
+        query, query_params, index_terms = self._build_lexical_search_sql(
+            self._vector_literal(query_embedding), terms, filters, top_k
+        )
+
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(query, query_params)
+            results = [self._lexical_row_to_result(row) for row in await cur.fetchall()]
+
+        self._record_lexical_search(trace, terms, index_terms, top_k, len(results))
+        return results
+
+    @traced("vector.filtered")
+    async def _filtered_vector_search(
+        self,
+        query_embedding: List[float],
+        filters: Dict[str, Any],
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """필터링된 벡터 검색"""
+        branch_results, plan = await self._fan_out_vector_search([(query_embedding, filters)], top_k)
+        results = branch_results[0]
+        self._record_vector_search(trace, "filtered", plan, top_k, [len(results)])
+        return results
+
+    @traced("vector.multi_doc_type")
+    async def _multi_doc_type_vector_search(
+        self,
+        query_embedding: List[float],
+        filters: Dict[str, Any],
+        doc_types: List[str],
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """
+        기본 필터 검색 + doc_type별 검색을 동시에 실행 (Amount 쿼리용)
+
+        병합 순서는 HybridRetriever의 UNION ALL 버전과 같습니다
+        (clause_id 중복은 먼저 나온 branch 우선).
+        """
+        branch_filters = [filters] + [
+            {"company_id": filters["company_id"], "doc_type": doc_type}
+            for doc_type in doc_types
+        ]
+
+        branch_results, plan = await self._fan_out_vector_search(
+            [(query_embedding, branch_filter) for branch_filter in branch_filters], top_k
+        )
+        results, branch_counts = self._merge_branch_results(branch_results)
+        self._record_vector_search(trace, "multi_doc_type", plan, top_k, branch_counts)
+        return results
+
+    @traced("vector.fallback_tiers")
+    async def _tiered_vector_search(
+        self,
+        query_embedding: List[float],
+        tier_filters: List[Dict[str, Any]],
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """
+        Fallback tier 검색을 동시에 실행하고 결과가 있는 가장 구체적인 tier 사용
+
+        Returns:
+            검색 결과 리스트 (각 결과에 fallback_tier 포함, 1부터 시작)
+        """
+        branch_results, plan = await self._fan_out_vector_search(
+            [(query_embedding, tier_filter) for tier_filter in tier_filters], top_k
+        )
+
+        tier_index = next(
+            (index for index, tier_results in enumerate(branch_results) if tier_results),
+            len(tier_filters) - 1
+        )
+        results = branch_results[tier_index]
+        for result in results:
+            result.fallback_tier = tier_index + 1
+
+        branch_counts = [len(results) if index == tier_index else 0 for index in range(len(tier_filters))]
+        self._record_vector_search(trace, "fallback_tiers", plan, top_k, branch_counts)
+        self._record_fallback_tier(trace, results)
+        return results
+
+    async def _fan_out_vector_search(
+        self,
+        branches: List[Tuple[List[float], Dict[str, Any]]],
+        top_k: int
+    ) -> Tuple[List[List[SearchHit]], Dict[str, Any]]:
+        """
+        branch별 벡터 검색 동시 실행
+
+        Args:
+            branches: (쿼리 임베딩, 필터) 리스트
+            top_k: branch당 반환할 결과 개수
+
+        Returns:
+            (branch별 검색 결과 리스트, _record_vector_search용 plan)
+        """
+        if self._use_mmap([branch_filter for _, branch_filter in branches]):
+            return await self._mmap_vector_search(branches, top_k)
+
+        outcomes = await asyncio.gather(*(
+            self._vector_branch_search(query_embedding, branch_filter, top_k)
+            for query_embedding, branch_filter in branches
+        ))
+
+        branch_plans = [branch_plan for _, branch_plan in outcomes]
+        ef_values = [branch_plan["ef_search"] for branch_plan in branch_plans if branch_plan["ef_search"]]
+        plan = {
+            "ef_search": max(ef_values) if ef_values else None,
+            "exact_scan": all(branch_plan["exact_scan"] for branch_plan in branch_plans),
+            "branches": [branch_plan["branches"][0] for branch_plan in branch_plans],
+        }
+        return [branch_results for branch_results, _ in outcomes], plan
+
+    async def _vector_branch_search(
+        self,
+        query_embedding: List[float],
+        filters: Dict[str, Any],
+        top_k: int
+    ) -> Tuple[List[SearchHit], Dict[str, Any]]:
+        """
+        단일 branch 벡터 검색 (연결 1개, branch 선택도에 맞춘 ef_search)
+
+        Returns:
+            (검색 결과 리스트, EfSearchPolicy.plan() 결과)
+        """
+        plan = self.ef_search_policy.plan([filters], self._candidate_k(top_k))
+        query, query_params = self._build_vector_search_sql(
+            self._vector_literal(query_embedding), filters, top_k,
+            exact_scan=plan["branches"][0]["exact_scan"]
+        )
+
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await self.ef_search_policy.apply(cur, plan)
+            await cur.execute(query, query_params)
+            rows = await cur.fetchall()
+
+        return [self._row_to_result(row) for row in rows], plan
+
+    async def _mmap_vector_search(
+        self,
+        branches: List[Tuple[List[float], Dict[str, Any]]],
+        top_k: int
+    ) -> Tuple[List[List[SearchHit]], Dict[str, Any]]:
+        """mmap 인덱스 검색 (NumPy 연산은 스레드, keyword_mask는 async 조회)"""
+        branch_hits, plan = await asyncio.to_thread(self._mmap_search_hits, branches, top_k)
+        keyword_masks = await self._fetch_keyword_masks(
+            {clause_id for hits in branch_hits for clause_id, _, _ in hits}
+        )
+        return self._mmap_hits_to_results(branch_hits, keyword_masks), plan
+
+    async def _count_extra_keyword_matches(
+        self,
+        results: List[SearchHit],
+        keywords: List[str]
+    ) -> Dict[int, int]:
+        """어휘에 없는 부스팅 키워드의 후보 조항별 포함 개수 (HybridRetriever 참고)"""
+        _, extra_terms = self._split_boost_keywords(keywords)
+        if not extra_terms or not results:
+            return {}
+
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(
+                EXTRA_KEYWORD_MATCHES_SQL,
+                (extra_terms, list({result.clause_id for result in results}))
+            )
+            return dict(await cur.fetchall())
+
+    async def _attach_clause_texts(self, result_lists: List[List[SearchHit]]):
+        """재순위화 후 남은 결과의 조항 텍스트를 한 번에 조회해 채움"""
+        clause_texts = await self._fetch_clause_texts(
+            {result.clause_id for results in result_lists for result in results}
+        )
+        self._fill_clause_texts(result_lists, clause_texts)
+
+    async def _fetch_keyword_masks(self, clause_ids) -> Dict[int, int]:
+        """clause_id 집합 → keyword_mask (PK 조회 1회)"""
+        if not clause_ids:
+            return {}
+
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(
+                "SELECT id, keyword_mask FROM document_clause WHERE id = ANY(%s)",
+                (list(clause_ids),)
+            )
+            return dict(await cur.fetchall())
+
+    async def _fetch_clause_texts(self, clause_ids) -> Dict[int, str]:
+        """clause_id 집합 → 조항 텍스트 (PK 조회 1회)"""
+        if not clause_ids:
+            return {}
+
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(
+                "SELECT id, clause_text FROM document_clause WHERE id = ANY(%s)",
+                (list(clause_ids),)
+            )
+            return dict(await cur.fetchall())
+
+    @traced("search_multi_company")
+    async def search_multi_company(
+        self,
+        query: str,
+        company_names: List[str],
+        coverage_name: str,
+        top_k: int = 5,
+        search_top_k: int = 50,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[SearchHit]]:
+        """
+        여러 보험사에 대해 동일 쿼리로 검색 (인자/반환값은 HybridRetriever.search_multi_company와 동일)
+
+        회사·branch별 벡터 검색을 asyncio.gather로 동시에 실행합니다.
+        """
+        results_by_company: Dict[str, List[SearchHit]] = {
+            company_name: [] for company_name in company_names
+        }
+        if not company_names:
+            return results_by_company
+
+        # 1. company_id 일괄 조회 (못 찾은 회사는 빈 결과)
+        with span(trace, "multi_company.company_ids"):
+            company_ids = await self._get_company_ids_by_names(company_names)
+        targets = [
+            (company_name, company_ids[company_name])
+            for company_name in company_names
+            if company_ids.get(company_name)
+        ]
+        if not targets:
+            return results_by_company
+
+        # 2. 회사별 쿼리 임베딩을 한 번의 API 호출로 생성
+        company_queries = [
+            self._build_company_query(company_name, coverage_name)
+            for company_name, _ in targets
+        ]
+        try:
+            with span(trace, "multi_company.embed", rows=len(company_queries)):
+                company_embeddings = await asyncio.to_thread(self.embedder.embed_queries, company_queries)
+        except Exception as e:
+            print(f"Error in batched query embedding for multi-company search: {e}")
+            return results_by_company
+
+        # 3. 필터/부스팅 키워드/금액 쿼리 여부는 전체 질의(+담보명) 기준으로 한 번만 계산
+        intent_query = self._multi_company_intent_query(query, coverage_name)
+        with span(trace, "multi_company.entities"):
+            await self.nl_mapper.load()
+            await self._verify_keyword_mask()
+            entities = self.nl_mapper.extract_entities(intent_query)
+            prepared = self._prepare_multi_company_search(intent_query, search_top_k, entities)
+
+        # 4. 회사별 branch 후보를 동시에 조회, 결과가 없는 회사만 fallback tier
+        await self.ef_search_policy.refresh()
+        target_ids = [company_id for _, company_id in targets]
+        candidates = await self._multi_company_vector_search(
+            company_ids=target_ids,
+            query_embeddings=company_embeddings,
+            branch_filters=prepared["branch_filters"],
+            top_k=prepared["search_top_k"],
+            trace=trace
+        )
+        empty = [index for index in range(len(targets)) if not candidates.get(index)]
+        if prepared["fallback_tiers"] and empty:
+            fallback = await self._multi_company_vector_search(
+                company_ids=[target_ids[index] for index in empty],
+                query_embeddings=[company_embeddings[index] for index in empty],
+                branch_filters=prepared["fallback_tiers"],
+                top_k=prepared["search_top_k"],
+                trace=trace,
+                first_branch_only=True
+            )
+            for position, index in enumerate(empty):
+                candidates[index] = fallback.get(position, [])
+
+        with span(trace, "multi_company.rerank"):
+            extra_matches = await self._count_extra_keyword_matches(
+                [result for results in candidates.values() for result in results],
+                prepared["boost_keywords"]
+            )
+            for index, (company_name, _) in enumerate(targets):
+                results_by_company[company_name] = self._rerank_with_keyword_boost(
+                    candidates.get(index, []), prepared["boost_keywords"], search_top_k,
+                    require_amount=prepared["is_amount_query"],
+                    extra_matches=extra_matches
+                )
+
+        # 5. 회사별 최종 결과의 조항 텍스트만 한 번에 조회
+        with span(trace, "multi_company.clause_text"):
+            await self._attach_clause_texts(list(results_by_company.values()))
+
+        return results_by_company
+
+    @traced("vector.multi_company")
+    async def _multi_company_vector_search(
+        self,
+        company_ids: List[int],
+        query_embeddings: List[List[float]],
+        branch_filters: List[Dict[str, Any]],
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None,
+        first_branch_only: bool = False
+    ) -> Dict[int, List[SearchHit]]:
+        """
+        회사별 × branch별 벡터 검색 동시 실행 (회사별 쿼리 벡터 + company_id 필터)
+
+        인자는 HybridRetriever._multi_company_vector_search와 동일합니다.
+
+        Returns:
+            {company_ids 인덱스: 검색 결과 리스트} (결과가 없는 회사는 키 없음)
+        """
+        branch_results, plan = await self._fan_out_vector_search(
+            [
+                (embedding, {**branch_filter, "company_id": company_id})
+                for company_id, embedding in zip(company_ids, query_embeddings)
+                for branch_filter in branch_filters
+            ],
+            top_k
+        )
+        results_by_index, counts = self._combine_company_branches(
+            branch_results, len(branch_filters), first_branch_only
+        )
+        self._record_vector_search(
+            trace, "multi_company_fallback" if first_branch_only else "multi_company",
+            plan, top_k, counts
+        )
+        return results_by_index
+
+    async def _get_company_ids_by_names(self, company_names: List[str]) -> Dict[str, int]:
+        """회사명 리스트로 company_id 일괄 조회 (부분 매칭)"""
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(COMPANY_IDS_BY_NAMES_SQL, (list(company_names),))
+            return {name: company_id for name, company_id in await cur.fetchall() if company_id}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -6,6 +6,7 @@ Context Assembly
 주요 기능:
 - 벡터 검색 결과 + DB 구조화 데이터 병합
 - 중복 제거 및 랭킹
+- 메타데이터는 SearchHit에 참조로 연결 (결과 복사 없음)
 - Citation 매핑 (clause_id, document_id, page)
 - LLM 프롬프트용 포맷팅
 
@@ -17,16 +18,64 @@ Usage:
         vector_results=retriever_results,
         query="암 진단시 보장금액은?"
     )
+
+    # asyncio (FastAPI 핸들러 등)
+    assembler = AsyncContextAssembler()
+    context = await assembler.assemble(vector_results=retriever_results, query="암 진단시 보장금액은?")
 """
 
 import os
-import psycopg2
+import asyncio
+from operator import attrgetter
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
+from utils.db_pool import get_pool
+from utils.async_db_pool import get_async_pool
+from retrieval.tracing import span, traced
+from retrieval.search_hit import SearchHit
 
 # Load environment variables from .env file
 load_dotenv()
 
+# 조항 상세 정보 + 문서 정보 (ContextAssembler / AsyncContextAssembler 공용)
+CLAUSE_METADATA_SQL = """
+    SELECT
+        dc.id as clause_id,
+        dc.clause_number,
+        dc.clause_title,
+        dc.section_type,
+        dc.page_number,
+        doc.document_id,
+        doc.doc_type,
+        doc.doc_subtype,
+        c.company_name as company_name,
+        c.company_code as company_code,
+        p.product_name as product_name,
+        p.business_type
+    FROM document_clause dc
+    JOIN document doc ON dc.document_id = doc.id
+    LEFT JOIN company c ON doc.company_id = c.id
+    LEFT JOIN product p ON doc.product_id = p.id
+    WHERE dc.id = ANY(%s)
+"""
+
+# 조항별 담보/급부 정보 (조항당 여러 행)
+CLAUSE_COVERAGE_SQL = """
+    SELECT
+        dc.id as clause_id,
+        c.coverage_name,
+        c.id as coverage_id,
+        b.benefit_amount,
+        b.benefit_type,
+        b.payment_frequency
+    FROM document_clause dc
+    LEFT JOIN clause_coverage cc ON dc.id = cc.clause_id
+    LEFT JOIN coverage c ON cc.coverage_id = c.id
+    LEFT JOIN benefit b ON c.id = b.coverage_id
+    WHERE dc.id = ANY(%s)
+      AND c.coverage_name IS NOT NULL
+"""
+
 
 class ContextAssembler:
     """컨텍스트 조립 클래스"""
@@ -39,14 +88,16 @@ class ContextAssembler:
         self.postgres_url = postgres_url or os.getenv("POSTGRES_URL")
         if not self.postgres_url:
             raise ValueError("POSTGRES_URL environment variable is required. Check .env file.")
-        self.pg_conn = psycopg2.connect(self.postgres_url)
+        self.pool = get_pool(self.postgres_url)
 
+    @traced("context.assemble", rows=lambda context: len(context["clauses"]))
     def assemble(
         self,
         vector_results: List[Dict[str, Any]],
         query: str,
         max_context_length: int = 4000,
-        include_metadata: bool = True
+        include_metadata: bool = True,
+        trace: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         벡터 검색 결과를 LLM용 컨텍스트로 조립합니다.
@@ -56,6 +107,7 @@ class ContextAssembler:
             query: 사용자 질의
             max_context_length: 최대 컨텍스트 길이 (토큰 수)
             include_metadata: 메타데이터 포함 여부
+            trace: 검색 트레이스 (선택적, retrieval.tracing 참고)
 
         Returns:
             조립된 컨텍스트 딕셔너리
@@ -74,8 +126,21 @@ class ContextAssembler:
         ranked_results = self._rank(unique_results)
 
         # 3. DB에서 추가 메타데이터 가져오기
-        enriched_results = self._enrich_with_metadata(ranked_results)
+        with span(trace, "context.metadata", rows=len(ranked_results)):
+            enriched_results = self._enrich_with_metadata(ranked_results)
+
+        return self._build_assembled_context(
+            query, enriched_results, max_context_length, include_metadata
+        )
 
+    def _build_assembled_context(
+        self,
+        query: str,
+        enriched_results: List[Dict[str, Any]],
+        max_context_length: int,
+        include_metadata: bool
+    ) -> Dict[str, Any]:
+        """메타데이터가 병합된 결과 → assemble() 반환 딕셔너리 (DB 조회 없음)"""
         # 4. Citation 매핑
         citations = self._build_citations(enriched_results)
 
@@ -96,28 +161,28 @@ class ContextAssembler:
             "metadata": metadata
         }
 
-    def _deduplicate(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _deduplicate(self, results: List[Dict[str, Any]]) -> List[SearchHit]:
         """
         중복 조항 제거
 
         Args:
-            results: 검색 결과
+            results: 검색 결과 (SearchHit 또는 dict)
 
         Returns:
-            중복 제거된 결과
+            중복 제거된 결과 (SearchHit)
         """
         seen_clause_ids = set()
         unique_results = []
 
         for result in results:
-            clause_id = result.get('clause_id')
-            if clause_id not in seen_clause_ids:
-                seen_clause_ids.add(clause_id)
+            result = SearchHit.coerce(result)
+            if result.clause_id not in seen_clause_ids:
+                seen_clause_ids.add(result.clause_id)
                 unique_results.append(result)
 
         return unique_results
 
-    def _rank(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _rank(self, results: List[SearchHit]) -> List[SearchHit]:
         """
         결과 랭킹 (유사도 + 문서 타입 가중치)
 
@@ -141,23 +206,21 @@ class ContextAssembler:
 
         # 재스코어링 및 정렬
         for result in results:
-            original_similarity = result.get('similarity', 0)
-            doc_type = result.get('doc_type', '약관')
-            weight = doc_type_weights.get(doc_type, 1.0)
+            weight = doc_type_weights.get(result.doc_type or '약관', 1.0)
 
             # 가중치 적용한 스코어 계산
-            result['weighted_score'] = original_similarity * weight
-            result['doc_type_weight'] = weight
+            result.weighted_score = (result.similarity or 0) * weight
+            result.doc_type_weight = weight
 
         # weighted_score 기준으로 재정렬
-        ranked = sorted(results, key=lambda x: x.get('weighted_score', 0), reverse=True)
+        ranked = sorted(results, key=attrgetter('weighted_score'), reverse=True)
 
         return ranked
 
     def _enrich_with_metadata(
         self,
-        results: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        results: List[SearchHit]
+    ) -> List[SearchHit]:
         """
         DB에서 추가 메타데이터를 가져와서 결과를 풍부하게 만듭니다.
 
@@ -170,100 +233,82 @@ class ContextAssembler:
         if not results:
             return results
 
-        clause_ids = [r['clause_id'] for r in results]
+        clause_ids = [r.clause_id for r in results]
 
-        with self.pg_conn.cursor() as cur:
+        with self.pool.connection() as conn, conn.cursor() as cur:
             # 조항 상세 정보 + 문서 정보 조회
-            cur.execute("""
-                SELECT
-                    dc.id as clause_id,
-                    dc.clause_number,
-                    dc.clause_title,
-                    dc.section_type,
-                    dc.page_number,
-                    doc.document_id,
-                    doc.doc_type,
-                    doc.doc_subtype,
-                    c.company_name as company_name,
-                    c.company_code as company_code,
-                    p.product_name as product_name,
-                    p.business_type
-                FROM document_clause dc
-                JOIN document doc ON dc.document_id = doc.id
-                LEFT JOIN company c ON doc.company_id = c.id
-                LEFT JOIN product p ON doc.product_id = p.id
-                WHERE dc.id = ANY(%s)
-            """, (clause_ids,))
-
-            metadata_map = {}
-            for row in cur.fetchall():
-                metadata_map[row[0]] = {
-                    'clause_number': row[1],
-                    'clause_title': row[2],
-                    'section_type': row[3],
-                    'page_number': row[4],
-                    'document_id': row[5],
-                    'doc_type': row[6],
-                    'doc_subtype': row[7],
-                    'company_name': row[8],
-                    'company_code': row[9],
-                    'product_name': row[10],
-                    'product_type': row[11]
-                }
+            cur.execute(CLAUSE_METADATA_SQL, (clause_ids,))
+            metadata_rows = cur.fetchall()
 
             # ✨ Context Enrichment: Add coverage/benefit information
-            cur.execute("""
-                SELECT
-                    dc.id as clause_id,
-                    c.coverage_name,
-                    c.id as coverage_id,
-                    b.benefit_amount,
-                    b.benefit_type,
-                    b.payment_frequency
-                FROM document_clause dc
-                LEFT JOIN clause_coverage cc ON dc.id = cc.clause_id
-                LEFT JOIN coverage c ON cc.coverage_id = c.id
-                LEFT JOIN benefit b ON c.id = b.coverage_id
-                WHERE dc.id = ANY(%s)
-                  AND c.coverage_name IS NOT NULL
-            """, (clause_ids,))
-
-            # Store coverage/benefit info (can have multiple per clause)
-            coverage_map = {}
-            for row in cur.fetchall():
-                clause_id = row[0]
-                if clause_id not in coverage_map:
-                    coverage_map[clause_id] = []
-
-                coverage_info = {
-                    'coverage_name': row[1],
-                    'coverage_id': row[2],
-                    'benefit_amount': row[3],
-                    'benefit_type': row[4],
-                    'payment_frequency': row[5]
-                }
-                coverage_map[clause_id].append(coverage_info)
-
-        # 결과에 메타데이터 병합
-        enriched = []
+            cur.execute(CLAUSE_COVERAGE_SQL, (clause_ids,))
+            coverage_rows = cur.fetchall()
+
+        return self._merge_metadata(results, metadata_rows, coverage_rows)
+
+    @staticmethod
+    def _merge_metadata(
+        results: List[SearchHit],
+        metadata_rows: List[tuple],
+        coverage_rows: List[tuple]
+    ) -> List[SearchHit]:
+        """
+        CLAUSE_METADATA_SQL / CLAUSE_COVERAGE_SQL 결과를 검색 결과에 병합
+
+        결과를 복사하지 않고 각 SearchHit에 메타데이터 dict를 참조로 연결합니다
+        (겹치는 키는 메타데이터 값 우선).
+
+        Args:
+            results: 검색 결과
+            metadata_rows: 조항/문서 메타데이터 행
+            coverage_rows: 조항별 담보/급부 행
+
+        Returns:
+            메타데이터가 추가된 결과
+        """
+        metadata_map = {}
+        for row in metadata_rows:
+            metadata_map[row[0]] = {
+                'clause_number': row[1],
+                'clause_title': row[2],
+                'section_type': row[3],
+                'page_number': row[4],
+                'document_id': row[5],
+                'doc_type': row[6],
+                'doc_subtype': row[7],
+                'company_name': row[8],
+                'company_code': row[9],
+                'product_name': row[10],
+                'product_type': row[11]
+            }
+
+        # Store coverage/benefit info (can have multiple per clause)
+        coverage_map = {}
+        for row in coverage_rows:
+            clause_id = row[0]
+            if clause_id not in coverage_map:
+                coverage_map[clause_id] = []
+
+            coverage_info = {
+                'coverage_name': row[1],
+                'coverage_id': row[2],
+                'benefit_amount': row[3],
+                'benefit_type': row[4],
+                'payment_frequency': row[5]
+            }
+            coverage_map[clause_id].append(coverage_info)
+
+        # 결과에 메타데이터 연결 (복사 없음)
         for result in results:
-            clause_id = result['clause_id']
+            clause_id = result.clause_id
             if clause_id in metadata_map:
-                enriched_result = {**result, **metadata_map[clause_id]}
-
-                # Add coverage/benefit info if available
-                if clause_id in coverage_map:
-                    enriched_result['coverages'] = coverage_map[clause_id]
+                result.attach_metadata(metadata_map[clause_id])
 
-                enriched.append(enriched_result)
-            else:
-                # Even if no metadata, add coverage info if available
-                enriched_result = {**result}
-                if clause_id in coverage_map:
-                    enriched_result['coverages'] = coverage_map[clause_id]
-                enriched.append(enriched_result)
+            # Add coverage/benefit info if available (even if no metadata)
+            if clause_id in coverage_map:
+                result.coverages = coverage_map[clause_id]
 
-        return enriched
+        return results
 
     def _build_citations(
         self,
@@ -414,12 +459,70 @@ class ContextAssembler:
         }
 
     def close(self):
-        """PostgreSQL 연결 종료"""
-        if self.pg_conn:
-            self.pg_conn.close()
+        """리소스 정리 (연결은 공유 풀 소유이므로 반환할 것 없음)"""
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
+
+
+class AsyncContextAssembler(ContextAssembler):
+    """
+    ContextAssembler의 asyncio 버전
+
+    메타데이터/담보 조회 2개를 async 풀의 연결 2개로 동시에 실행하고,
+    중복 제거·랭킹·텍스트 조립은 ContextAssembler 로직을 그대로 사용합니다.
+    """
+
+    def __init__(self, postgres_url: str = None):
+        """
+        Args:
+            postgres_url: PostgreSQL 연결 문자열
+        """
+        self.postgres_url = postgres_url or os.getenv("POSTGRES_URL")
+        if not self.postgres_url:
+            raise ValueError("POSTGRES_URL environment variable is required. Check .env file.")
+        self.pool = get_async_pool(self.postgres_url)
+
+    @traced("context.assemble", rows=lambda context: len(context["clauses"]))
+    async def assemble(
+        self,
+        vector_results: List[Dict[str, Any]],
+        query: str,
+        max_context_length: int = 4000,
+        include_metadata: bool = True,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """벡터 검색 결과를 LLM용 컨텍스트로 조립합니다 (ContextAssembler.assemble 참고)."""
+        unique_results = self._deduplicate(vector_results)
+        ranked_results = self._rank(unique_results)
+        with span(trace, "context.metadata", rows=len(ranked_results)):
+            enriched_results = await self._enrich_with_metadata(ranked_results)
+
+        return self._build_assembled_context(
+            query, enriched_results, max_context_length, include_metadata
+        )
+
+    async def _enrich_with_metadata(
+        self,
+        results: List[SearchHit]
+    ) -> List[SearchHit]:
+        """DB 메타데이터 병합 (두 조회를 동시에 실행)"""
+        if not results:
+            return results
+
+        clause_ids = [r.clause_id for r in results]
+        metadata_rows, coverage_rows = await asyncio.gather(
+            self._fetch_all(CLAUSE_METADATA_SQL, clause_ids),
+            self._fetch_all(CLAUSE_COVERAGE_SQL, clause_ids),
+        )
+
+        return self._merge_metadata(results, metadata_rows, coverage_rows)
+
+    async def _fetch_all(self, sql: str, clause_ids: List[int]) -> List[tuple]:
+        """clause_id 배열 조건 쿼리 1개 실행 (연결 1개 대여)"""
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(sql, (clause_ids,))
+            return await cur.fetchall()
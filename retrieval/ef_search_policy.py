@@ -0,0 +1,275 @@
+"""
+Adaptive ef_search Policy
+
+필터 선택도(selectivity)에 따라 벡터 검색마다 hnsw.ef_search를 결정합니다.
+
+- 필터 없음: pgvector 기본값(40) 수준으로 탐색 (top_k 이상 보장)
+- 필터 있음: HNSW는 그래프 탐색 후 필터를 적용하므로, top_k를 채우려면
+  약 top_k / selectivity 개의 후보가 필요 → ef_search를 그만큼 증가 (상한 1000)
+- 매칭 행이 아주 적은 파티션: HNSW 대신 B-tree 필터 + 정확한 거리 정렬 (exact scan)
+  plan의 branch별 exact_scan은 SQL 생성 쪽이 반영합니다: 해당 branch만 인덱스가 쓸 수 없는
+  정렬식(ORDER BY similarity DESC)으로 구성하므로, 같은 문장의 다른 branch는 HNSW를 그대로
+  사용하고 document/PK 조인의 인덱스 스캔도 막지 않습니다.
+
+선택도는 clause_embedding의 (company_id, doc_type, clause_type)별 행 수를
+주기적으로 캐시하여 추정합니다. 그 외 필터(product_id, amount, gender 등)는
+통계가 없으므로 필터당 선택도를 절반으로 보수적으로 가정합니다.
+
+설정 (환경 변수):
+    EF_SEARCH_MIN              최소 ef_search (기본: 40)
+    EF_SEARCH_MAX              최대 ef_search (기본: 1000, pgvector 상한)
+    EF_SEARCH_EXACT_THRESHOLD  이 행 수 이하면 exact scan (기본: 2000)
+    EF_SEARCH_STATS_TTL        행 수 캐시 갱신 주기 초 (기본: 600)
+
+Usage:
+    policy = EfSearchPolicy(pool)
+    plan = policy.plan([filters], top_k=30)
+    exact = plan["branches"][0]["exact_scan"]   # SQL 생성 시 branch별로 반영
+    with pool.connection() as conn, conn.cursor() as cur:
+        policy.apply(cur, plan)
+        cur.execute(query, params)
+
+    # asyncio (utils.async_db_pool)
+    policy = AsyncEfSearchPolicy(async_pool)
+    await policy.refresh()
+    plan = policy.plan([filters], top_k=30)
+    async with async_pool.connection() as conn, conn.cursor() as cur:
+        await policy.apply(cur, plan)
+        await cur.execute(query, params)
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Any, Tuple
+
+from utils.db_pool import ConnectionPool
+
+
+# 행 수 통계가 있는 필터 (clause_embedding 비정규화 컬럼)
+PARTITION_FILTER_KEYS = ("company_id", "doc_type", "clause_type")
+
+# 통계가 없는 필터 (필터당 선택도 UNKNOWN_FILTER_SELECTIVITY 가정)
+UNKNOWN_FILTER_KEYS = ("product_id", "coverage_ids", "amount", "gender", "age")
+UNKNOWN_FILTER_SELECTIVITY = 0.5
+
+# 필요 후보 수 추정치에 곱하는 여유 계수
+EF_SEARCH_SAFETY_FACTOR = 1.5
+
+# 파티션별 행 수 통계
+ROW_COUNTS_SQL = """
+    SELECT company_id, doc_type, clause_type, COUNT(*)
+    FROM clause_embedding
+    GROUP BY company_id, doc_type, clause_type
+"""
+
+
+class EfSearchPolicy:
+    """필터 선택도 기반 ef_search / exact scan 결정"""
+
+    def __init__(self, pool: ConnectionPool):
+        """
+        Args:
+            pool: 통계 조회에 사용할 연결 풀
+        """
+        self.pool = pool
+        self.ef_min = int(os.getenv("EF_SEARCH_MIN", "40"))
+        self.ef_max = int(os.getenv("EF_SEARCH_MAX", "1000"))
+        self.exact_threshold = int(os.getenv("EF_SEARCH_EXACT_THRESHOLD", "2000"))
+        self.stats_ttl = float(os.getenv("EF_SEARCH_STATS_TTL", "600"))
+
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[Any, Any, Any], int] = {}
+        self._total_rows = 0
+        self._loaded_at = 0.0
+
+    def _is_fresh(self) -> bool:
+        """행 수 캐시가 TTL 이내인지 여부"""
+        return bool(self._loaded_at) and time.monotonic() - self._loaded_at < self.stats_ttl
+
+    def _set_counts(self, rows: List[tuple]):
+        """ROW_COUNTS_SQL 결과로 행 수 캐시 교체"""
+        counts = {(row[0], row[1], row[2]): row[3] for row in rows}
+        self._counts = counts
+        self._total_rows = sum(counts.values())
+        self._loaded_at = time.monotonic()
+
+    def _load_counts(self):
+        """(company_id, doc_type, clause_type)별 행 수 캐시 (TTL 경과 시 갱신)"""
+        with self._lock:
+            if self._is_fresh():
+                return
+
+            with self.pool.connection() as conn, conn.cursor() as cur:
+                cur.execute(ROW_COUNTS_SQL)
+                rows = cur.fetchall()
+
+            self._set_counts(rows)
+
+    def invalidate(self):
+        """행 수 캐시 무효화 (인덱스 재구축 후 등)"""
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def estimate_rows(self, filters: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        필터에 매칭되는 행 수 추정
+
+        Args:
+            filters: 검색 필터
+
+        Returns:
+            (추정 매칭 행 수, 전체 행 수)
+        """
+        self._load_counts()
+
+        company_id = filters.get("company_id")
+        doc_type = filters.get("doc_type")
+        clause_type = filters.get("clause_type")
+
+        matched = sum(
+            count
+            for (row_company_id, row_doc_type, row_clause_type), count in self._counts.items()
+            if (not company_id or row_company_id == company_id)
+            and (not doc_type or row_doc_type == doc_type)
+            and (not clause_type or row_clause_type == clause_type)
+        )
+
+        unknown_filters = sum(1 for key in UNKNOWN_FILTER_KEYS if filters.get(key))
+        matched = int(matched * (UNKNOWN_FILTER_SELECTIVITY ** unknown_filters))
+
+        return matched, self._total_rows
+
+    def plan_branch(self, filters: Dict[str, Any], top_k: int) -> Dict[str, Any]:
+        """
+        단일 벡터 검색(branch)의 ef_search 결정
+
+        Args:
+            filters: 검색 필터
+            top_k: 반환할 결과 개수
+
+        Returns:
+            {"ef_search": int, "exact_scan": bool, "estimated_rows": int, "selectivity": float}
+        """
+        has_filters = any(filters.get(key) for key in PARTITION_FILTER_KEYS + UNKNOWN_FILTER_KEYS)
+        if not has_filters:
+            return {
+                "ef_search": min(self.ef_max, max(self.ef_min, top_k)),
+                "exact_scan": False,
+                "estimated_rows": self._total_rows or None,
+                "selectivity": 1.0,
+            }
+
+        try:
+            estimated_rows, total_rows = self.estimate_rows(filters)
+        except Exception as e:
+            # 통계 조회 실패 시 기존 고정값과 같은 보수적 설정
+            print(f"Warning: clause_embedding row counts unavailable, using ef_search=200: {e}")
+            return {"ef_search": max(200, top_k), "exact_scan": False,
+                    "estimated_rows": None, "selectivity": None}
+
+        selectivity = estimated_rows / total_rows if total_rows else 0.0
+
+        # 작은 파티션은 전체를 거리 정렬하는 편이 빠르고 recall 손실이 없음
+        if estimated_rows <= self.exact_threshold:
+            return {
+                "ef_search": None,
+                "exact_scan": True,
+                "estimated_rows": estimated_rows,
+                "selectivity": round(selectivity, 6),
+            }
+
+        needed = math.ceil(top_k / selectivity * EF_SEARCH_SAFETY_FACTOR) if selectivity else self.ef_max
+        return {
+            "ef_search": min(self.ef_max, max(self.ef_min, top_k, needed)),
+            "exact_scan": False,
+            "estimated_rows": estimated_rows,
+            "selectivity": round(selectivity, 6),
+        }
+
+    def plan(self, branch_filters: List[Dict[str, Any]], top_k: int) -> Dict[str, Any]:
+        """
+        한 SQL 문장(UNION/LATERAL 포함)의 ef_search 결정
+
+        세션 설정은 문장 전체에 적용되므로 HNSW branch 중 가장 큰 ef_search를 사용합니다.
+        작은 파티션 branch(branches[i]["exact_scan"])는 호출자가 인덱스를 쓰지 않는
+        정렬식으로 SQL을 구성하므로 ef_search와 무관하게 top_k를 채웁니다.
+        exact_scan은 모든 branch가 exact scan일 때 True입니다 (ef_search는 None).
+
+        Args:
+            branch_filters: branch별 필터 리스트
+            top_k: branch당 반환할 결과 개수
+
+        Returns:
+            {"ef_search", "exact_scan", "branches": [branch별 plan]}
+        """
+        branches = [self.plan_branch(filters, top_k) for filters in branch_filters]
+        exact_scan = bool(branches) and all(branch["exact_scan"] for branch in branches)
+        ef_values = [branch["ef_search"] for branch in branches if not branch["exact_scan"]]
+
+        ef_search = None if exact_scan else max(ef_values or [self.ef_min])
+
+        return {
+            "ef_search": ef_search,
+            "exact_scan": exact_scan,
+            "branches": branches,
+        }
+
+    @staticmethod
+    def apply(cur, plan: Dict[str, Any]):
+        """
+        현재 트랜잭션에 plan 적용 (SET LOCAL → 연결 반환 시 롤백과 함께 원복)
+
+        HNSW branch가 있을 때만 ef_search를 설정합니다 (exact scan은 SQL 정렬식으로 처리).
+        """
+        if plan["ef_search"]:
+            cur.execute("SET LOCAL hnsw.ef_search = %s", (plan["ef_search"],))
+
+
+class AsyncEfSearchPolicy(EfSearchPolicy):
+    """
+    EfSearchPolicy의 asyncio 버전
+
+    plan()은 CPU 계산만 하므로 동기 메서드를 그대로 쓰고, 행 수 통계는
+    검색 전에 refresh()로 이벤트 루프에서 갱신합니다.
+    """
+
+    def __init__(self, pool):
+        """
+        Args:
+            pool: 통계 조회에 사용할 async 연결 풀 (utils.async_db_pool)
+        """
+        super().__init__(pool)
+        self._refresh_lock = None
+
+    async def refresh(self):
+        """행 수 캐시 갱신 (TTL 이내면 생략, 실패 시 plan()이 보수적 기본값 사용)"""
+        if self._is_fresh():
+            return
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            if self._is_fresh():
+                return
+            try:
+                async with self.pool.connection() as conn, conn.cursor() as cur:
+                    await cur.execute(ROW_COUNTS_SQL)
+                    rows = await cur.fetchall()
+            except Exception as e:
+                print(f"Warning: failed to refresh clause_embedding row counts: {e}")
+                return
+            self._set_counts(rows)
+
+    def _load_counts(self):
+        """이벤트 루프를 막지 않도록 DB 조회 없이 refresh()로 로드된 캐시만 사용"""
+        if not self._loaded_at:
+            raise RuntimeError("row counts not loaded (await refresh() first)")
+
+    @staticmethod
+    async def apply(cur, plan: Dict[str, Any]):
+        """현재 트랜잭션에 plan 적용 (async 커서, EfSearchPolicy.apply 참고)"""
+        if plan["ef_search"]:
+            await cur.execute("SET LOCAL hnsw.ef_search = %s", (plan["ef_search"],))
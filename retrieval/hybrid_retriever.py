@@ -6,6 +6,12 @@ Hybrid Retriever
 주요 기능:
 - NL Mapper를 통한 엔티티 추출
 - 필터링된 벡터 검색 (company_id, product_id, coverage_ids, amount, gender, age)
+- pg_trgm lexical 검색 + RRF 병합 (정확한 용어/KCD 코드 질의)
+- 벡터 검색 백엔드 선택 (VECTOR_BACKEND=pgvector | mmap)
+- 검색 결과 캐시 (코퍼스 버전으로 무효화, SEARCH_CACHE)
+- 후보 검색은 id/유사도/keyword_mask만 조회, 조항 텍스트는 재순위화 후 최종 top_k만 조회
+- 검색 결과는 __slots__ 기반 SearchHit (dict 호환, retrieval/search_hit.py)
+- 단계별 지연 시간 트레이스 (retrieval/tracing.py)
 - 컨텍스트 조립 및 LLM 프롬프팅
 
 Usage:
@@ -17,11 +23,20 @@ Usage:
 
 import os
 import re
-import psycopg2
-from typing import Dict, List, Any, Optional
+import time
+from operator import attrgetter
+from typing import Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv
+from utils.db_pool import get_pool
 from ontology.nl_mapping import NLMapper
 from vector_index.openai_embedder import OpenAIEmbedder
+from vector_index.mmap_index import MmapVectorIndex
+from retrieval.ef_search_policy import EfSearchPolicy
+from utils.text_matcher import get_keyword_matcher
+from utils.corpus_version import get_corpus_version_cache
+from retrieval.search_cache import SearchResultCache
+from retrieval.search_hit import SearchHit
+from retrieval.tracing import SEARCH_METRICS, span, traced
 
 
 # 키워드 부스팅을 위한 담보/보장 관련 핵심 키워드
@@ -40,6 +55,7 @@ COVERAGE_BOOST_KEYWORDS = {
 
 # 금액 관련 키워드 패턴 (실제 금액 값이 있는 문서 감지)
 # "보험금" 같은 일반 단어는 제외 (예: "보험금을 지급하지 않는 사유"에서 오탐지)
+# keyword_mask 금액 비트 생성 식에도 쓰이므로 마이그레이션 b8e3f6a1d240의 AMOUNT_PATTERNS와 함께 수정
 AMOUNT_PATTERNS = [
     "가입금액:",  # proposal 문서의 금액 패턴
     "가입금액 :",
@@ -48,10 +64,147 @@ AMOUNT_PATTERNS = [
     "백만원",     # "1백만원" 패턴
 ]
 
+# 조항별 키워드 포함 비트마스크 (document_clause.keyword_mask, 마이그레이션 b8e3f6a1d240)
+# 비트 i = KEYWORD_MASK_TERMS[i] 포함 여부, KEYWORD_MASK_AMOUNT_BIT = AMOUNT_PATTERNS 중 하나라도 포함
+# 순서는 마이그레이션의 generated column과 같아야 함 (시작 시 check_keyword_mask_vocabulary로 확인).
+# 어휘에 없는 부스팅 키워드
+# (NLMapper가 추출한 담보명 등)는 재순위화 직전에 후보 조항에 대해서만 SQL strpos로 계산
+KEYWORD_MASK_TERMS = (
+    "수술", "수술비", "수술담보", "입원", "입원비", "입원일당", "입원담보",
+    "진단", "진단금", "진단비", "진단담보",
+    "암", "암진단", "암수술", "암입원", "암치료", "유사암", "재진단암",
+    "뇌", "뇌출혈", "뇌졸중", "뇌경색", "뇌혈관",
+    "심장", "심근경색", "급성심근경색", "심혈관",
+    "사망", "사망보험금", "사망담보", "후유장해", "장해", "장해급여",
+    "치료", "치료비", "직접치료",
+    "제자리암", "경계성종양", "4대유사암", "갑상선암", "기타피부암",
+    "일반암", "소액암", "고액암",
+    "보장", "통원", "질병", "상해", "면책", "감액", "지급", "한도", "제한",
+    "가입", "나이", "기간", "금액", "조건", "다빈치", "로봇",
+)
+KEYWORD_MASK_BITS = {term: 1 << bit for bit, term in enumerate(KEYWORD_MASK_TERMS)}
+KEYWORD_MASK_AMOUNT_BIT = 1 << 62
+
+# DB의 keyword_mask generated column 식 → 어휘 확인 (시작 시 1회, 컬럼이 없으면 행 없음)
+# 식의 문자열 리터럴 순서 = 비트 순서 어휘 + 금액 패턴 (마이그레이션 b8e3f6a1d240이 생성한 식)
+KEYWORD_MASK_EXPRESSION_SQL = """
+    SELECT pg_get_expr(d.adbin, d.adrelid)
+    FROM pg_attribute a
+    JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE a.attrelid = 'document_clause'::regclass
+      AND a.attname = 'keyword_mask'
+      AND NOT a.attisdropped
+"""
+SQL_TEXT_LITERAL_PATTERN = re.compile(r"'((?:[^']|'')*)'::text")
+
+# 어휘에 없는 부스팅 키워드의 후보 조항별 포함 개수 (조항 텍스트는 DB 밖으로 나가지 않음)
+EXTRA_KEYWORD_MATCHES_SQL = """
+    SELECT
+        dc.id,
+        (
+            SELECT count(*)
+            FROM unnest(%s::text[]) AS t(term)
+            WHERE strpos(lower(dc.clause_text), t.term) > 0
+        ) AS matched
+    FROM document_clause dc
+    WHERE dc.id = ANY(%s)
+"""
+
+# Amount 쿼리 시 기본 검색과 함께 조회할 doc_type (순서 = 병합 우선순위)
+AMOUNT_QUERY_DOC_TYPES = ["proposal", "product_summary", "terms"]
+
+# Lexical 검색 (pg_trgm) - 정확한 용어 매칭 채널
+# trigram 인덱스는 3글자 이상 용어에서만 사용 가능 → 짧은 용어는 점수 계산에만 사용
+LEXICAL_INDEX_MIN_TERM_LENGTH = 3
+LEXICAL_MAX_TERMS = 8
+
+# 매칭 문서가 너무 많아 lexical 채널의 변별력이 없는 일반 용어
+LEXICAL_STOPWORDS = {
+    "보험", "보험금", "보장", "보장금", "보장금액", "금액", "가입", "가입금액", "얼마", "얼마나",
+    "지급", "조건", "기간", "나이", "한도", "제한", "알려줘", "알려주세요", "비교", "비교해줘",
+}
+
+# 쿼리 토큰에서 떼어낼 조사/어미 (긴 것부터 매칭, 1회만 제거)
+LEXICAL_TOKEN_SUFFIXES = sorted([
+    "인가요", "되나요", "하나요", "인지", "이란", "해줘", "나요",
+    "에서", "으로", "은", "는", "이", "가", "을", "를", "의", "에", "로", "과", "와", "도", "란",
+], key=len, reverse=True)
+
+# KCD 질병코드 (예: C73, C18.2)
+KCD_CODE_PATTERN = re.compile(r"(?<![A-Za-z0-9])[A-Z]\d{2}(?:\.\d{1,2})?(?![0-9])")
+
+# 양자화 검색 모드별 기본 rescoring 후보 배수 (1단계 후보 수 = top_k × 배수)
+# - none: float32 HNSW 인덱스로 바로 검색
+# - halfvec: float16 표현식 인덱스 (인덱스 메모리 1/2, 정밀도 손실 작음)
+# - binary: 1bit 양자화 표현식 인덱스 (인덱스 메모리 1/32, 후보를 넉넉히 가져와야 함)
+DEFAULT_RESCORE_FACTORS = {"none": 1, "halfvec": 2, "binary": 8}
+
+# Matryoshka 1단계 검색(앞 N차원) 기본 후보 배수 (VECTOR_COARSE_DIMENSIONS 사용 시)
+MATRYOSHKA_RESCORE_FACTOR = 4
+
+# 표현식 인덱스가 있는 1단계 검색 조합 (인덱스 식과 검색 SQL이 다르면 전체 스캔)
+# - 양자화 인덱스: 전체 차원 embedding::halfvec(1536) / binary_quantize(embedding)::bit(1536) (e2b7f4a19c6d)
+# - Matryoshka 인덱스: float32 subvector(embedding, 1, 256) (f6a3c8d21e47), 양자화와 함께 쓰는 인덱스 없음
+QUANTIZED_INDEX_DIMENSION = 1536
+COARSE_INDEX_DIMENSIONS = (256,)
+
+# 회사명 → company_id 일괄 조회 (부분 매칭, 예: "삼성" → "삼성화재", 회사명별 첫 번째 매칭)
+COMPANY_IDS_BY_NAMES_SQL = """
+    SELECT
+        n.name,
+        (
+            SELECT c.id
+            FROM company c
+            WHERE c.company_name LIKE '%%' || n.name || '%%'
+               OR c.company_code LIKE '%%' || n.name || '%%'
+            LIMIT 1
+        ) AS company_id
+    FROM unnest(%s::text[]) AS n(name)
+"""
+
 # Load environment variables from .env file
 load_dotenv()
 
 
+def check_keyword_mask_vocabulary(expression: Optional[str]):
+    """
+    keyword_mask 생성 식의 어휘가 KEYWORD_MASK_TERMS / AMOUNT_PATTERNS와 같은지 확인
+
+    어휘가 다르면 재순위화가 엉뚱한 비트를 키워드 매칭으로 세므로 시작 시 실패시킵니다.
+
+    Args:
+        expression: KEYWORD_MASK_EXPRESSION_SQL 결과 (컬럼이 없으면 None)
+
+    Raises:
+        RuntimeError: 어휘/순서/금액 비트가 다를 때
+    """
+    if expression is None:
+        print("Warning: document_clause.keyword_mask not found (run alembic upgrade head)")
+        return
+
+    db_terms = [
+        literal.replace("''", "'")
+        for literal in SQL_TEXT_LITERAL_PATTERN.findall(expression)
+        if literal
+    ]
+    expected = [term.lower() for term in KEYWORD_MASK_TERMS] + [pattern.lower() for pattern in AMOUNT_PATTERNS]
+    if db_terms == expected and "<< 62" in expression:
+        return
+
+    mismatch = next(
+        (i for i, (db_term, term) in enumerate(zip(db_terms, expected)) if db_term != term),
+        min(len(db_terms), len(expected))
+    )
+    raise RuntimeError(
+        "document_clause.keyword_mask vocabulary does not match KEYWORD_MASK_TERMS/AMOUNT_PATTERNS "
+        f"(first difference at position {mismatch}: "
+        f"db={db_terms[mismatch] if mismatch < len(db_terms) else None!r}, "
+        f"code={expected[mismatch] if mismatch < len(expected) else None!r}; "
+        f"db {len(db_terms)} terms, code {len(expected)} terms). "
+        "Recreate the column in a new migration with the same vocabulary as retrieval/hybrid_retriever.py."
+    )
+
+
 class HybridRetriever:
     """하이브리드 검색 엔진 (온톨로지 + 벡터)"""
 
@@ -63,30 +216,97 @@ class HybridRetriever:
         self.postgres_url = postgres_url or os.getenv("POSTGRES_URL")
         if not self.postgres_url:
             raise ValueError("POSTGRES_URL environment variable is required. Check .env file.")
-        self.pg_conn = psycopg2.connect(self.postgres_url)
+        self.pool = get_pool(self.postgres_url)
+        self.ef_search_policy = EfSearchPolicy(self.pool)
         self.embedder = OpenAIEmbedder()
         self.nl_mapper = NLMapper(self.postgres_url)
+        self._init_search_settings()
+        self._verify_keyword_mask()
 
-    def _extract_boost_keywords(self, query: str) -> List[str]:
+    def _verify_keyword_mask(self):
+        """DB keyword_mask 어휘 확인 (불일치 시 RuntimeError)"""
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(KEYWORD_MASK_EXPRESSION_SQL)
+            row = cur.fetchone()
+        check_keyword_mask_vocabulary(row[0] if row else None)
+
+    def _init_search_settings(self):
+        """환경 변수 기반 검색 설정 (HybridRetriever / AsyncHybridRetriever 공용)"""
+        # Lexical(pg_trgm) 채널 사용 여부 (LEXICAL_SEARCH=0이면 벡터 검색만 사용)
+        self.use_lexical = os.getenv("LEXICAL_SEARCH", "1") != "0"
+        # Reciprocal Rank Fusion 상수 (score = Σ 1 / (rrf_k + rank))
+        self.rrf_k = int(os.getenv("RRF_K", "60"))
+        # 벡터 검색 백엔드: mmap이면 지원 필터 조합은 프로세스 내 exact 검색 사용
+        # (coverage_ids/gender/age 필터는 pgvector로 처리)
+        self.vector_backend = os.getenv("VECTOR_BACKEND", "pgvector")
+        self.mmap_index = MmapVectorIndex() if self.vector_backend == "mmap" else None
+        self._seen_corpus_version: Optional[int] = None
+
+        # 2단계 벡터 검색: 작은 인덱스로 후보를 찾고 전체 float32 벡터로 재정렬
+        # - VECTOR_QUANTIZATION: halfvec/binary 양자화 인덱스
+        # - VECTOR_COARSE_DIMENSIONS: 임베딩 앞 N차원(Matryoshka) 인덱스 (0이면 미사용)
+        self.dimension = self.embedder.get_dimension()
+        self.quantization = os.getenv("VECTOR_QUANTIZATION", "none")
+        if self.quantization not in DEFAULT_RESCORE_FACTORS:
+            raise ValueError(
+                f"Unsupported VECTOR_QUANTIZATION: {self.quantization} "
+                f"({' | '.join(DEFAULT_RESCORE_FACTORS)})"
+            )
+        self.coarse_dimensions = int(os.getenv("VECTOR_COARSE_DIMENSIONS", "0"))
+        if self.coarse_dimensions and self.coarse_dimensions not in COARSE_INDEX_DIMENSIONS:
+            raise ValueError(
+                f"Unsupported VECTOR_COARSE_DIMENSIONS: {self.coarse_dimensions} "
+                f"(0 | {' | '.join(map(str, COARSE_INDEX_DIMENSIONS))}; "
+                f"other dimensions need a matching subvector index)"
+            )
+        if self.coarse_dimensions and self.quantization != "none":
+            raise ValueError(
+                "VECTOR_COARSE_DIMENSIONS cannot be combined with VECTOR_QUANTIZATION "
+                "(no quantized subvector index)"
+            )
+        if self.quantization != "none" and self.dimension != QUANTIZED_INDEX_DIMENSION:
+            raise ValueError(
+                f"VECTOR_QUANTIZATION requires {QUANTIZED_INDEX_DIMENSION}-dimension embeddings "
+                f"(quantized indexes are built on vector({QUANTIZED_INDEX_DIMENSION}), got {self.dimension})"
+            )
+        self.two_stage = self.quantization != "none" or self.coarse_dimensions > 0
+
+        default_rescore_factor = max(
+            DEFAULT_RESCORE_FACTORS[self.quantization],
+            MATRYOSHKA_RESCORE_FACTOR if self.coarse_dimensions else 1
+        )
+        self.rescore_factor = int(os.getenv("VECTOR_RESCORE_FACTOR", str(default_rescore_factor)))
+
+        # 검색 결과 캐시 (SEARCH_CACHE=0이면 비활성화)
+        self.search_cache = SearchResultCache() if os.getenv("SEARCH_CACHE", "1") != "0" else None
+        # 캐시 키의 코퍼스 버전 (리스너 연결 시 CORPUS_VERSION_TTL 동안 재사용, 아니면 매번 조회)
+        self.corpus_version_cache = get_corpus_version_cache(self.postgres_url)
+
+    def _extract_boost_keywords(
+        self,
+        query: str,
+        entities: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
         """
         쿼리에서 부스팅할 키워드 추출
 
         Args:
             query: 사용자 질의
+            entities: 이미 추출한 NLMapper 엔티티 (없으면 추출)
 
         Returns:
             부스팅할 키워드 리스트
         """
         keywords = []
-        query_lower = query.lower()
 
-        # COVERAGE_BOOST_KEYWORDS에서 매칭되는 키워드 확장
-        for base_keyword, related_keywords in COVERAGE_BOOST_KEYWORDS.items():
-            if base_keyword in query_lower or base_keyword in query:
-                keywords.extend(related_keywords)
+        # COVERAGE_BOOST_KEYWORDS에서 매칭되는 키워드 확장 (쿼리 1회 스캔)
+        base_matcher = get_keyword_matcher(COVERAGE_BOOST_KEYWORDS)
+        for base_keyword in base_matcher.find(query):
+            keywords.extend(COVERAGE_BOOST_KEYWORDS[base_keyword])
 
         # NLMapper에서 추출한 담보/키워드도 추가
-        entities = self.nl_mapper.extract_entities(query)
+        if entities is None:
+            entities = self.nl_mapper.extract_entities(query)
         if entities.get("coverages"):
             keywords.extend(entities["coverages"])
         if entities.get("keywords"):
@@ -95,10 +315,10 @@ class HybridRetriever:
         # 중복 제거
         return list(set(keywords))
 
+    @staticmethod
     def _calculate_keyword_boost(
-        self,
-        clause_text: str,
-        keywords: List[str],
+        matched_count: int,
+        has_amount: bool,
         boost_weight: float = 0.15,
         require_amount: bool = False
     ) -> float:
@@ -106,27 +326,20 @@ class HybridRetriever:
         키워드 매칭 기반 부스트 점수 계산
 
         Args:
-            clause_text: 검색된 문서 텍스트
-            keywords: 부스팅할 키워드 리스트
+            matched_count: 문서에 포함된 부스팅 키워드 수
+            has_amount: 문서에 금액 패턴(AMOUNT_PATTERNS)이 있는지 여부
             boost_weight: 키워드당 부스트 가중치
             require_amount: True면 금액 정보가 있는 문서에 추가 부스트
 
         Returns:
             부스트 점수 (0.0 ~ max_boost)
         """
-        if not keywords or not clause_text:
-            return 0.0
-
-        clause_lower = clause_text.lower()
-        matched_count = sum(1 for kw in keywords if kw in clause_lower or kw in clause_text)
-
         # 기본 부스트 계산 - 키워드 매칭이 가장 중요
         max_boost = 0.5  # 최대 부스트 증가
         boost = min(matched_count * boost_weight, max_boost)
 
         # 금액 정보가 필요한 경우 추가 부스트
         if require_amount:
-            has_amount = any(pattern in clause_text for pattern in AMOUNT_PATTERNS)
             if has_amount:
                 # ⭐ 키워드 매칭이 있을 때만 금액 부스트 적용
                 # 키워드 매칭 없이 금액만 있으면 부스트 없음
@@ -141,21 +354,70 @@ class HybridRetriever:
 
         return boost
 
+    @staticmethod
+    def _split_boost_keywords(keywords: List[str]) -> Tuple[int, List[str]]:
+        """
+        부스팅 키워드 → (keyword_mask 어휘 비트마스크, 어휘에 없는 키워드)
+
+        Returns:
+            (쿼리 비트마스크, 소문자 키워드 리스트 - EXTRA_KEYWORD_MATCHES_SQL로 계산)
+        """
+        query_mask = 0
+        extra_terms = []
+        for keyword in {kw.lower() for kw in keywords if kw}:
+            bit = KEYWORD_MASK_BITS.get(keyword)
+            if bit is None:
+                extra_terms.append(keyword)
+            else:
+                query_mask |= bit
+        return query_mask, sorted(extra_terms)
+
+    def _count_extra_keyword_matches(
+        self,
+        results: List[SearchHit],
+        keywords: List[str]
+    ) -> Dict[int, int]:
+        """
+        어휘에 없는 부스팅 키워드의 후보 조항별 포함 개수 (없으면 DB 조회 생략)
+
+        Returns:
+            {clause_id: 포함된 키워드 수}
+        """
+        _, extra_terms = self._split_boost_keywords(keywords)
+        if not extra_terms or not results:
+            return {}
+
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                EXTRA_KEYWORD_MATCHES_SQL,
+                (extra_terms, list({result.clause_id for result in results}))
+            )
+            return dict(cur.fetchall())
+
     def _rerank_with_keyword_boost(
         self,
-        results: List[Dict[str, Any]],
+        results: List[SearchHit],
         keywords: List[str],
         top_k: int,
-        require_amount: bool = False
-    ) -> List[Dict[str, Any]]:
+        require_amount: bool = False,
+        extra_matches: Optional[Dict[int, int]] = None
+    ) -> List[SearchHit]:
         """
         키워드 부스팅으로 검색 결과 재순위화
 
+        후보 조항 텍스트 대신 keyword_mask(조항별 어휘 포함 비트마스크)와
+        쿼리 비트마스크의 AND로 매칭 키워드 수를 계산합니다.
+
+        기본 점수는 _fuse_rrf()를 거친 결과(rrf_score 있음)면 RRF 점수를
+        유사도와 같은 0~1 범위로 맞춘 값(양 채널 1위 = 1.0), 아니면 벡터 유사도입니다.
+
         Args:
-            results: 벡터 검색 결과
+            results: 벡터 검색 또는 RRF 병합 결과 (keyword_mask 포함)
             keywords: 부스팅할 키워드
             top_k: 반환할 결과 개수
             require_amount: True면 금액 정보가 있는 문서 우선
+            extra_matches: 어휘에 없는 키워드의 조항별 포함 개수
+                (_count_extra_keyword_matches() 결과)
 
         Returns:
             재순위화된 결과
@@ -163,28 +425,42 @@ class HybridRetriever:
         if not keywords or not results:
             return results[:top_k]
 
+        query_mask, _ = self._split_boost_keywords(keywords)
+        extra_matches = extra_matches or {}
+
         # 각 결과에 final_score 계산
         for result in results:
+            clause_mask = result.keyword_mask or 0
             keyword_boost = self._calculate_keyword_boost(
-                result.get("clause_text", ""),
-                keywords,
+                bin(clause_mask & query_mask).count("1") + extra_matches.get(result.clause_id, 0),
+                bool(clause_mask & KEYWORD_MASK_AMOUNT_BIT),
                 require_amount=require_amount
             )
-            # Final Score = Vector Similarity + Keyword Boost
-            result["keyword_boost"] = keyword_boost
-            result["final_score"] = result.get("similarity", 0) + keyword_boost
+            # Final Score = (RRF 점수 | Vector Similarity) + Keyword Boost
+            result.keyword_boost = keyword_boost
+            result.final_score = self._base_score(result) + keyword_boost
 
         # final_score로 재정렬
-        reranked = sorted(results, key=lambda x: x.get("final_score", 0), reverse=True)
+        reranked = sorted(results, key=attrgetter("final_score"), reverse=True)
 
         return reranked[:top_k]
 
+    def _base_score(self, result: SearchHit) -> float:
+        """재순위화 기본 점수 (RRF 병합 결과는 rrf_score × (rrf_k + 1) / 2, 아니면 similarity)"""
+        rrf_score = result.get("rrf_score")
+        if rrf_score is not None:
+            return rrf_score * (self.rrf_k + 1) / 2
+        return result.similarity or 0
+
+    @traced("search")
     def search(
         self,
         query: str,
         top_k: int = 10,
-        filters: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
+        filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
         """
         하이브리드 검색 실행
 
@@ -192,9 +468,16 @@ class HybridRetriever:
             query: 사용자 질의
             top_k: 반환할 결과 개수
             filters: 추가 필터 (선택적)
+            query_embedding: 미리 계산된 쿼리 임베딩 (배치 임베딩 시 사용, 없으면 생성)
+            trace: 검색 트레이스 (선택적, retrieval.tracing.SearchTrace 권장). 주어지면
+                trace["spans"]에 단계별 소요 시간/반환 행 수가,
+                trace["vector_searches"]에 벡터 검색별 ef_search 결정과 결과 충족률(fill)이,
+                trace["search_cache"]에 결과 캐시 히트 여부가,
+                trace["fallback_tier"]에 사용된 fallback tier가 기록됨
+                (캐시 히트 시 벡터 검색 기록 없음)
 
         Returns:
-            검색 결과 리스트 [
+            검색 결과 리스트 (SearchHit, dict처럼 키로도 접근 가능) [
                 {
                     "clause_id": int,
                     "clause_text": str,
@@ -207,14 +490,203 @@ class HybridRetriever:
                 ...
             ]
         """
-        # 1. 엔티티 추출
-        entities = self.nl_mapper.extract_entities(query)
+        if self.search_cache is None:
+            return self._search_uncached(query, top_k, filters, query_embedding, trace)
+
+        with span(trace, "search.cache_lookup") as stage:
+            cache_key, results = self._lookup_cached(
+                query, top_k, filters, self.corpus_version_cache.get(self.pool), trace
+            )
+            stage["hit"] = results is not None
+        if results is not None:
+            return results
 
-        # 1.5. 키워드 부스팅을 위한 키워드 추출
-        boost_keywords = self._extract_boost_keywords(query)
+        start = time.perf_counter()
+        results = self._search_uncached(query, top_k, filters, query_embedding, trace)
+        if cache_key is not None:
+            self.search_cache.put(cache_key, results, compute_ms=(time.perf_counter() - start) * 1000)
+        return results
 
-        # 2. 필터 구성
-        search_filters = filters or {}
+    def _lookup_cached(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        corpus_version: Optional[int],
+        trace: Optional[Dict[str, Any]]
+    ) -> Tuple[Optional[str], Optional[List[SearchHit]]]:
+        """
+        검색 결과 캐시 조회
+
+        Returns:
+            (캐시 키, 캐시된 결과). 코퍼스 버전이 없으면(마이그레이션 미적용)
+            무효화할 수 없으므로 (None, None)을 반환하고 캐시를 사용하지 않음
+        """
+        if corpus_version is None:
+            self.search_cache.record_bypass()
+            return None, None
+        if corpus_version != self._seen_corpus_version:
+            # 버전이 바뀌면 재내보내기된 mmap 인덱스를 먼저 열어 새 키로 옛 결과가 캐시되지 않게 함
+            self._seen_corpus_version = corpus_version
+            self.reload_mmap_index()
+
+        cache_key = self.search_cache.make_key(
+            query, top_k, filters, corpus_version, self._cache_signature()
+        )
+        results = self.search_cache.get(cache_key)
+        if trace is not None:
+            trace.setdefault("search_cache", []).append({
+                "hit": results is not None,
+                "corpus_version": corpus_version
+            })
+        if results is not None:
+            # 캐시에는 읽기 전용 스냅샷으로 저장됨 → 호출자가 수정할 새 SearchHit 생성
+            results = [SearchHit.from_dict(result) for result in results]
+        return cache_key, results
+
+    def _cache_signature(self) -> Dict[str, Any]:
+        """검색 결과에 영향을 주는 설정 (설정이 다른 워커와 L2 캐시를 공유해도 섞이지 않도록)"""
+        return {
+            "model": self.embedder.model,
+            "backend": self.vector_backend,
+            "lexical": self.use_lexical,
+            "quantization": self.quantization,
+            "coarse": self.coarse_dimensions,
+            "rescore": self.rescore_factor,
+            "rrf_k": self.rrf_k,
+        }
+
+    def _search_uncached(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        query_embedding: Optional[List[float]],
+        trace: Optional[Dict[str, Any]]
+    ) -> List[SearchHit]:
+        """search() 본체 (캐시 미스 또는 캐시 비활성화 시)"""
+        # 1. 엔티티 추출 + 2. 필터/부스팅 키워드/후보 풀 크기 결정
+        with span(trace, "search.entities"):
+            entities = self.nl_mapper.extract_entities(query)
+            prepared = self._prepare_search(query, top_k, filters, entities)
+        search_filters = prepared["filters"]
+
+        # 3. 쿼리 임베딩 생성 (배치로 미리 계산된 경우 재사용)
+        if query_embedding is None:
+            with span(trace, "search.embed"):
+                query_embedding = self.embedder.embed_query(query)
+
+        # 4. Lexical 검색 먼저 실행 (결과가 없으면 벡터 후보 풀을 줄이지 않음)
+        lexical_results = []
+        if prepared["lexical_terms"]:
+            lexical_results = self._lexical_search(
+                query_embedding=query_embedding,
+                terms=prepared["lexical_terms"],
+                filters=search_filters,
+                top_k=prepared["vector_top_k"],
+                trace=trace
+            )
+
+        # 4.5. 필터링된 벡터 검색 실행 (with fallback for zero results) 후 lexical 결과와 RRF 병합
+        vector_top_k = prepared["vector_top_k"] if lexical_results else prepared["search_top_k"]
+        results = self._vector_channel_search(query_embedding, prepared, vector_top_k, trace)
+        if lexical_results:
+            results = self._fuse_rrf(results, lexical_results, prepared["search_top_k"])
+
+        # ⭐ Fallback search for coverage queries with zero results
+        # If proposal + table_row filter is too restrictive, try progressively broader searches
+        # 5단계 fallback을 한 번의 SQL로 실행하고, 결과가 있는 가장 구체적인 tier만 사용
+        if prepared["has_coverage_query"] and len(results) == 0:
+            results = self._tiered_vector_search(
+                query_embedding=query_embedding,
+                tier_filters=self._build_fallback_tiers(search_filters),
+                top_k=prepared["search_top_k"],
+                trace=trace
+            )
+
+        # 5. 키워드 부스팅으로 재순위화 (금액 쿼리면 금액 정보 있는 문서 우선)
+        with span(trace, "search.rerank", candidates=len(results)):
+            extra_matches = self._count_extra_keyword_matches(results, prepared["boost_keywords"])
+            results = self._rerank_with_keyword_boost(
+                results, prepared["boost_keywords"], top_k,
+                require_amount=prepared["is_amount_query"],
+                extra_matches=extra_matches
+            )
+
+        # 6. 최종 top_k 조항 텍스트만 조회
+        with span(trace, "search.clause_text", rows=len(results)):
+            self._attach_clause_texts([results])
+        return results
+
+    def _vector_channel_search(
+        self,
+        query_embedding: List[float],
+        prepared: Dict[str, Any],
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None
+    ):
+        """
+        벡터 채널 검색 (AsyncHybridRetriever에서는 코루틴 반환)
+
+        ⭐ Amount 쿼리일 때 여러 doc_type에서 검색하여 병합
+        proposal뿐 아니라 terms, product_summary 등에도 금액 정보가 있을 수 있음
+        기본 검색 + doc_type별 검색을 한 번의 SQL(UNION ALL)로 실행하고 DB에서 중복 제거
+
+        Args:
+            query_embedding: 쿼리 임베딩
+            prepared: _prepare_search() 결과
+            top_k: branch당 후보 수
+            trace: 검색 트레이스 (선택적)
+        """
+        search_filters = prepared["filters"]
+        if prepared["is_amount_query"] and search_filters.get("company_id"):
+            return self._multi_doc_type_vector_search(
+                query_embedding=query_embedding,
+                filters=search_filters,
+                doc_types=AMOUNT_QUERY_DOC_TYPES,
+                top_k=top_k,
+                trace=trace
+            )
+        return self._filtered_vector_search(
+            query_embedding=query_embedding,
+            filters=search_filters,
+            top_k=top_k,
+            trace=trace
+        )
+
+    def _prepare_search(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        entities: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        검색 전 준비 (DB 조회 없음, HybridRetriever / AsyncHybridRetriever 공용)
+
+        Args:
+            query: 사용자 질의
+            top_k: 반환할 결과 개수
+            filters: 호출자가 전달한 필터
+            entities: NLMapper.extract_entities() 결과
+
+        Returns:
+            {
+                "filters": 엔티티 필터가 병합된 검색 필터,
+                "boost_keywords": 재순위화 키워드,
+                "has_coverage_query": bool,
+                "is_amount_query": bool,
+                "search_top_k": 재순위화 전 후보 수,
+                "vector_top_k": lexical 결과가 있을 때 벡터/lexical 채널별 후보 수
+                    (lexical 결과가 없으면 벡터 채널은 search_top_k 사용),
+                "lexical_terms": lexical 검색 용어 (없으면 빈 리스트)
+            }
+        """
+        # 키워드 부스팅을 위한 키워드 추출
+        boost_keywords = self._extract_boost_keywords(query, entities)
+
+        # 필터 구성 (호출자 dict는 캐시 키로 쓰이므로 복사본에 병합)
+        search_filters = dict(filters or {})
 
         # 엔티티에서 추출한 필터 병합
         if entities["filters"].get("company_id"):
@@ -229,6 +701,54 @@ class HybridRetriever:
         #     search_filters.setdefault("coverage_ids", entities["filters"]["coverage_ids"])
 
         # ⭐ Coverage/Amount query detection
+        has_coverage_query, is_amount_query = self._detect_query_intent(query, entities)
+
+        # doc_type/clause_type 필터는 키워드 부스팅이 없을 때만 적용
+        # 키워드 부스팅이 있으면 전체 검색 후 재순위화로 관련 문서 상위 노출
+        if has_coverage_query and not boost_keywords:
+            # Prioritize proposal documents with table_row clauses for accurate benefit info
+            search_filters.setdefault("doc_type", "proposal")
+            search_filters.setdefault("clause_type", "table_row")
+
+        if entities["filters"].get("amount"):
+            search_filters.setdefault("amount", entities["filters"]["amount"])
+
+        if entities["filters"].get("gender"):
+            search_filters.setdefault("gender", entities["filters"]["gender"])
+
+        if entities["filters"].get("age"):
+            search_filters.setdefault("age", entities["filters"]["age"])
+
+        # 키워드 부스팅을 위해 3배 더 많은 후보 검색 후 re-ranking
+        search_top_k = max(top_k * 3, 30)  # 최소 30개 후보
+
+        # 정확한 용어(다빈치, C73 등)가 있으면 lexical 채널이 해당 문서를 보장하므로
+        # 벡터 후보 풀을 줄이고 RRF로 병합 (lexical 결과가 비면 search_top_k로 다시 확대)
+        lexical_terms = self._extract_lexical_terms(query, entities) if self.use_lexical else []
+        vector_top_k = max(top_k * 2, 20) if lexical_terms else search_top_k
+
+        return {
+            "filters": search_filters,
+            "boost_keywords": boost_keywords,
+            "has_coverage_query": has_coverage_query,
+            "is_amount_query": is_amount_query,
+            "search_top_k": search_top_k,
+            "vector_top_k": vector_top_k,
+            "lexical_terms": lexical_terms,
+        }
+
+    @staticmethod
+    def _detect_query_intent(query: str, entities: Dict[str, Any]) -> Tuple[bool, bool]:
+        """
+        담보/금액 쿼리 여부 판단
+
+        Args:
+            query: 사용자 질의
+            entities: NLMapper.extract_entities() 결과
+
+        Returns:
+            (has_coverage_query, is_amount_query)
+        """
         # NOTE: doc_type 필터 제거 - 키워드 부스팅으로 관련 문서 상위 노출
         # 기존: proposal + table_row 필터 → 약관(terms)의 상세 담보 정보 누락
         # 개선: 전체 검색 후 키워드 부스팅으로 재순위화
@@ -254,129 +774,208 @@ class HybridRetriever:
             has_coverage_query  # 담보 관련 쿼리는 금액 정보 우선
         )
 
-        # doc_type/clause_type 필터는 키워드 부스팅이 없을 때만 적용
-        # 키워드 부스팅이 있으면 전체 검색 후 재순위화로 관련 문서 상위 노출
-        if has_coverage_query and not boost_keywords:
-            # Prioritize proposal documents with table_row clauses for accurate benefit info
-            search_filters.setdefault("doc_type", "proposal")
-            search_filters.setdefault("clause_type", "table_row")
+        return bool(has_coverage_query), bool(is_amount_query)
 
-        if entities["filters"].get("amount"):
-            search_filters.setdefault("amount", entities["filters"]["amount"])
+    @staticmethod
+    def _extract_lexical_terms(query: str, entities: Dict[str, Any]) -> List[str]:
+        """
+        Lexical 검색에 사용할 정확한 용어 추출
 
-        if entities["filters"].get("gender"):
-            search_filters.setdefault("gender", entities["filters"]["gender"])
+        KCD 코드, NLMapper가 추출한 담보/질병/키워드, 쿼리의 일반 토큰을 사용하며
+        회사명과 일반 용어(LEXICAL_STOPWORDS)는 제외합니다.
+        trigram 인덱스를 쓸 수 있는 용어(3글자 이상)가 없으면 빈 리스트를 반환합니다.
 
-        if entities["filters"].get("age"):
-            search_filters.setdefault("age", entities["filters"]["age"])
+        Args:
+            query: 사용자 질의
+            entities: NLMapper.extract_entities() 결과
 
-        # 3. 쿼리 임베딩 생성
-        query_embedding = self.embedder.embed_query(query)
+        Returns:
+            lexical 검색 용어 리스트 (최대 LEXICAL_MAX_TERMS개)
+        """
+        companies = entities.get("companies") or []
+
+        candidates = KCD_CODE_PATTERN.findall(query)
+        candidates += entities.get("coverages") or []
+        candidates += entities.get("diseases") or []
+        candidates += entities.get("keywords") or []
+
+        for token in re.findall(r"[0-9A-Za-z가-힣]{2,}", query):
+            for suffix in LEXICAL_TOKEN_SUFFIXES:
+                if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+                    token = token[:-len(suffix)]
+                    break
+            candidates.append(token)
+
+        terms = []
+        for term in candidates:
+            if term in terms or term in LEXICAL_STOPWORDS:
+                continue
+            if any(term in company or company in term for company in companies):
+                continue
+            terms.append(term)
+
+        if not any(len(term) >= LEXICAL_INDEX_MIN_TERM_LENGTH for term in terms):
+            return []
+
+        return terms[:LEXICAL_MAX_TERMS]
+
+    @traced("search.lexical")
+    def _lexical_search(
+        self,
+        query_embedding: List[float],
+        terms: List[str],
+        filters: Dict[str, Any],
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """
+        pg_trgm 인덱스 기반 lexical 검색
 
-        # 4. 필터링된 벡터 검색 실행 (with fallback for zero results)
-        # 키워드 부스팅을 위해 3배 더 많은 후보 검색 후 re-ranking
-        search_top_k = max(top_k * 3, 30)  # 최소 30개 후보
+        3글자 이상 용어의 ILIKE OR 조건으로 후보를 찾고(GIN trigram 인덱스),
+        매칭된 전체 용어 수로 정렬합니다. RRF 이후 재순위화를 위해
+        벡터 유사도도 함께 계산합니다.
 
-        results = self._filtered_vector_search(
-            query_embedding=query_embedding,
-            filters=search_filters,
-            top_k=search_top_k
+        Args:
+            query_embedding: 쿼리 임베딩 (similarity 계산용)
+            terms: lexical 검색 용어
+            filters: 필터 조건 (벡터 검색과 동일)
+            top_k: 반환할 결과 개수
+            trace: 검색 트레이스 (선택적)
+
+        Returns:
+            검색 결과 리스트 (lexical_score 포함)
+        """
+        query, query_params, index_terms = self._build_lexical_search_sql(
+            query_embedding, terms, filters, top_k
         )
 
-        # ⭐ Amount 쿼리일 때 여러 doc_type에서 검색하여 병합
-        # proposal뿐 아니라 terms, product_summary 등에도 금액 정보가 있을 수 있음
-        if is_amount_query and search_filters.get("company_id"):
-            # proposal 문서 검색
-            for doc_type in ["proposal", "product_summary", "terms"]:
-                type_filters = {
-                    "company_id": search_filters["company_id"],
-                    "doc_type": doc_type
-                }
-                type_results = self._filtered_vector_search(
-                    query_embedding=query_embedding,
-                    filters=type_filters,
-                    top_k=search_top_k
-                )
-                # 기존 결과에 병합 (중복 제거)
-                existing_ids = {r["clause_id"] for r in results}
-                for pr in type_results:
-                    if pr["clause_id"] not in existing_ids:
-                        results.append(pr)
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(query, query_params)
+            results = [self._lexical_row_to_result(row) for row in cur.fetchall()]
 
-        # ⭐ Fallback search for coverage queries with zero results
-        # If proposal + table_row filter is too restrictive, try progressively broader searches
-        if has_coverage_query and len(results) == 0:
-            # Tier 1: Try proposal without clause_type restriction
-            fallback_filters = search_filters.copy()
-            if "clause_type" in fallback_filters:
-                del fallback_filters["clause_type"]
-            results = self._filtered_vector_search(
-                query_embedding=query_embedding,
-                filters=fallback_filters,
-                top_k=search_top_k
-            )
+        self._record_lexical_search(trace, terms, index_terms, top_k, len(results))
+        return results
 
-            # Tier 2: Try business_spec with table_row (more detailed than summary)
-            if len(results) == 0:
-                fallback_filters = search_filters.copy()
-                fallback_filters["doc_type"] = "business_spec"
-                results = self._filtered_vector_search(
-                    query_embedding=query_embedding,
-                    filters=fallback_filters,
-                    top_k=search_top_k
-                )
+    def _build_lexical_search_sql(
+        self,
+        query_embedding: List[float],
+        terms: List[str],
+        filters: Dict[str, Any],
+        top_k: int
+    ) -> Tuple[str, List[Any], List[str]]:
+        """
+        lexical 검색 SQL 생성 (_lexical_search 참고)
 
-            # Tier 3: Try business_spec without clause_type
-            if len(results) == 0:
-                fallback_filters = search_filters.copy()
-                fallback_filters["doc_type"] = "business_spec"
-                if "clause_type" in fallback_filters:
-                    del fallback_filters["clause_type"]
-                results = self._filtered_vector_search(
-                    query_embedding=query_embedding,
-                    filters=fallback_filters,
-                    top_k=search_top_k
-                )
+        Returns:
+            (SQL 문자열, 파라미터 리스트, 인덱스 사용 용어 리스트)
+        """
+        def like_pattern(term: str) -> str:
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            return f"%{escaped}%"
 
-            # Tier 4: Try terms document (most comprehensive coverage info)
-            if len(results) == 0:
-                fallback_filters = search_filters.copy()
-                fallback_filters["doc_type"] = "terms"
-                if "clause_type" in fallback_filters:
-                    del fallback_filters["clause_type"]
-                results = self._filtered_vector_search(
-                    query_embedding=query_embedding,
-                    filters=fallback_filters,
-                    top_k=search_top_k
-                )
+        index_terms = [term for term in terms if len(term) >= LEXICAL_INDEX_MIN_TERM_LENGTH]
+        score_expr = " + ".join("(dc.clause_text ILIKE %s)::int" for _ in terms)
 
-            # Tier 5: Remove doc_type filter entirely (last resort)
-            if len(results) == 0:
-                fallback_filters = search_filters.copy()
-                if "doc_type" in fallback_filters:
-                    del fallback_filters["doc_type"]
-                if "clause_type" in fallback_filters:
-                    del fallback_filters["clause_type"]
-                results = self._filtered_vector_search(
-                    query_embedding=query_embedding,
-                    filters=fallback_filters,
-                    top_k=search_top_k
-                )
+        query_parts = [f"""
+                SELECT
+                    ce.clause_id,
+                    (1 - (ce.embedding <=> %s::vector)) as similarity,
+                    ce.clause_type,
+                    ce.doc_type,
+                    ce.product_id::text as product_id,
+                    dc.keyword_mask,
+                    ({score_expr}) as lexical_score
+                FROM clause_embedding ce
+                JOIN document_clause dc ON ce.clause_id = dc.id
+            """]
+        query_params: List[Any] = [query_embedding] + [like_pattern(term) for term in terms]
+
+        joins, where_conditions, filter_params = self._build_filter_conditions(filters)
+        query_parts.extend(joins)
+
+        lexical_condition = "(" + " OR ".join("dc.clause_text ILIKE %s" for _ in index_terms) + ")"
+        query_parts.append("WHERE " + " AND ".join([lexical_condition] + where_conditions))
+        query_params.extend(like_pattern(term) for term in index_terms)
+        query_params.extend(filter_params)
+
+        # 매칭 용어가 많을수록, 같은 수면 짧은(밀도 높은) 조항 우선
+        query_parts.append("ORDER BY lexical_score DESC, length(dc.clause_text)")
+        query_parts.append("LIMIT %s")
+        query_params.append(top_k)
+
+        return "\n".join(query_parts), query_params, index_terms
+
+    @classmethod
+    def _lexical_row_to_result(cls, row: tuple) -> SearchHit:
+        """lexical 검색 결과 행 → SearchHit (lexical_score 포함)"""
+        result = cls._row_to_result(row)
+        result.lexical_score = row[6]
+        return result
+
+    @staticmethod
+    def _record_lexical_search(
+        trace: Optional[Dict[str, Any]],
+        terms: List[str],
+        index_terms: List[str],
+        top_k: int,
+        returned: int
+    ):
+        """lexical 검색 1회를 trace에 기록 (trace가 None이면 기록하지 않음)"""
+        if trace is None:
+            return
+        trace.setdefault("lexical_searches", []).append({
+            "terms": terms,
+            "index_terms": index_terms,
+            "top_k": top_k,
+            "returned": returned,
+        })
+
+    def _fuse_rrf(
+        self,
+        vector_results: List[SearchHit],
+        lexical_results: List[SearchHit],
+        top_k: int
+    ) -> List[SearchHit]:
+        """
+        벡터/lexical 결과를 Reciprocal Rank Fusion으로 병합
 
-        # 5. 키워드 부스팅으로 재순위화 (금액 쿼리면 금액 정보 있는 문서 우선)
-        results = self._rerank_with_keyword_boost(
-            results, boost_keywords, top_k,
-            require_amount=is_amount_query
-        )
+        score = Σ 1 / (rrf_k + rank), rank는 채널별 1부터 시작 (rrf_k: RRF_K 환경 변수).
+        양쪽에 있는 결과는 벡터 결과 SearchHit에 lexical 정보를 합칩니다.
 
-        return results
+        Args:
+            vector_results: 벡터 검색 결과 (순위 순)
+            lexical_results: lexical 검색 결과 (순위 순)
+            top_k: 반환할 결과 개수
+
+        Returns:
+            rrf_score 순으로 정렬된 결과 (vector_rank, lexical_rank, rrf_score 포함)
+        """
+        fused: Dict[int, SearchHit] = {}
+
+        for rank, result in enumerate(vector_results, start=1):
+            result.vector_rank = rank
+            result.rrf_score = 1.0 / (self.rrf_k + rank)
+            fused[result.clause_id] = result
+
+        for rank, result in enumerate(lexical_results, start=1):
+            existing = fused.get(result.clause_id)
+            if existing is None:
+                result.rrf_score = 0.0
+                existing = fused[result.clause_id] = result
+            existing.lexical_rank = rank
+            existing.lexical_score = result.lexical_score
+            existing.rrf_score += 1.0 / (self.rrf_k + rank)
+
+        return sorted(fused.values(), key=attrgetter("rrf_score"), reverse=True)[:top_k]
 
+    @traced("vector.filtered")
     def _filtered_vector_search(
         self,
         query_embedding: List[float],
         filters: Dict[str, Any],
-        top_k: int
-    ) -> List[Dict[str, Any]]:
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
         """
         필터링된 벡터 검색
 
@@ -384,199 +983,724 @@ class HybridRetriever:
             query_embedding: 쿼리 임베딩
             filters: 필터 조건
             top_k: 반환할 결과 개수
+            trace: 검색 트레이스 (선택적)
 
         Returns:
             검색 결과 리스트
         """
-        with self.pg_conn.cursor() as cur:
-            # HNSW 인덱스 ef_search 설정 (필터+벡터검색 시 충분한 후보 탐색)
-            # 기본값 40은 필터 적용 시 결과 0 발생 가능 → 200으로 증가
-            cur.execute("SET hnsw.ef_search = 200")
+        if self._use_mmap([filters]):
+            branch_results, plan = self._mmap_vector_search([(query_embedding, filters)], top_k)
+            results = branch_results[0]
+            self._record_vector_search(trace, "filtered", plan, top_k, [len(results)])
+            return results
 
-            # 기본 SELECT
-            query_parts = ["""
-                SELECT
-                    ce.clause_id,
-                    dc.clause_text,
-                    (1 - (ce.embedding <=> %s::vector)) as similarity,
-                    ce.metadata->>'clause_type' as clause_type,
-                    ce.metadata->>'doc_type' as doc_type,
-                    ce.metadata->>'product_id' as product_id
-                FROM clause_embedding ce
-                JOIN document_clause dc ON ce.clause_id = dc.id
-                JOIN document d ON dc.document_id = d.id
-            """]
+        # HNSW 인덱스 ef_search 설정 (필터 선택도 기반)
+        # 필터 없음 → 기본값 수준, 좁은 필터 → 증가, 아주 작은 파티션 → exact scan
+        plan = self.ef_search_policy.plan([filters], self._candidate_k(top_k))
 
-            query_params = [query_embedding]
-            where_conditions = []
-
-            # Company filter
-            if filters.get("company_id"):
-                where_conditions.append("d.company_id = %s")
-                query_params.append(filters["company_id"])
-
-            # Product filter
-            if filters.get("product_id"):
-                where_conditions.append("d.product_id = %s")
-                query_params.append(filters["product_id"])
-
-            # Document type filter (Phase 6.1 - Proposal 우선 검색)
-            if filters.get("doc_type"):
-                where_conditions.append("ce.metadata->>'doc_type' = %s")
-                query_params.append(filters["doc_type"])
-
-            # Clause type filter (Phase 6.1 - table_row 우선 검색)
-            if filters.get("clause_type"):
-                where_conditions.append("ce.metadata->>'clause_type' = %s")
-                query_params.append(filters["clause_type"])
-
-            # Coverage IDs filter (metadata JSONB) - OPTIONAL, 있으면 적용
-            if filters.get("coverage_ids"):
-                coverage_ids = filters["coverage_ids"]
-                # 담보 필터는 있으면 좋지만, 없어도 검색 가능하도록 유연하게
-                or_conditions = []
-                for cov_id in coverage_ids:
-                    or_conditions.append(
-                        f"ce.metadata->'coverage_ids' @> '[{cov_id}]'::jsonb"
-                    )
-                if or_conditions:
-                    where_conditions.append(f"({' OR '.join(or_conditions)})")
-
-            # Amount filter (structured_data JSONB) - Phase 5 v6 Fix
-            # Handle Korean amount formats: "3,000만원", "500만원", "1억" etc.
-            if filters.get("amount"):
-                amount_filter = filters["amount"]
-                amount_conditions = []
-
-                # Helper function to parse Korean amounts in SQL
-                # Extract number from "N,NNN만원" or "N천만원" format
-                parse_korean_amount_sql = """
-                    CASE
-                        WHEN ce.metadata->'structured_data'->>'coverage_amount' ~ '^[0-9,]+만원$' THEN
-                            -- Parse "3,000만원" or "500만원" format
-                            (REPLACE(REGEXP_REPLACE(ce.metadata->'structured_data'->>'coverage_amount', '만원$', ''), ',', '')::bigint * 10000)
-                        WHEN ce.metadata->'structured_data'->>'coverage_amount' ~ '^[0-9]+억' THEN
-                            -- Parse "1억" or "2억5천만원" format (approximate)
-                            (REGEXP_REPLACE(ce.metadata->'structured_data'->>'coverage_amount', '억.*', '')::bigint * 100000000)
-                        WHEN ce.metadata->'structured_data'->>'coverage_amount' ~ '^[0-9]+천만원$' THEN
-                            -- Parse "3천만원" format
-                            (REGEXP_REPLACE(ce.metadata->'structured_data'->>'coverage_amount', '천만원$', '')::bigint * 10000000)
-                        WHEN ce.metadata->'structured_data'->>'coverage_amount' ~ '^[0-9]+원$' THEN
-                            -- Pure "NNN원" format
-                            REGEXP_REPLACE(ce.metadata->'structured_data'->>'coverage_amount', '원$', '')::bigint
-                        ELSE NULL
-                    END
-                """
-
-                if amount_filter.get("min"):
-                    amount_conditions.append(
-                        f"({parse_korean_amount_sql}) >= {amount_filter['min']}"
-                    )
-                if amount_filter.get("max"):
-                    amount_conditions.append(
-                        f"({parse_korean_amount_sql}) <= {amount_filter['max']}"
-                    )
-
-                if amount_conditions:
-                    where_conditions.append(f"({' AND '.join(amount_conditions)})")
-
-            # Gender filter (product_variant)
-            if filters.get("gender"):
-                query_parts.insert(1, "JOIN product_variant pv ON d.variant_id = pv.id")
-                where_conditions.append("pv.target_gender = %s")
-                query_params.append(filters["gender"])
-
-            # Age filter (product_variant, target_age_range)
-            if filters.get("age"):
-                age_filter = filters["age"]
-                if "variant_id" not in " ".join(query_parts):
-                    query_parts.insert(1, "JOIN product_variant pv ON d.variant_id = pv.id")
-
-                # age_filter: {"min": int, "max": int}
-                # pv.target_age_range: "≤40", "≥41", "20~40" 등
-                # 간단한 문자열 매칭으로 처리 (실전에서는 더 정교한 파싱 필요)
-                if age_filter.get("max") and not age_filter.get("min"):
-                    # "≤N" 범위 찾기
-                    where_conditions.append("pv.target_age_range LIKE %s")
-                    query_params.append(f"≤%")
-                elif age_filter.get("min") and not age_filter.get("max"):
-                    # "≥N" 범위 찾기
-                    where_conditions.append("pv.target_age_range LIKE %s")
-                    query_params.append(f"≥%")
-
-            # WHERE 절 구성
-            if where_conditions:
-                query_parts.append("WHERE " + " AND ".join(where_conditions))
-
-            # ORDER BY 및 LIMIT
-            query_parts.append("ORDER BY ce.embedding <=> %s::vector")
-            query_parts.append(f"LIMIT %s")
-
-            query_params.append(query_embedding)  # ORDER BY용
-            query_params.append(top_k)
+        final_query, query_params = self._build_vector_search_sql(
+            query_embedding, filters, top_k,
+            exact_scan=plan["branches"][0]["exact_scan"]
+        )
+
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            self.ef_search_policy.apply(cur, plan)
 
             # 최종 쿼리 실행
-            final_query = "\n".join(query_parts)
             cur.execute(final_query, query_params)
 
-            results = []
-            for row in cur.fetchall():
-                results.append({
-                    "clause_id": row[0],
-                    "clause_text": row[1],
-                    "similarity": row[2],
-                    "clause_type": row[3],
-                    "doc_type": row[4],
-                    "product_id": row[5]
-                })
+            results = [self._row_to_result(row) for row in cur.fetchall()]
+
+        self._record_vector_search(trace, "filtered", plan, top_k, [len(results)])
+        return results
+
+    @traced("vector.multi_doc_type")
+    def _multi_doc_type_vector_search(
+        self,
+        query_embedding: List[float],
+        filters: Dict[str, Any],
+        doc_types: List[str],
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """
+        기본 필터 검색 + doc_type별 검색을 한 번의 SQL로 실행 (Amount 쿼리용)
+
+        각 branch(기본 필터, doc_type별 필터)는 UNION ALL 안에서 자체
+        ORDER BY/LIMIT을 가지므로 branch마다 HNSW 인덱스를 사용합니다.
+        결과는 clause_id 기준으로 중복 제거되며, 먼저 나온 branch의 결과가
+        우선합니다 (순차 검색 후 병합하던 기존 순서와 동일).
 
+        Args:
+            query_embedding: 쿼리 임베딩
+            filters: 기본 검색 필터 (branch 0)
+            doc_types: 추가로 검색할 doc_type 리스트 (company_id 필터와 함께 적용)
+            top_k: branch당 반환할 결과 개수
+            trace: 검색 트레이스 (선택적)
+
+        Returns:
+            병합/중복 제거된 검색 결과 리스트
+        """
+        branch_filters = [filters] + [
+            {"company_id": filters["company_id"], "doc_type": doc_type}
+            for doc_type in doc_types
+        ]
+
+        if self._use_mmap(branch_filters):
+            branch_results, plan = self._mmap_vector_search(
+                [(query_embedding, branch_filter) for branch_filter in branch_filters], top_k
+            )
+            results, branch_counts = self._merge_branch_results(branch_results)
+            self._record_vector_search(trace, "multi_doc_type", plan, top_k, branch_counts)
             return results
+        plan = self.ef_search_policy.plan(branch_filters, self._candidate_k(top_k))
+        union_query, query_params = self._build_union_search_sql(
+            query_embedding, branch_filters, top_k, plan
+        )
+
+        final_query = f"""
+            SELECT * FROM (
+                SELECT DISTINCT ON (clause_id) *
+                FROM ({union_query}) AS candidates
+                ORDER BY clause_id, branch
+            ) AS merged
+            ORDER BY branch, similarity DESC
+        """
+
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            self.ef_search_policy.apply(cur, plan)
+            cur.execute(final_query, query_params)
+            rows = cur.fetchall()
+
+        # branch별 결과 수 (중복 제거 후, 먼저 나온 branch 기준)
+        branch_counts = [0] * len(branch_filters)
+        for row in rows:
+            branch_counts[row[6]] += 1
+        self._record_vector_search(trace, "multi_doc_type", plan, top_k, branch_counts)
 
-    def _search_single_company(
+        return [self._row_to_result(row) for row in rows]
+
+    @staticmethod
+    def _merge_branch_results(
+        branch_results: List[List[SearchHit]]
+    ) -> Tuple[List[SearchHit], List[int]]:
+        """
+        branch별 결과 병합 (UNION ALL SQL 버전과 동일한 순서)
+
+        clause_id 중복은 먼저 나온 branch가 우선하고, branch → similarity 순으로 나열합니다.
+
+        Returns:
+            (병합된 결과, 중복 제거 후 branch별 결과 수)
+        """
+        results = []
+        seen = set()
+        branch_counts = []
+        for branch_result in branch_results:
+            unique = [r for r in branch_result if r.clause_id not in seen]
+            seen.update(r.clause_id for r in unique)
+            branch_counts.append(len(unique))
+            results.extend(unique)
+        return results, branch_counts
+
+    @staticmethod
+    def _build_fallback_tiers(search_filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Zero-result fallback용 tier별 필터 생성 (구체적 → 일반적 순서)
+
+        Tier 1: proposal without clause_type restriction
+        Tier 2: business_spec with table_row (more detailed than summary)
+        Tier 3: business_spec without clause_type
+        Tier 4: terms document (most comprehensive coverage info)
+        Tier 5: doc_type/clause_type 필터 제거 (last resort)
+        """
+        def without(filters: Dict[str, Any], *keys: str) -> Dict[str, Any]:
+            return {k: v for k, v in filters.items() if k not in keys}
+
+        return [
+            without(search_filters, "clause_type"),
+            {**search_filters, "doc_type": "business_spec"},
+            without({**search_filters, "doc_type": "business_spec"}, "clause_type"),
+            without({**search_filters, "doc_type": "terms"}, "clause_type"),
+            without(search_filters, "doc_type", "clause_type"),
+        ]
+
+    @traced("vector.fallback_tiers")
+    def _tiered_vector_search(
         self,
-        company_name: str,
-        coverage_name: str,
-        search_top_k: int
-    ) -> tuple:
-        """단일 회사 검색 (병렬 실행용)"""
-        company_query = f"{company_name} {coverage_name}"
+        query_embedding: List[float],
+        tier_filters: List[Dict[str, Any]],
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        """
+        Fallback tier 검색을 한 번의 SQL로 실행
+
+        모든 tier를 UNION ALL로 조회하되, 결과가 있는 가장 구체적인(번호가 작은)
+        tier의 후보만 반환합니다. tier를 순차 실행하며 첫 번째 비어있지 않은
+        결과를 쓰던 기존 동작과 결과는 같고 DB 왕복은 1회입니다.
+
+        Args:
+            query_embedding: 쿼리 임베딩
+            tier_filters: tier별 필터 (우선순위 순서)
+            top_k: tier당 반환할 결과 개수
+            trace: 검색 트레이스 (선택적)
+
+        Returns:
+            검색 결과 리스트 (각 결과에 fallback_tier 포함, 1부터 시작)
+        """
+        if self._use_mmap(tier_filters):
+            # 프로세스 내 검색은 왕복 비용이 없으므로 tier를 순서대로 실행하고 첫 결과에서 중단
+            for tier_index, tier_filter in enumerate(tier_filters):
+                branch_results, plan = self._mmap_vector_search([(query_embedding, tier_filter)], top_k)
+                if branch_results[0] or tier_index == len(tier_filters) - 1:
+                    break
+            results = branch_results[0]
+            for result in results:
+                result.fallback_tier = tier_index + 1
+            self._record_vector_search(trace, "fallback_tiers", plan, top_k, [len(results)])
+            self._record_fallback_tier(trace, results)
+            return results
+
+        plan = self.ef_search_policy.plan(tier_filters, self._candidate_k(top_k))
+        union_query, query_params = self._build_union_search_sql(
+            query_embedding, tier_filters, top_k, plan
+        )
+
+        final_query = f"""
+            WITH candidates AS ({union_query})
+            SELECT *
+            FROM candidates
+            WHERE branch = (SELECT MIN(branch) FROM candidates)
+            ORDER BY similarity DESC
+        """
 
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            self.ef_search_policy.apply(cur, plan)
+            cur.execute(final_query, query_params)
+
+            results = []
+            branch_counts = [0] * len(tier_filters)
+            for row in cur.fetchall():
+                result = self._row_to_result(row)
+                result.fallback_tier = row[6] + 1
+                branch_counts[row[6]] += 1
+                results.append(result)
+
+        self._record_vector_search(trace, "fallback_tiers", plan, top_k, branch_counts)
+        self._record_fallback_tier(trace, results)
+        return results
+
+    @staticmethod
+    def _record_fallback_tier(trace: Optional[Dict[str, Any]], results: List[SearchHit]):
+        """사용된 fallback tier 집계 (결과가 없으면 none)"""
+        tier = results[0].fallback_tier if results else None
+        SEARCH_METRICS.increment(f"fallback_tier.{tier or 'none'}")
+        if trace is not None:
+            trace["fallback_tier"] = tier
+
+    def reload_mmap_index(self) -> bool:
+        """
+        --export-mmap으로 인덱스가 다시 내보내졌으면 새로 열어 교체
+
+        corpus_version 변경 시 호출 (검색 캐시 조회 / 서버 CorpusVersionListener 콜백).
+        진행 중인 검색은 이전 인덱스 참조를 그대로 사용
+
+        Returns:
+            교체 여부
+        """
+        index = self.mmap_index
+        if index is None or not index.changed_on_disk():
+            return False
         try:
-            # company_id 조회 (DB 직접 조회로 단순화)
-            company_id = self._get_company_id_by_name(company_name)
+            self.mmap_index = MmapVectorIndex(str(index.index_dir))
+        except (OSError, ValueError, KeyError) as e:
+            # 교체 도중이거나 불완전한 디렉토리 → 이전 인덱스 유지, 다음 버전 변경 시 재시도
+            print(f"Warning: failed to reload mmap vector index ({e}), keeping previous index")
+            return False
+        print(f"Reloaded mmap vector index: {self.mmap_index.manifest['created_at']}")
+        return True
+
+    def _use_mmap(self, branch_filters: List[Dict[str, Any]]) -> bool:
+        """mmap 백엔드로 모든 branch를 처리할 수 있는지 여부"""
+        return self.mmap_index is not None and all(
+            self.mmap_index.supports(branch_filter) for branch_filter in branch_filters
+        )
 
-            if not company_id:
-                return (company_name, [])
+    def _mmap_vector_search(
+        self,
+        branches: List[Tuple[List[float], Dict[str, Any]]],
+        top_k: int
+    ) -> Tuple[List[List[SearchHit]], Dict[str, Any]]:
+        """
+        mmap 인덱스로 branch별 exact 벡터 검색 (DB는 후보 keyword_mask 조회에만 사용)
+
+        Args:
+            branches: (쿼리 임베딩, 필터) 리스트
+            top_k: branch당 반환할 결과 개수
+
+        Returns:
+            (branch별 검색 결과 리스트, _record_vector_search용 plan)
+        """
+        branch_hits, plan = self._mmap_search_hits(branches, top_k)
+        keyword_masks = self._fetch_keyword_masks(
+            {clause_id for hits in branch_hits for clause_id, _, _ in hits}
+        )
+        return self._mmap_hits_to_results(branch_hits, keyword_masks), plan
+
+    def _mmap_search_hits(
+        self,
+        branches: List[Tuple[List[float], Dict[str, Any]]],
+        top_k: int
+    ) -> Tuple[List[List[Tuple[int, float, Dict[str, Any]]]], Dict[str, Any]]:
+        """
+        mmap 인덱스 branch별 검색 (DB 조회 없음)
 
-            # 단순화된 검색: 모든 문서에서 검색 (fallback 제거로 속도 향상)
-            search_results = self.search(
-                query=company_query,
-                top_k=search_top_k,
-                filters={"company_id": company_id}
+        Returns:
+            (branch별 (clause_id, similarity, row_metadata) 리스트, _record_vector_search용 plan)
+        """
+        # 검색 도중 reload_mmap_index()로 교체되어도 같은 인덱스의 메타데이터를 쓰도록 참조 1회 획득
+        index = self.mmap_index
+        branch_hits = []
+        branch_plans = []
+        for query_embedding, branch_filter in branches:
+            hits, candidate_count = index.search(query_embedding, branch_filter, top_k)
+            branch_hits.append([
+                (clause_id, similarity, index.row_metadata(clause_id))
+                for clause_id, similarity in hits
+            ])
+            branch_plans.append({
+                "ef_search": None,
+                "exact_scan": True,
+                "estimated_rows": candidate_count,
+                "selectivity": round(candidate_count / len(index), 6) if len(index) else None,
+            })
+
+        plan = {"ef_search": None, "exact_scan": True, "backend": "mmap", "branches": branch_plans}
+        return branch_hits, plan
+
+    def _mmap_hits_to_results(
+        self,
+        branch_hits: List[List[Tuple[int, float, Dict[str, Any]]]],
+        keyword_masks: Dict[int, int]
+    ) -> List[List[SearchHit]]:
+        """mmap 검색 결과 + keyword_mask → branch별 검색 결과 리스트 (_row_to_result와 같은 필드)"""
+        return [
+            [
+                SearchHit(
+                    clause_id=clause_id,
+                    similarity=similarity,
+                    keyword_mask=keyword_masks.get(clause_id, 0),
+                    **metadata
+                )
+                for clause_id, similarity, metadata in hits
+            ]
+            for hits in branch_hits
+        ]
+
+    def _fetch_clause_texts(self, clause_ids) -> Dict[int, str]:
+        """clause_id 집합 → 조항 텍스트 (PK 조회 1회)"""
+        if not clause_ids:
+            return {}
+
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                "SELECT id, clause_text FROM document_clause WHERE id = ANY(%s)",
+                (list(clause_ids),)
             )
+            return dict(cur.fetchall())
 
-            return (company_name, search_results)
+    def _fetch_keyword_masks(self, clause_ids) -> Dict[int, int]:
+        """clause_id 집합 → keyword_mask (PK 조회 1회, mmap 백엔드 후보용)"""
+        if not clause_ids:
+            return {}
 
-        except Exception as e:
-            print(f"Error searching for company {company_name}: {e}")
-            return (company_name, [])
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                "SELECT id, keyword_mask FROM document_clause WHERE id = ANY(%s)",
+                (list(clause_ids),)
+            )
+            return dict(cur.fetchall())
+
+    @staticmethod
+    def _record_vector_search(
+        trace: Optional[Dict[str, Any]],
+        kind: str,
+        plan: Dict[str, Any],
+        top_k: int,
+        branch_counts: List[int]
+    ):
+        """
+        벡터 검색 1회의 ef_search 결정과 결과 충족률을 trace에 기록
+
+        Args:
+            trace: 검색 트레이스 (None이면 기록하지 않음)
+            kind: 검색 종류 (filtered, multi_doc_type, fallback_tiers, multi_company)
+            plan: EfSearchPolicy.plan() 결과
+            top_k: branch당 요청 결과 개수
+            branch_counts: branch별 실제 반환 결과 수
+        """
+        SEARCH_METRICS.increment(f"vector_search.{kind}")
+        if plan["exact_scan"]:
+            SEARCH_METRICS.increment("vector_search.exact_scan")
+        elif plan["ef_search"]:
+            SEARCH_METRICS.increment(f"ef_search.{plan['ef_search']}")
+
+        if trace is None:
+            return
+
+        branches = []
+        for branch_plan, returned in zip(plan["branches"], branch_counts):
+            branches.append({
+                **branch_plan,
+                "returned": returned,
+                "fill": round(returned / top_k, 3) if top_k else None,
+            })
+
+        trace.setdefault("vector_searches", []).append({
+            "kind": kind,
+            "backend": plan.get("backend", "pgvector"),
+            "ef_search": plan["ef_search"],
+            "exact_scan": plan["exact_scan"],
+            "top_k": top_k,
+            "returned": sum(branch_counts),
+            "branches": branches,
+        })
+
+    def _build_union_search_sql(
+        self,
+        query_embedding: List[float],
+        branch_filters: List[Dict[str, Any]],
+        top_k: int,
+        plan: Dict[str, Any]
+    ) -> Tuple[str, List[Any]]:
+        """
+        여러 필터 조합의 벡터 검색을 UNION ALL 한 문장으로 구성
+
+        각 결과 행에는 branch 번호(branch_filters의 인덱스) 컬럼이 붙습니다.
+        plan에서 exact scan으로 결정된 branch만 인덱스를 쓰지 않는 정렬로 구성합니다.
+
+        Returns:
+            (SQL 문자열, 파라미터 리스트)
+        """
+        parts = []
+        params: List[Any] = []
+        for branch, branch_filter in enumerate(branch_filters):
+            sql, branch_params = self._build_vector_search_sql(
+                query_embedding, branch_filter, top_k, branch=branch,
+                exact_scan=plan["branches"][branch]["exact_scan"]
+            )
+            parts.append(f"({sql})")
+            params.extend(branch_params)
+
+        return "\nUNION ALL\n".join(parts), params
 
+    def _build_vector_search_sql(
+        self,
+        query_embedding: Optional[List[float]],
+        filters: Dict[str, Any],
+        top_k: int,
+        branch: Optional[int] = None,
+        query_sql: str = "%s::vector",
+        extra_conditions: Tuple[str, ...] = (),
+        exact_scan: bool = False
+    ) -> Tuple[str, List[Any]]:
+        """
+        필터링된 벡터 검색 SQL 생성
+
+        Args:
+            query_embedding: 쿼리 임베딩 (query_sql이 파라미터 없는 식이면 None)
+            filters: 필터 조건
+            top_k: 반환할 결과 개수
+            branch: UNION 검색 시 결과에 붙일 branch 번호 (선택)
+            query_sql: 쿼리 벡터 SQL (LATERAL 검색에서는 q.query_embedding::vector)
+            extra_conditions: 파라미터 없는 추가 WHERE 조건 (예: ce.company_id = q.company_id)
+            exact_scan: 작은 파티션 exact scan (EfSearchPolicy branch plan)
+                HNSW 인덱스가 쓸 수 없는 정렬식(similarity DESC)으로 필터 매칭 행 전체를
+                정확히 정렬합니다 (2단계 검색도 생략). 같은 문장의 다른 branch와
+                조인은 인덱스를 그대로 사용합니다.
+
+        Returns:
+            (SQL 문자열, 파라미터 리스트)
+        """
+        branch_column = f",\n                    {int(branch)} as branch" if branch is not None else ""
+        embedding_params = [query_embedding] if query_embedding is not None else []
+
+        if self.two_stage and not exact_scan:
+            return self._build_rescored_search_sql(
+                query_embedding, filters, top_k, branch_column, query_sql, extra_conditions
+            )
+
+        # 기본 SELECT
+        # company_id/product_id/doc_type/clause_type는 clause_embedding의 비정규화 컬럼 사용
+        # (document 조인은 product_variant 필터가 있을 때만 추가)
+        query_parts = [f"""
+                SELECT
+                    ce.clause_id,
+                    (1 - (ce.embedding <=> {query_sql})) as similarity,
+                    ce.clause_type,
+                    ce.doc_type,
+                    ce.product_id::text as product_id,
+                    dc.keyword_mask{branch_column}
+                FROM clause_embedding ce
+                JOIN document_clause dc ON ce.clause_id = dc.id
+            """]
+        query_params = list(embedding_params)
+
+        joins, where_conditions, filter_params = self._build_filter_conditions(filters)
+        where_conditions = list(extra_conditions) + where_conditions
+        query_parts.extend(joins)
+        query_params.extend(filter_params)
+
+        # WHERE 절 구성
+        if where_conditions:
+            query_parts.append("WHERE " + " AND ".join(where_conditions))
+
+        # ORDER BY 및 LIMIT
+        if exact_scan:
+            # 거리 연산자 정렬이 아니므로 HNSW 대신 필터 매칭 행 전체 정렬
+            query_parts.append("ORDER BY similarity DESC")
+        else:
+            query_parts.append(f"ORDER BY ce.embedding <=> {query_sql}")
+            query_params.extend(embedding_params)  # ORDER BY용
+        query_parts.append(f"LIMIT %s")
+        query_params.append(top_k)
+
+        return "\n".join(query_parts), query_params
+
+    def _candidate_k(self, top_k: int) -> int:
+        """1단계(인덱스) 검색 후보 수 (2단계 검색이면 rescoring용으로 확대)"""
+        return top_k * self.rescore_factor if self.two_stage else top_k
+
+    def _coarse_distance_sql(self, column: str, query_sql: str) -> str:
+        """
+        1단계 검색 거리 식 (표현식 인덱스와 같은 식이어야 인덱스 사용)
+
+        Matryoshka(앞 N차원 subvector)와 양자화는 함께 쓰지 않습니다
+        (_init_search_settings에서 인덱스가 있는 조합만 허용).
+        코사인 거리는 벡터를 정규화하므로 잘라낸 subvector를 다시 정규화할 필요가 없습니다.
+
+        Args:
+            column: 임베딩 컬럼 (예: ce.embedding)
+            query_sql: 쿼리 벡터 SQL (예: %s::vector)
+        """
+        dimension = self.dimension
+        if self.coarse_dimensions:
+            dimension = self.coarse_dimensions
+            column = f"subvector({column}, 1, {dimension})::vector({dimension})"
+            query_sql = f"subvector({query_sql}, 1, {dimension})::vector({dimension})"
+
+        if self.quantization == "halfvec":
+            return f"({column})::halfvec({dimension}) <=> ({query_sql})::halfvec({dimension})"
+        if self.quantization == "binary":
+            return (
+                f"binary_quantize({column})::bit({dimension}) "
+                f"<~> binary_quantize({query_sql})::bit({dimension})"
+            )
+        return f"{column} <=> {query_sql}"
+
+    def _build_rescored_search_sql(
+        self,
+        query_embedding: Optional[List[float]],
+        filters: Dict[str, Any],
+        top_k: int,
+        branch_column: str = "",
+        query_sql: str = "%s::vector",
+        extra_conditions: Tuple[str, ...] = ()
+    ) -> Tuple[str, List[Any]]:
+        """
+        2단계 검색 SQL 생성 (양자화/Matryoshka 인덱스 후보 검색 + float32 rescoring)
+
+        내부 쿼리가 1단계 표현식 인덱스로 top_k × rescore_factor개 후보를 찾고,
+        외부 쿼리가 원본 벡터 거리로 재정렬하여 top_k개를 반환합니다.
+        결과 컬럼은 _build_vector_search_sql과 같습니다.
+
+        Returns:
+            (SQL 문자열, 파라미터 리스트)
+        """
+        joins, where_conditions, filter_params = self._build_filter_conditions(filters)
+        where_conditions = list(extra_conditions) + where_conditions
+        where_sql = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+        joins_sql = "\n                    ".join(joins)
+        embedding_params = [query_embedding] if query_embedding is not None else []
+
+        query = f"""
+                SELECT
+                    c.clause_id,
+                    (1 - (c.embedding <=> {query_sql})) as similarity,
+                    c.clause_type,
+                    c.doc_type,
+                    c.product_id::text as product_id,
+                    c.keyword_mask{branch_column}
+                FROM (
+                    SELECT ce.clause_id, ce.embedding, ce.clause_type,
+                           ce.doc_type, ce.product_id, dc.keyword_mask
+                    FROM clause_embedding ce
+                    JOIN document_clause dc ON ce.clause_id = dc.id
+                    {joins_sql}
+                    {where_sql}
+                    ORDER BY {self._coarse_distance_sql("ce.embedding", query_sql)}
+                    LIMIT %s
+                ) AS c
+                ORDER BY c.embedding <=> {query_sql}
+                LIMIT %s
+            """
+        query_params = (
+            embedding_params
+            + filter_params
+            + embedding_params + [self._candidate_k(top_k)]
+            + embedding_params + [top_k]
+        )
+
+        return query, query_params
+
+    @staticmethod
+    def _build_filter_conditions(filters: Dict[str, Any]) -> Tuple[List[str], List[str], List[Any]]:
+        """
+        검색 필터 → JOIN / WHERE 조건 (벡터·lexical 검색 공용)
+
+        clause_embedding ce, document_clause dc가 FROM 절에 있다고 가정합니다.
+
+        Args:
+            filters: 필터 조건
+
+        Returns:
+            (추가 JOIN 리스트, WHERE 조건 리스트, 파라미터 리스트)
+        """
+        joins = []
+        where_conditions = []
+        query_params = []
+
+        # Company filter
+        if filters.get("company_id"):
+            where_conditions.append("ce.company_id = %s")
+            query_params.append(filters["company_id"])
+
+        # Product filter
+        if filters.get("product_id"):
+            where_conditions.append("ce.product_id = %s")
+            query_params.append(filters["product_id"])
+
+        # Document type filter (Phase 6.1 - Proposal 우선 검색)
+        # psycopg2는 파라미터를 리터럴로 치환하므로 doc_type별 partial HNSW 인덱스
+        # (idx_clause_embedding_hnsw_<doc_type>)가 플래너에 의해 선택됨
+        if filters.get("doc_type"):
+            where_conditions.append("ce.doc_type = %s")
+            query_params.append(filters["doc_type"])
+
+        # Clause type filter (Phase 6.1 - table_row 우선 검색)
+        if filters.get("clause_type"):
+            where_conditions.append("ce.clause_type = %s")
+            query_params.append(filters["clause_type"])
+
+        # Coverage IDs filter (metadata JSONB) - OPTIONAL, 있으면 적용
+        if filters.get("coverage_ids"):
+            coverage_ids = filters["coverage_ids"]
+            # 담보 필터는 있으면 좋지만, 없어도 검색 가능하도록 유연하게
+            or_conditions = []
+            for cov_id in coverage_ids:
+                or_conditions.append(
+                    f"ce.metadata->'coverage_ids' @> '[{cov_id}]'::jsonb"
+                )
+            if or_conditions:
+                where_conditions.append(f"({' OR '.join(or_conditions)})")
+
+        # Amount filter - Phase 5 v6 Fix
+        # coverage_amount는 인덱싱 시 "3,000만원", "2억5천만원" 등을 파싱해 저장한 bigint 컬럼
+        # (쿼리 시점 REGEXP 파싱 없이 B-tree 범위 조건으로 처리)
+        if filters.get("amount"):
+            amount_filter = filters["amount"]
+            amount_conditions = []
+
+            if amount_filter.get("min"):
+                amount_conditions.append("ce.coverage_amount >= %s")
+                query_params.append(amount_filter["min"])
+            if amount_filter.get("max"):
+                amount_conditions.append("ce.coverage_amount <= %s")
+                query_params.append(amount_filter["max"])
+
+            if amount_conditions:
+                where_conditions.append(f"({' AND '.join(amount_conditions)})")
+
+        # Gender filter (product_variant)
+        if filters.get("gender"):
+            joins.append("JOIN document d ON dc.document_id = d.id")
+            joins.append("JOIN product_variant pv ON d.variant_id = pv.id")
+            where_conditions.append("pv.target_gender = %s")
+            query_params.append(filters["gender"])
+
+        # Age filter (product_variant, target_age_range)
+        if filters.get("age"):
+            age_filter = filters["age"]
+            if not joins:
+                joins.append("JOIN document d ON dc.document_id = d.id")
+                joins.append("JOIN product_variant pv ON d.variant_id = pv.id")
+
+            # age_filter: {"min": int, "max": int}
+            # pv.target_age_range: "≤40", "≥41", "20~40" 등
+            # 간단한 문자열 매칭으로 처리 (실전에서는 더 정교한 파싱 필요)
+            if age_filter.get("max") and not age_filter.get("min"):
+                # "≤N" 범위 찾기
+                where_conditions.append("pv.target_age_range LIKE %s")
+                query_params.append(f"≤%")
+            elif age_filter.get("min") and not age_filter.get("max"):
+                # "≥N" 범위 찾기
+                where_conditions.append("pv.target_age_range LIKE %s")
+                query_params.append(f"≥%")
+
+        return joins, where_conditions, query_params
+
+    @staticmethod
+    def _row_to_result(row: tuple) -> SearchHit:
+        """
+        후보 검색 결과 행 → SearchHit
+
+        행: (clause_id, similarity, clause_type, doc_type, product_id, keyword_mask[, branch])
+        조항 텍스트는 재순위화 후 _attach_clause_texts()로 채웁니다.
+        """
+        return SearchHit(row[0], row[1], row[2], row[3], row[4], row[5])
+
+    def _attach_clause_texts(self, result_lists: List[List[SearchHit]]):
+        """재순위화 후 남은 결과의 조항 텍스트를 한 번에 조회해 채움 (keyword_mask 제거)"""
+        clause_texts = self._fetch_clause_texts(
+            {result.clause_id for results in result_lists for result in results}
+        )
+        self._fill_clause_texts(result_lists, clause_texts)
+
+    @staticmethod
+    def _fill_clause_texts(result_lists: List[List[SearchHit]], clause_texts: Dict[int, str]):
+        """결과에 조항 텍스트를 채우고 내부용 keyword_mask 제거"""
+        for results in result_lists:
+            for result in results:
+                result.clause_text = clause_texts.get(result.clause_id, "")
+                del result.keyword_mask
+
+    @traced("search_multi_company")
     def search_multi_company(
         self,
         query: str,
         company_names: List[str],
         coverage_name: str,
         top_k: int = 5,
-        search_top_k: int = 50
-    ) -> Dict[str, List[Dict[str, Any]]]:
+        search_top_k: int = 50,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[SearchHit]]:
         """
-        여러 보험사에 대해 동일 쿼리로 검색 (상품 비교용) - 병렬 실행
+        여러 보험사에 대해 동일 쿼리로 검색 (상품 비교용)
+
+        회사별 search() 호출(회사당 엔티티 추출 + 2~4회 벡터 검색)을 스레드로
+        병렬 실행하던 방식 대신, 회사별 후보를 한 번의 SQL(LATERAL)로 조회하고
+        키워드 재순위화만 회사별로 수행합니다. 회사마다 search()와 같은 branch를 검색합니다:
+        - 엔티티 필터(product/amount/gender/age, 담보 쿼리의 doc_type/clause_type)가 적용된 기본 branch
+        - Amount 쿼리면 AMOUNT_QUERY_DOC_TYPES별 branch (clause_id 중복은 앞 branch 우선)
+        - 결과가 없는 회사만 fallback tier 검색 (담보 쿼리, 해당 회사들만 SQL 1회 추가)
 
         Args:
             query: 기본 쿼리 (예: "암진단")
             company_names: 비교할 보험사 이름 리스트 (예: ["삼성화재", "DB손보"])
             coverage_name: 담보 이름
             top_k: 각 회사당 반환할 결과 개수
+            search_top_k: 각 회사당 재순위화 후 유지할 결과 개수
+            trace: 검색 트레이스 (선택적, search() 참고)
 
         Returns:
             회사별 검색 결과 딕셔너리
@@ -586,54 +1710,338 @@ class HybridRetriever:
                 ...
             }
         """
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        results_by_company: Dict[str, List[SearchHit]] = {
+            company_name: [] for company_name in company_names
+        }
+        if not company_names:
+            return results_by_company
+
+        # 1. company_id 일괄 조회 (못 찾은 회사는 빈 결과)
+        with span(trace, "multi_company.company_ids"):
+            company_ids = self._get_company_ids_by_names(company_names)
+        targets = [
+            (company_name, company_ids[company_name])
+            for company_name in company_names
+            if company_ids.get(company_name)
+        ]
+        if not targets:
+            return results_by_company
 
-        results_by_company = {}
+        # 2. 회사별 쿼리 임베딩을 한 번의 API 호출로 생성
+        company_queries = [
+            self._build_company_query(company_name, coverage_name)
+            for company_name, _ in targets
+        ]
+        try:
+            with span(trace, "multi_company.embed", rows=len(company_queries)):
+                company_embeddings = self.embedder.embed_queries(company_queries)
+        except Exception as e:
+            print(f"Error in batched query embedding for multi-company search: {e}")
+            return results_by_company
+
+        # 3. 필터/부스팅 키워드/금액 쿼리 여부는 전체 질의(+담보명) 기준으로 한 번만 계산해 회사별로 재사용
+        # (회사명은 company_id 조건으로 대체되므로 회사별로 다시 추출할 필요 없음)
+        intent_query = self._multi_company_intent_query(query, coverage_name)
+        with span(trace, "multi_company.entities"):
+            entities = self.nl_mapper.extract_entities(intent_query)
+            prepared = self._prepare_multi_company_search(intent_query, search_top_k, entities)
+
+        # 4. 회사별 branch 후보를 한 번의 SQL로 조회, 결과가 없는 회사만 fallback tier
+        target_ids = [company_id for _, company_id in targets]
+        candidates = self._multi_company_vector_search(
+            company_ids=target_ids,
+            query_embeddings=company_embeddings,
+            branch_filters=prepared["branch_filters"],
+            top_k=prepared["search_top_k"],
+            trace=trace
+        )
+        empty = [index for index in range(len(targets)) if not candidates.get(index)]
+        if prepared["fallback_tiers"] and empty:
+            fallback = self._multi_company_vector_search(
+                company_ids=[target_ids[index] for index in empty],
+                query_embeddings=[company_embeddings[index] for index in empty],
+                branch_filters=prepared["fallback_tiers"],
+                top_k=prepared["search_top_k"],
+                trace=trace,
+                first_branch_only=True
+            )
+            for position, index in enumerate(empty):
+                candidates[index] = fallback.get(position, [])
 
-        # 병렬 검색 실행
-        with ThreadPoolExecutor(max_workers=len(company_names)) as executor:
-            futures = {
-                executor.submit(
-                    self._search_single_company,
-                    company_name,
-                    coverage_name,
-                    search_top_k
-                ): company_name
-                for company_name in company_names
-            }
+        with span(trace, "multi_company.rerank"):
+            extra_matches = self._count_extra_keyword_matches(
+                [result for results in candidates.values() for result in results],
+                prepared["boost_keywords"]
+            )
+            for index, (company_name, _) in enumerate(targets):
+                results_by_company[company_name] = self._rerank_with_keyword_boost(
+                    candidates.get(index, []), prepared["boost_keywords"], search_top_k,
+                    require_amount=prepared["is_amount_query"],
+                    extra_matches=extra_matches
+                )
 
-            for future in as_completed(futures):
-                company_name, results = future.result()
-                results_by_company[company_name] = results
+        # 5. 회사별 최종 결과의 조항 텍스트만 한 번에 조회
+        with span(trace, "multi_company.clause_text"):
+            self._attach_clause_texts(list(results_by_company.values()))
 
         return results_by_company
 
-    def _get_company_id_by_name(self, company_name: str) -> Optional[int]:
+    def _prepare_multi_company_search(
+        self,
+        intent_query: str,
+        search_top_k: int,
+        entities: Dict[str, Any]
+    ) -> Dict[str, Any]:
         """
-        회사명으로 company_id 조회 (부분 매칭)
+        회사별 비교 검색 준비 (search()의 _prepare_search와 같은 필터, 회사 종속 필터 제외)
 
         Args:
-            company_name: 회사명 (예: "삼성", "삼성화재")
+            intent_query: 엔티티/의도 판단 쿼리 (_multi_company_intent_query() 결과)
+            search_top_k: 회사당 재순위화 후 유지할 결과 개수 (search()의 top_k)
+            entities: NLMapper.extract_entities(intent_query) 결과
 
         Returns:
-            company_id 또는 None
+            _prepare_search() 결과 + {
+                "branch_filters": 회사별 branch 필터 (company_id는 LATERAL에서 적용,
+                    질의에 언급된 상품의 product_id는 다른 회사 결과를 없애므로 제외),
+                "fallback_tiers": 결과가 없는 회사의 tier별 필터 (담보 쿼리가 아니면 빈 리스트)
+            }
         """
-        with self.pg_conn.cursor() as cur:
-            # 부분 매칭 (예: "삼성" → "삼성화재")
-            cur.execute("""
-                SELECT id
-                FROM company
-                WHERE company_name LIKE %s OR company_code LIKE %s
-                LIMIT 1
-            """, (f"%{company_name}%", f"%{company_name}%"))
+        prepared = self._prepare_search(intent_query, search_top_k, None, entities)
+        shared_filters = {
+            key: value for key, value in prepared["filters"].items()
+            if key not in ("company_id", "product_id")
+        }
+
+        branch_filters = [shared_filters]
+        if prepared["is_amount_query"]:
+            branch_filters += [{"doc_type": doc_type} for doc_type in AMOUNT_QUERY_DOC_TYPES]
+
+        prepared["branch_filters"] = branch_filters
+        prepared["fallback_tiers"] = (
+            self._build_fallback_tiers(shared_filters) if prepared["has_coverage_query"] else []
+        )
+        return prepared
+
+    @staticmethod
+    def _combine_company_branches(
+        branch_results: List[List[SearchHit]],
+        branch_count: int,
+        first_branch_only: bool = False
+    ) -> Tuple[Dict[int, List[SearchHit]], List[int]]:
+        """
+        (회사, branch) 순서로 나열된 branch별 결과 → 회사별 결과
 
-            row = cur.fetchone()
-            return row[0] if row else None
+        Args:
+            branch_results: 회사마다 branch_count개씩 이어진 결과 리스트
+            branch_count: 회사당 branch 수
+            first_branch_only: True면 결과가 있는 첫 branch만 사용 (fallback tier, fallback_tier 기록)
+                False면 branch 순서로 병합 (clause_id 중복은 앞 branch 우선)
+
+        Returns:
+            ({회사 인덱스: 결과}, (회사, branch)별 사용된 결과 수)
+        """
+        results_by_index: Dict[int, List[SearchHit]] = {}
+        counts: List[int] = []
+        for index in range(len(branch_results) // branch_count):
+            company_branches = branch_results[index * branch_count:(index + 1) * branch_count]
+            if first_branch_only:
+                tier_index = next(
+                    (i for i, tier_results in enumerate(company_branches) if tier_results),
+                    branch_count - 1
+                )
+                results = company_branches[tier_index]
+                for result in results:
+                    result.fallback_tier = tier_index + 1
+                branch_counts = [len(results) if i == tier_index else 0 for i in range(branch_count)]
+            else:
+                results, branch_counts = HybridRetriever._merge_branch_results(company_branches)
+            if results:
+                results_by_index[index] = results
+            counts.extend(branch_counts)
+        return results_by_index, counts
+
+    @traced("vector.multi_company")
+    def _multi_company_vector_search(
+        self,
+        company_ids: List[int],
+        query_embeddings: List[List[float]],
+        branch_filters: List[Dict[str, Any]],
+        top_k: int,
+        trace: Optional[Dict[str, Any]] = None,
+        first_branch_only: bool = False
+    ) -> Dict[int, List[SearchHit]]:
+        """
+        회사별 × branch별 벡터 검색을 한 번의 SQL로 실행
+
+        unnest(company_ids, query_embeddings)의 각 행에 대해 LATERAL 서브쿼리가
+        branch_filters별 검색(각자 ORDER BY/LIMIT)을 UNION ALL로 수행합니다.
+        모든 branch에 company_id = q.company_id 조건과 회사별 쿼리 벡터가 적용됩니다.
+
+        Args:
+            company_ids: 검색할 company_id 리스트
+            query_embeddings: company_ids와 같은 순서의 쿼리 임베딩
+            branch_filters: 회사마다 검색할 branch 필터 (company_id 제외)
+            top_k: 회사·branch당 반환할 결과 개수
+            trace: 검색 트레이스 (선택적)
+            first_branch_only: True면 회사마다 결과가 있는 첫 branch만 사용 (fallback tier)
+
+        Returns:
+            {company_ids 인덱스: 검색 결과 리스트} (결과가 없는 회사는 키 없음)
+        """
+        kind = "multi_company_fallback" if first_branch_only else "multi_company"
+        company_filters = [
+            {**branch_filter, "company_id": company_id}
+            for company_id in company_ids
+            for branch_filter in branch_filters
+        ]
+
+        if self._use_mmap(company_filters):
+            branch_results, plan = self._mmap_vector_search(
+                [
+                    (embedding, {**branch_filter, "company_id": company_id})
+                    for company_id, embedding in zip(company_ids, query_embeddings)
+                    for branch_filter in branch_filters
+                ],
+                top_k
+            )
+            results_by_index, counts = self._combine_company_branches(
+                branch_results, len(branch_filters), first_branch_only
+            )
+            self._record_vector_search(trace, kind, plan, top_k, counts)
+            return results_by_index
+
+        # HNSW는 company_id 조건을 인덱스 탐색 후에 적용하므로,
+        # 회사·branch별 선택도에 맞춰 ef_search 결정 (작은 파티션은 exact scan)
+        plan = self.ef_search_policy.plan(company_filters, self._candidate_k(top_k))
+
+        # 회사별 벡터는 text[]로 전달 후 LATERAL 안에서 vector로 캐스팅
+        embedding_literals = [self._vector_literal(embedding) for embedding in query_embeddings]
+
+        # branch별 exact scan 여부가 회사마다 다르면 두 가지 SQL을 회사별 플래그(q.exact_N)로
+        # 선택 (외부 행 값만 참조하는 조건이라 회사마다 한쪽만 실행됨)
+        unnest_args = [company_ids, embedding_literals]
+        unnest_columns = ["company_id", "query_embedding"]
+        lateral_parts = []
+        lateral_params: List[Any] = []
+        for branch, branch_filter in enumerate(branch_filters):
+            exact_flags = [
+                plan["branches"][index * len(branch_filters) + branch]["exact_scan"]
+                for index in range(len(company_ids))
+            ]
+            if all(exact_flags) or not any(exact_flags):
+                variants = [(exact_flags[0], ())]
+            else:
+                unnest_args.append(exact_flags)
+                unnest_columns.append(f"exact_{branch}")
+                variants = [(True, (f"q.exact_{branch}",)), (False, (f"NOT q.exact_{branch}",))]
+
+            for exact_scan, gate in variants:
+                sql, params = self._build_vector_search_sql(
+                    None, branch_filter, top_k, branch=branch,
+                    query_sql="q.query_embedding::vector",
+                    extra_conditions=gate + ("ce.company_id = q.company_id",),
+                    exact_scan=exact_scan
+                )
+                lateral_parts.append(f"({sql})")
+                lateral_params.extend(params)
+        lateral_sql = "\nUNION ALL\n".join(lateral_parts)
+        unnest_types = ["int[]", "text[]"] + ["boolean[]"] * (len(unnest_args) - 2)
+        unnest_sql = ", ".join(f"%s::{array_type}" for array_type in unnest_types)
+
+        candidates_sql = f"""
+            SELECT
+                q.ord,
+                c.clause_id,
+                c.similarity,
+                c.clause_type,
+                c.doc_type,
+                c.product_id,
+                c.keyword_mask,
+                c.branch
+            FROM unnest({unnest_sql}) WITH ORDINALITY AS q({", ".join(unnest_columns)}, ord)
+            CROSS JOIN LATERAL ({lateral_sql}) AS c
+        """
+        if first_branch_only:
+            # 회사마다 결과가 있는 가장 구체적인 tier만
+            query = f"""
+                SELECT ord, clause_id, similarity, clause_type, doc_type, product_id, keyword_mask, branch
+                FROM (
+                    SELECT *, MIN(branch) OVER (PARTITION BY ord) AS first_branch
+                    FROM ({candidates_sql}) AS candidates
+                ) AS tiers
+                WHERE branch = first_branch
+                ORDER BY ord, similarity DESC
+            """
+        else:
+            # 회사마다 clause_id 중복 제거 (앞 branch 우선), branch → similarity 순
+            query = f"""
+                SELECT * FROM (
+                    SELECT DISTINCT ON (ord, clause_id) *
+                    FROM ({candidates_sql}) AS candidates
+                    ORDER BY ord, clause_id, branch
+                ) AS merged
+                ORDER BY ord, branch, similarity DESC
+            """
+
+        results_by_index: Dict[int, List[SearchHit]] = {}
+        counts = [0] * len(company_filters)
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            self.ef_search_policy.apply(cur, plan)
+            cur.execute(query, unnest_args + lateral_params)
+
+            for row in cur.fetchall():
+                # ord는 1부터 시작
+                index, branch = row[0] - 1, row[7]
+                result = self._row_to_result(row[1:])
+                if first_branch_only:
+                    result.fallback_tier = branch + 1
+                results_by_index.setdefault(index, []).append(result)
+                counts[index * len(branch_filters) + branch] += 1
+
+        self._record_vector_search(trace, kind, plan, top_k, counts)
+        return results_by_index
+
+    @staticmethod
+    def _vector_literal(embedding: List[float]) -> str:
+        """임베딩 → pgvector 텍스트 표현 ('[0.1,0.2,...]', %s::vector 파라미터로 사용 가능)"""
+        return "[" + ",".join(str(value) for value in embedding) + "]"
+
+    @staticmethod
+    def _multi_company_intent_query(query: str, coverage_name: Optional[str]) -> str:
+        """
+        회사별 비교 검색의 엔티티/의도 판단 쿼리
+
+        담보명만 쓰면 질의의 금액/성별/나이 조건과 부스팅 키워드가 빠지므로
+        전체 질의를 사용하고, 질의에 없는 담보명은 덧붙입니다.
+        """
+        query = (query or "").strip()
+        if coverage_name and coverage_name not in query:
+            return f"{query} {coverage_name}".strip()
+        return query or coverage_name or ""
+
+    @staticmethod
+    def _build_company_query(company_name: str, coverage_name: Optional[str]) -> str:
+        """회사별 검색 쿼리 문자열 생성 (예: "삼성 암진단")"""
+        return f"{company_name} {coverage_name}"
+
+    def _get_company_ids_by_names(self, company_names: List[str]) -> Dict[str, int]:
+        """
+        회사명 리스트로 company_id 일괄 조회 (부분 매칭)
+
+        Args:
+            company_names: 회사명 리스트 (예: ["삼성", "DB손보"])
+
+        Returns:
+            {회사명: company_id} (매칭되지 않은 회사는 제외)
+        """
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(COMPANY_IDS_BY_NAMES_SQL, (list(company_names),))
+            return {name: company_id for name, company_id in cur.fetchall() if company_id}
 
     def close(self):
         """리소스 정리"""
-        if self.pg_conn:
-            self.pg_conn.close()
+        # 연결은 공유 풀 소유 (close_all_pools()로 정리)
         if self.nl_mapper:
             self.nl_mapper.close()
 
@@ -649,7 +2057,7 @@ def hybrid_search(
     query: str,
     top_k: int = 10,
     postgres_url: str = None
-) -> List[Dict[str, Any]]:
+) -> List[SearchHit]:
     """
     하이브리드 검색 (원샷 함수)
 
@@ -21,6 +21,7 @@ import requests
 import json
 from typing import Dict, Any, Optional, Iterator
 from dotenv import load_dotenv
+from retrieval.tracing import span
 
 load_dotenv()
 
@@ -62,7 +63,8 @@ class LLMClient:
         system_prompt: str = None,
         temperature: float = 0.1,
         max_tokens: int = 2000,
-        stream: bool = False
+        stream: bool = False,
+        trace: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         LLM 응답 생성
@@ -73,25 +75,31 @@ class LLMClient:
             temperature: 온도 (0.0 ~ 1.0)
             max_tokens: 최대 토큰 수
             stream: 스트리밍 여부
+            trace: 검색 트레이스 (선택적, retrieval.tracing 참고)
 
         Returns:
             LLM 응답 텍스트
         """
-        if self.backend == "ollama":
-            return self._generate_ollama(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                stream=stream
-            )
-        elif self.backend == "openai":
-            return self._generate_openai(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
+        with span(trace, "llm.generate", backend=self.backend, model=self.model,
+                  prompt_chars=len(prompt)) as stage:
+            answer = None
+            if self.backend == "ollama":
+                answer = self._generate_ollama(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=stream
+                )
+            elif self.backend == "openai":
+                answer = self._generate_openai(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+            stage["answer_chars"] = len(answer or "")
+            return answer
 
     def _generate_ollama(
         self,
@@ -0,0 +1,251 @@
+"""
+검색 결과 캐시
+
+HybridRetriever.search()의 결과(엔티티 추출 + 임베딩 + 벡터/lexical SQL + 재순위화)를
+캐시합니다. 템플릿 질문, ProductComparer fallback 등 같은 검색이 반복될 때
+전체 파이프라인을 건너뜁니다.
+
+- L1: 프로세스 내 LRU (OrderedDict) + TTL
+- L2 (선택): Redis 호환 공유 저장소 (다중 워커 간 공유, SEARCH_CACHE_REDIS_URL)
+
+캐시 키는 (정규화된 쿼리, 필터, top_k, 코퍼스 버전, 검색 설정 시그니처)의 해시입니다.
+수집/임베딩 스크립트가 코퍼스 버전(utils/corpus_version.py)을 올리면 키가 바뀌므로
+이전 데이터로 만든 결과는 조회되지 않고, 남은 항목은 TTL/LRU로 정리됩니다.
+
+L1 항목은 읽기 전용 스냅샷(MappingProxyType 튜플)으로 저장해 히트마다 복사하지 않습니다.
+호출자는 스냅샷에서 새 객체를 만들어 사용합니다 (SearchHit.from_dict).
+
+설정 (환경 변수):
+    SEARCH_CACHE              0이면 비활성화 (기본: 1)
+    SEARCH_CACHE_TTL          항목 유효 시간 초 (기본: 600)
+    SEARCH_CACHE_MAX_ENTRIES  L1 최대 항목 수 (기본: 2048)
+    SEARCH_CACHE_REDIS_URL    L2 Redis URL (예: redis://localhost:6379/0, 기본: 미사용)
+
+Usage:
+    from retrieval.search_cache import SearchResultCache
+
+    cache = SearchResultCache()
+    key = cache.make_key(query, top_k, filters, corpus_version, signature)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        results = run_search(...)
+        cache.put(key, results, compute_ms=elapsed_ms)
+    else:
+        results = [SearchHit.from_dict(result) for result in snapshot]
+    print(cache.stats())  # hit_rate, saved_ms
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
+
+from vector_index.embedding_cache import normalize_query
+
+try:
+    import redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+
+# Redis 키 접두사 (캐시 항목 형식이 바뀌면 올림)
+REDIS_KEY_PREFIX = "insurance:search:v1:"
+
+
+def _freeze(value: Any) -> Any:
+    """캐시 스냅샷용 읽기 전용 변환 (dict → MappingProxyType, list → tuple)"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class SearchResultCache:
+    """검색 결과 2단계 캐시 (LRU + TTL, 선택적 Redis)"""
+
+    def __init__(
+        self,
+        ttl: float = None,
+        max_entries: int = None,
+        redis_url: str = None
+    ):
+        """
+        Args:
+            ttl: 항목 유효 시간 초 (기본: SEARCH_CACHE_TTL 또는 600)
+            max_entries: L1 최대 항목 수 (기본: SEARCH_CACHE_MAX_ENTRIES 또는 2048)
+            redis_url: L2 Redis URL (None이면 SEARCH_CACHE_REDIS_URL, "" 이면 L2 비활성화)
+        """
+        self.ttl = ttl or float(os.getenv("SEARCH_CACHE_TTL", "600"))
+        self.max_entries = max_entries or int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "2048"))
+        if redis_url is None:
+            redis_url = os.getenv("SEARCH_CACHE_REDIS_URL", "")
+
+        self._lock = threading.Lock()
+        # key -> (만료 시각, 결과 스냅샷, 원래 검색 소요 ms)
+        self._memory: "OrderedDict[str, Tuple[float, Tuple[Mapping, ...], float]]" = OrderedDict()
+
+        self._counters = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "puts": 0,
+            "evictions": 0,
+            "expired": 0,
+            "redis_errors": 0,
+            "saved_ms": 0.0,
+        }
+
+        self._redis = None
+        if redis_url:
+            if not HAS_REDIS:
+                raise ImportError(
+                    "SEARCH_CACHE_REDIS_URL requires the redis package. Install: pip install redis"
+                )
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+
+    @staticmethod
+    def make_key(
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        corpus_version: int,
+        signature: Dict[str, Any]
+    ) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            query: 사용자 질의 (NFC + 공백 정규화)
+            top_k: 반환할 결과 개수
+            filters: 호출자가 전달한 필터 (엔티티 추출로 병합되기 전)
+            corpus_version: 코퍼스 버전
+            signature: 결과에 영향을 주는 검색 설정 (백엔드, 양자화, 임베딩 모델 등)
+
+        Returns:
+            SHA-256 hex 키
+        """
+        payload = json.dumps(
+            {
+                "q": normalize_query(query),
+                "k": top_k,
+                "f": filters or {},
+                "v": corpus_version,
+                "s": signature,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Mapping, ...]]:
+        """
+        캐시 조회 (L1 → L2 순서)
+
+        Returns:
+            결과 스냅샷 (읽기 전용 Mapping 튜플, 복사 없이 공유) 또는 None (미스)
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, results, compute_ms = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    self._counters["saved_ms"] += compute_ms
+                    return results
+                del self._memory[key]
+                self._counters["expired"] += 1
+
+        if self._redis is not None:
+            payload = self._redis_get(key)
+            if payload is not None:
+                results, compute_ms = _freeze(payload["results"]), payload["compute_ms"]
+                with self._lock:
+                    self._remember(key, results, compute_ms, now)
+                    self._counters["redis_hits"] += 1
+                    self._counters["saved_ms"] += compute_ms
+                return results
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def put(self, key: str, results: List[Dict[str, Any]], compute_ms: float = 0.0):
+        """
+        캐시 저장 (L1 + L2)
+
+        Args:
+            key: make_key()로 만든 키
+            results: 검색 결과 (SearchHit 또는 dict, 읽기 전용 스냅샷으로 저장)
+            compute_ms: 캐시 없이 검색하는 데 걸린 시간 (히트 시 saved_ms에 누적)
+        """
+        results = [dict(result) for result in results]
+        snapshot = _freeze(results)
+
+        with self._lock:
+            self._remember(key, snapshot, compute_ms, time.time())
+            self._counters["puts"] += 1
+
+        if self._redis is not None:
+            payload = json.dumps(
+                {"results": results, "compute_ms": compute_ms},
+                ensure_ascii=False,
+                default=str
+            )
+            try:
+                self._redis.setex(REDIS_KEY_PREFIX + key, int(self.ttl), payload)
+            except redis.RedisError:
+                with self._lock:
+                    self._counters["redis_errors"] += 1
+
+    def record_bypass(self):
+        """캐시를 사용할 수 없는 검색 기록 (코퍼스 버전 없음 등)"""
+        with self._lock:
+            self._counters["bypassed"] += 1
+
+    def _remember(self, key: str, results: Tuple[Mapping, ...], compute_ms: float, now: float):
+        """L1 LRU 저장 (lock 보유 상태에서 호출)"""
+        self._memory[key] = (now + self.ttl, results, compute_ms)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """L2 조회 (Redis 장애 시 미스로 처리)"""
+        try:
+            raw = self._redis.get(REDIS_KEY_PREFIX + key)
+        except redis.RedisError:
+            with self._lock:
+                self._counters["redis_errors"] += 1
+            return None
+        return json.loads(raw) if raw else None
+
+    def stats(self) -> Dict[str, Any]:
+        """히트율/절약 시간 통계 반환"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters["memory_entries"] = len(self._memory)
+
+        hits = counters["memory_hits"] + counters["redis_hits"]
+        lookups = hits + counters["misses"]
+        counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        counters["saved_ms"] = round(counters["saved_ms"], 1)
+        counters["redis"] = self._redis is not None
+        return counters
+
+    def clear(self):
+        """L1 캐시 삭제 (L2는 TTL로 만료)"""
+        with self._lock:
+            self._memory.clear()
@@ -0,0 +1,185 @@
+"""
+검색 결과 1건 (SearchHit)
+
+HybridRetriever → ContextAssembler → API/ProductComparer로 전달되는 검색 결과를
+행마다 dict로 만들지 않고 __slots__ 객체에 저장합니다.
+
+- 점수/식별 필드는 슬롯 (인스턴스 __dict__ 없음, 재순위화 정렬은 attrgetter)
+- ContextAssembler가 조회한 조항/문서 메타데이터는 복사하지 않고 참조만 연결
+  (기존 {**result, **metadata} 복사 제거, 같은 키는 메타데이터 값이 우선)
+- MutableMapping이므로 hit["clause_text"], hit.get("company_name"), dict(hit) 등
+  기존 dict 코드가 그대로 동작하고, API 응답/캐시 직렬화는 to_dict()로 평범한 dict를 만듭니다.
+
+조회 순서: 슬롯 필드 → 추가 필드(_extra) → 연결된 메타데이터(_metadata).
+값을 할당하지 않은 슬롯은 키가 없는 것으로 취급합니다 (dict와 같은 in/get 동작).
+
+Usage:
+    from retrieval.search_hit import SearchHit
+
+    hit = SearchHit(clause_id=1, similarity=0.83, doc_type="terms")
+    hit.final_score = hit.similarity + 0.15
+    hit["clause_text"] = "..."
+    hit.attach_metadata(metadata_map[hit.clause_id])   # 참조만 저장
+    hit.get("company_name")
+    hit.to_dict()                                        # JSON 직렬화용 dict
+"""
+
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Any, Iterator, Optional
+
+
+_MISSING = object()
+
+
+class SearchHit(MutableMapping):
+    """검색 결과 1건 (슬롯 필드 + 메타데이터 참조, dict 호환)"""
+
+    # 검색/재순위화/컨텍스트 조립 단계에서 채우는 필드 (키 순서 = to_dict 순서)
+    FIELDS = (
+        "clause_id", "clause_text", "similarity", "clause_type", "doc_type", "product_id",
+        "keyword_mask", "lexical_score", "vector_rank", "lexical_rank", "rrf_score",
+        "fallback_tier", "keyword_boost", "final_score",
+        "doc_type_weight", "weighted_score", "coverages",
+    )
+    _FIELD_SET = frozenset(FIELDS)
+
+    __slots__ = FIELDS + ("_extra", "_metadata")
+
+    def __init__(
+        self,
+        clause_id: int = None,
+        similarity: float = None,
+        clause_type: str = None,
+        doc_type: str = None,
+        product_id: int = None,
+        keyword_mask: int = None,
+        **fields
+    ):
+        """
+        Args:
+            clause_id ~ keyword_mask: 후보 SQL 행의 공통 컬럼 (항상 키로 존재)
+            **fields: 그 밖의 필드 (슬롯 필드가 아니면 추가 필드로 저장)
+        """
+        self.clause_id = clause_id
+        self.similarity = similarity
+        self.clause_type = clause_type
+        self.doc_type = doc_type
+        self.product_id = product_id
+        self.keyword_mask = keyword_mask
+        self._extra: Optional[Dict[str, Any]] = None
+        self._metadata: Optional[Mapping] = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "SearchHit":
+        """dict(캐시 항목 등)에서 생성"""
+        hit = cls.__new__(cls)
+        hit._extra = None
+        hit._metadata = None
+        for key, value in data.items():
+            hit[key] = value
+        return hit
+
+    @classmethod
+    def coerce(cls, result: Mapping) -> "SearchHit":
+        """SearchHit이면 그대로, dict면 SearchHit으로 변환"""
+        return result if isinstance(result, cls) else cls.from_dict(result)
+
+    def attach_metadata(self, metadata: Mapping):
+        """
+        조항/문서 메타데이터 연결 (복사하지 않고 참조 저장)
+
+        기존 {**result, **metadata}와 같이 겹치는 키는 메타데이터 값이 우선합니다.
+
+        Args:
+            metadata: clause_id별 메타데이터 (여러 SearchHit이 공유해도 됨, 수정하지 않음)
+        """
+        self._metadata = metadata
+        for key in self._FIELD_SET.intersection(metadata):
+            setattr(self, key, metadata[key])
+        if self._extra:
+            for key in metadata:
+                self._extra.pop(key, None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """평범한 dict로 변환 (API 응답, 캐시 직렬화용)"""
+        return dict(self.items())
+
+    def copy(self) -> "SearchHit":
+        """얕은 복사 (메타데이터는 같은 참조 유지)"""
+        hit = SearchHit.from_dict({
+            key: getattr(self, key) for key in self.FIELDS if hasattr(self, key)
+        })
+        if self._extra:
+            hit._extra = dict(self._extra)
+        hit._metadata = self._metadata
+        return hit
+
+    # --- Mapping 인터페이스 ---
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+            raise KeyError(key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        if self._metadata is not None and key in self._metadata:
+            return self._metadata[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in self._FIELD_SET:
+            if not hasattr(self, key):
+                raise KeyError(key)
+            delattr(self, key)
+            return
+        if self._extra is not None and key in self._extra:
+            del self._extra[key]
+            return
+        if self._metadata is not None and key in self._metadata:
+            # 공유 메타데이터는 수정하지 않고, 이 결과만 사본으로 분리
+            self._metadata = {k: v for k, v in self._metadata.items() if k != key}
+            return
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._FIELD_SET:
+            return hasattr(self, key)
+        return (
+            (self._extra is not None and key in self._extra)
+            or (self._metadata is not None and key in self._metadata)
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+        if self._metadata:
+            for key in self._metadata:
+                if key not in self._FIELD_SET and not (self._extra and key in self._extra):
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"SearchHit({self.to_dict()!r})"
@@ -0,0 +1,233 @@
+"""
+검색 트레이스 (단계별 지연 시간 계측)
+
+/api/hybrid-search 한 번의 지연 시간이 엔티티 추출, 쿼리 임베딩, 벡터/lexical SQL,
+재순위화, 컨텍스트 조립, LLM 생성 중 어디서 나왔는지 보기 위한 경량 span입니다.
+
+- 요청별: SearchTrace를 trace 인자로 넘기면 trace["spans"]에 단계별 시작 시각/소요 시간/
+  반환 행 수가 쌓입니다. HybridRetriever가 기록하는 vector_searches(ef_search, 충족률),
+  lexical_searches, search_cache, fallback_tier와 같은 dict이므로 API 응답에 그대로 직렬화됩니다.
+- 프로세스 전역: 모든 span과 카운터(ef_search 값, exact scan, fallback tier)는 trace 여부와
+  관계없이 SEARCH_METRICS에 집계됩니다 (/health의 search_metrics).
+
+설정 (환경 변수):
+    SEARCH_METRICS_WINDOW  단계별 p50/p95 계산에 쓰는 최근 샘플 수 (기본: 512)
+
+Usage:
+    from retrieval.tracing import SearchTrace, span, traced, SEARCH_METRICS
+
+    trace = SearchTrace()
+    results = retriever.search("삼성화재 암 진단금", top_k=5, trace=trace)
+    trace.finish()
+    print(trace["stages"])        # {"search": 412.3, "search.embed": 180.1, ...}
+    print(SEARCH_METRICS.stats())  # 단계별 count/avg/p50/p95/max, 카운터
+
+    # 단계 계측 (trace가 None이면 집계만)
+    with span(trace, "search.embed") as stage:
+        embedding = embedder.embed_query(query)
+
+    # trace 인자를 받는 메서드 계측 (반환값이 리스트면 rows 기록)
+    @traced("vector.filtered")
+    def _filtered_vector_search(self, ..., trace=None): ...
+"""
+
+import os
+import time
+import inspect
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Callable, Iterator
+
+
+def count_rows(result: Any) -> Optional[int]:
+    """
+    span의 rows 값 계산 (검색 결과 리스트 또는 {키: 결과 리스트})
+
+    Returns:
+        행 수 (그 외 타입이면 None → 기록하지 않음)
+    """
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict) and all(isinstance(value, list) for value in result.values()):
+        return sum(len(value) for value in result.values())
+    return None
+
+
+class SearchMetrics:
+    """단계별 지연 시간/카운터 프로세스 전역 집계 (스레드 안전)"""
+
+    def __init__(self, window: int = None):
+        """
+        Args:
+            window: 단계별 백분위 계산용 최근 샘플 수 (기본: SEARCH_METRICS_WINDOW 또는 512)
+        """
+        self.window = window or int(os.getenv("SEARCH_METRICS_WINDOW", "512"))
+        self._lock = threading.Lock()
+        # 단계명 -> {count, errors, total_ms, max_ms, rows}
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._samples: Dict[str, deque] = {}
+        self._counters: Dict[str, int] = {}
+
+    def observe(self, stage: str, elapsed_ms: float, rows: Optional[int] = None, error: bool = False):
+        """
+        단계 1회 기록
+
+        Args:
+            stage: 단계명 (예: search.embed)
+            elapsed_ms: 소요 시간 (ms)
+            rows: 반환 행 수 (선택)
+            error: 예외로 종료되었는지 여부
+        """
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+                self._stages[stage] = entry
+                self._samples[stage] = deque(maxlen=self.window)
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            if rows:
+                entry["rows"] += rows
+            if error:
+                entry["errors"] += 1
+            self._samples[stage].append(elapsed_ms)
+
+    def increment(self, name: str, amount: int = 1):
+        """카운터 증가 (예: ef_search.200, fallback_tier.3)"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def stats(self) -> Dict[str, Any]:
+        """단계별 count/avg/p50/p95/max(ms), 평균 행 수와 카운터 반환"""
+        with self._lock:
+            stages = {name: dict(entry) for name, entry in self._stages.items()}
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+            counters = dict(self._counters)
+
+        for name, entry in stages.items():
+            values = samples[name]
+            count = entry["count"]
+            entry["avg_ms"] = round(entry.pop("total_ms") / count, 2)
+            entry["p50_ms"] = round(self._percentile(values, 0.50), 2)
+            entry["p95_ms"] = round(self._percentile(values, 0.95), 2)
+            entry["max_ms"] = round(entry["max_ms"], 2)
+            entry["avg_rows"] = round(entry.pop("rows") / count, 2)
+
+        return {"stages": stages, "counters": counters}
+
+    @staticmethod
+    def _percentile(sorted_values: list, q: float) -> float:
+        """정렬된 샘플의 백분위 (nearest-rank)"""
+        if not sorted_values:
+            return 0.0
+        return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+    def reset(self):
+        """집계 초기화"""
+        with self._lock:
+            self._stages.clear()
+            self._samples.clear()
+            self._counters.clear()
+
+
+# 프로세스 전역 집계
+SEARCH_METRICS = SearchMetrics()
+
+
+class SearchTrace(dict):
+    """
+    요청 1건의 검색 트레이스
+
+    dict 하위 클래스이므로 기존 trace 기록(trace.setdefault(...))과 JSON 직렬화를 그대로 사용합니다.
+    span의 start_ms는 트레이스 생성 시점 기준입니다 (asyncio 동시 실행 단계는 구간이 겹침).
+    """
+
+    def __init__(self):
+        super().__init__(spans=[])
+        self.origin = time.perf_counter()
+
+    def finish(self) -> "SearchTrace":
+        """전체 소요 시간(total_ms)과 단계별 소요 시간 합계(stages) 기록"""
+        stages: Dict[str, float] = {}
+        for stage in self["spans"]:
+            stages[stage["name"]] = round(stages.get(stage["name"], 0.0) + stage["ms"], 2)
+        self["stages"] = stages
+        self["total_ms"] = round((time.perf_counter() - self.origin) * 1000, 2)
+        return self
+
+
+@contextmanager
+def span(trace: Optional[Dict[str, Any]], name: str, **attrs) -> Iterator[Dict[str, Any]]:
+    """
+    단계 계측
+
+    블록 안에서 yield된 dict에 rows 등 속성을 추가할 수 있습니다.
+    소요 시간은 항상 SEARCH_METRICS에 집계되고, trace가 주어지면 trace["spans"]에도 기록됩니다.
+
+    Args:
+        trace: 검색 트레이스 (None이면 집계만)
+        name: 단계명 (예: search.entities)
+        **attrs: span에 함께 기록할 속성
+    """
+    stage: Dict[str, Any] = dict(attrs)
+    start = time.perf_counter()
+    error = False
+    try:
+        yield stage
+    except BaseException as e:
+        error = True
+        stage["error"] = type(e).__name__
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        SEARCH_METRICS.observe(name, elapsed_ms, stage.get("rows"), error=error)
+
+        if trace is not None:
+            record: Dict[str, Any] = {"name": name}
+            origin = getattr(trace, "origin", None)
+            if origin is not None:
+                record["start_ms"] = round((start - origin) * 1000, 2)
+            record["ms"] = round(elapsed_ms, 2)
+            record.update(stage)
+            trace.setdefault("spans", []).append(record)
+
+
+def traced(name: str, rows: Optional[Callable[[Any], Optional[int]]] = count_rows):
+    """
+    trace 인자를 받는 메서드/코루틴 계측 데코레이터
+
+    Args:
+        name: 단계명
+        rows: 반환값 → 행 수 함수 (None이면 기록하지 않음)
+    """
+    def decorator(func):
+        trace_index = list(inspect.signature(func).parameters).index("trace")
+
+        def find_trace(args, kwargs) -> Optional[Dict[str, Any]]:
+            if "trace" in kwargs:
+                return kwargs["trace"]
+            return args[trace_index] if len(args) > trace_index else None
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(find_trace(args, kwargs), name) as stage:
+                    result = await func(*args, **kwargs)
+                    if rows is not None:
+                        stage["rows"] = rows(result)
+                    return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(find_trace(args, kwargs), name) as stage:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    stage["rows"] = rows(result)
+                return result
+        return wrapper
+
+    return decorator
@@ -0,0 +1,144 @@
+"""
+PostgreSQL Async Connection Pool
+
+AsyncHybridRetriever, AsyncNLMapper, AsyncContextAssembler 등이 공유하는
+asyncio 연결 풀입니다 (psycopg 3 + psycopg_pool). FastAPI 이벤트 루프에서
+DB 대기 중에도 다른 요청을 처리할 수 있습니다.
+
+연결은 클라이언트 측 파라미터 바인딩(AsyncClientCursor)을 사용하므로
+psycopg2용으로 작성한 SQL(%s 플레이스홀더, SET LOCAL ... = %s)을 그대로 실행할 수 있습니다.
+
+설정 (환경 변수, utils/db_pool.py와 공용):
+    PG_POOL_MIN      최소 연결 수 (기본: 1)
+    PG_POOL_MAX      최대 연결 수 (기본: 10)
+    PG_POOL_TIMEOUT  연결 대기 타임아웃 초 (기본: 30)
+
+Usage:
+    from utils.async_db_pool import get_async_pool
+
+    pool = get_async_pool(postgres_url)
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute("SELECT 1")
+        row = await cur.fetchone()
+
+    await close_all_async_pools()  # 서버 종료 시
+"""
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator
+
+try:
+    from psycopg import AsyncClientCursor
+    from psycopg_pool import AsyncConnectionPool as _AsyncConnectionPool
+    HAS_PSYCOPG3 = True
+except ImportError:
+    HAS_PSYCOPG3 = False
+
+
+class AsyncConnectionPool:
+    """asyncio 연결 풀 (첫 사용 시 열림)"""
+
+    def __init__(
+        self,
+        postgres_url: str,
+        minconn: int = None,
+        maxconn: int = None,
+        timeout: float = None
+    ):
+        """
+        Args:
+            postgres_url: PostgreSQL 연결 문자열
+            minconn: 최소 연결 수 (기본: PG_POOL_MIN 또는 1)
+            maxconn: 최대 연결 수 (기본: PG_POOL_MAX 또는 10)
+            timeout: 연결 대기 타임아웃 초 (기본: PG_POOL_TIMEOUT 또는 30)
+        """
+        if not HAS_PSYCOPG3:
+            raise ImportError(
+                "Async retrieval requires psycopg 3. Install: pip install 'psycopg[binary]' psycopg-pool"
+            )
+
+        self.postgres_url = postgres_url
+        self.minconn = minconn or int(os.getenv("PG_POOL_MIN", "1"))
+        self.maxconn = maxconn or int(os.getenv("PG_POOL_MAX", "10"))
+        self.timeout = timeout or float(os.getenv("PG_POOL_TIMEOUT", "30"))
+
+        # 이벤트 루프 밖(모듈 import, 서버 startup 이전)에서도 생성할 수 있도록 open=False
+        self._pool = _AsyncConnectionPool(
+            postgres_url,
+            min_size=self.minconn,
+            max_size=self.maxconn,
+            timeout=self.timeout,
+            kwargs={"cursor_factory": AsyncClientCursor},
+            open=False
+        )
+        self._opened = False
+        self._open_lock = None
+
+    async def open(self):
+        """풀 열기 (여러 번 호출해도 안전)"""
+        if self._opened:
+            return
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+        async with self._open_lock:
+            if not self._opened:
+                await self._pool.open()
+                self._opened = True
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        """
+        연결 대여 (async context manager)
+
+        블록이 정상 종료되면 트랜잭션은 커밋, 예외 시 롤백됩니다 (psycopg_pool 동작).
+        SET LOCAL 설정은 트랜잭션 종료와 함께 원복됩니다.
+        """
+        if not self._opened:
+            await self.open()
+        async with self._pool.connection() as conn:
+            yield conn
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 메트릭 반환 (psycopg_pool 통계: 대기 요청 수, 대기 시간 등)"""
+        stats = dict(self._pool.get_stats()) if self._opened else {}
+        stats["min_size"] = self.minconn
+        stats["max_size"] = self.maxconn
+        return stats
+
+    async def close(self):
+        """모든 연결 종료"""
+        if self._opened:
+            await self._pool.close()
+            self._opened = False
+
+
+# 프로세스 전역 풀 (postgres_url별 1개)
+_async_pools: Dict[str, AsyncConnectionPool] = {}
+
+
+def get_async_pool(postgres_url: str = None) -> AsyncConnectionPool:
+    """
+    postgres_url에 대한 공유 async 연결 풀 반환 (없으면 생성, 첫 사용 시 열림)
+
+    Args:
+        postgres_url: PostgreSQL 연결 문자열 (기본: POSTGRES_URL)
+    """
+    postgres_url = postgres_url or os.getenv("POSTGRES_URL")
+    if not postgres_url:
+        raise ValueError("POSTGRES_URL environment variable is required. Check .env file.")
+
+    pool = _async_pools.get(postgres_url)
+    if pool is None:
+        pool = AsyncConnectionPool(postgres_url)
+        _async_pools[postgres_url] = pool
+    return pool
+
+
+async def close_all_async_pools():
+    """모든 공유 async 풀 종료 (서버 종료 시)"""
+    pools = list(_async_pools.values())
+    _async_pools.clear()
+    for pool in pools:
+        await pool.close()
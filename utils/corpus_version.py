@@ -0,0 +1,395 @@
+"""
+Corpus Version
+
+검색 대상 데이터(document_clause, clause_embedding, coverage 등)가 바뀔 때마다
+1씩 증가하는 버전 카운터입니다 (corpus_version 테이블, 마이그레이션 a7d2e5c90f13).
+
+검색 결과 캐시(retrieval/search_cache.py)는 이 버전을 캐시 키에 포함하므로,
+수집/임베딩 스크립트가 종료 시 버전을 올리면 이전 데이터로 만든 결과는
+더 이상 조회되지 않습니다.
+
+버전을 올리는 트랜잭션은 corpus_version 채널로 NOTIFY({"version", "reason"})도 보냅니다
+(커밋 시 전달). API 서버 같은 장기 실행 프로세스는 CorpusVersionListener로 구독해
+엔티티 카탈로그 등 메모리 캐시를 백그라운드에서 다시 만들고 교체합니다 (재시작 불필요).
+
+검색 경로는 CorpusVersionCache로 버전을 읽습니다. 리스너가 연결된 프로세스(API 서버)만
+TTL 동안 버전을 재사용하고 NOTIFY 콜백으로 즉시 갱신합니다. 리스너가 없는 프로세스
+(api/cli.py, api/compare.py, CATALOG_HOT_RELOAD=0 서버)는 변경을 알 방법이 없으므로 매번 조회합니다.
+
+설정 (환경 변수):
+    CORPUS_VERSION_TTL              리스너 연결 시 버전 캐시 유효 시간 초 (기본: 5, 0이면 매번 조회)
+    CORPUS_LISTEN_RETRY_SECONDS     LISTEN 재연결 / 실패한 콜백 재시도 대기 초 (기본: 5)
+    CORPUS_LISTEN_DEBOUNCE_SECONDS  마지막 알림 후 이 시간 동안 알림이 없으면 콜백 실행 (기본: 2)
+
+Usage:
+    from utils.corpus_version import bump_corpus_version, get_corpus_version
+
+    # 수집/임베딩 스크립트 (쓰기 완료 후)
+    bump_corpus_version(pg_conn, "build_index")
+
+    # 검색 경로 (공유 풀, TTL 캐시)
+    version_cache = get_corpus_version_cache(postgres_url)
+    version = version_cache.get(pool)  # 테이블이 없으면 None
+    version = await version_cache.get_async(async_pool)  # AsyncHybridRetriever
+
+    # 장기 실행 프로세스 (버전 변경 시 콜백, 백그라운드 스레드)
+    listener = CorpusVersionListener(postgres_url)
+    get_corpus_version_cache(postgres_url).attach(listener)  # 카탈로그 재로드보다 먼저 갱신
+    listener.add_callback(lambda version, reason: refresh_catalog(postgres_url))
+    listener.start()
+"""
+
+import os
+import json
+import time
+import select
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psycopg2
+from psycopg2 import errors as pg_errors
+
+logger = logging.getLogger(__name__)
+
+# undefined_table (마이그레이션 미적용)
+UNDEFINED_TABLE_SQLSTATE = "42P01"
+
+# 버전 변경 NOTIFY 채널
+CORPUS_VERSION_CHANNEL = "corpus_version"
+
+
+def get_corpus_version(pool) -> Optional[int]:
+    """
+    현재 코퍼스 버전 조회
+
+    Args:
+        pool: utils.db_pool.ConnectionPool
+
+    Returns:
+        버전 번호 (corpus_version 테이블이 없으면 None → 호출자는 캐시를 사용하지 않음)
+    """
+    with pool.connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute("SELECT version FROM corpus_version WHERE id = 1")
+        except pg_errors.UndefinedTable:
+            return None
+        row = cur.fetchone()
+        return row[0] if row else None
+
+
+async def get_corpus_version_async(pool) -> Optional[int]:
+    """
+    현재 코퍼스 버전 조회 (asyncio 버전)
+
+    Args:
+        pool: utils.async_db_pool.AsyncConnectionPool
+
+    Returns:
+        버전 번호 (corpus_version 테이블이 없으면 None)
+    """
+    async with pool.connection() as conn, conn.cursor() as cur:
+        try:
+            await cur.execute("SELECT version FROM corpus_version WHERE id = 1")
+        except Exception as e:
+            # psycopg 3 예외는 sqlstate로 판별 (psycopg2 errors 클래스와 다름)
+            if getattr(e, "sqlstate", None) != UNDEFINED_TABLE_SQLSTATE:
+                raise
+            await conn.rollback()
+            return None
+        row = await cur.fetchone()
+        return row[0] if row else None
+
+
+class CorpusVersionCache:
+    """
+    코퍼스 버전 프로세스 내 캐시 (검색 결과 캐시 키용)
+
+    attach()로 CorpusVersionListener를 연결하기 전에는 매번 DB에서 읽고,
+    연결 후에는 ttl_seconds 동안 마지막으로 읽은 버전을 DB 조회 없이 반환합니다.
+    update()는 NOTIFY로 받은 버전을 바로 반영합니다 (버전은 증가만 함).
+    """
+
+    def __init__(self, ttl_seconds: float = None):
+        """
+        Args:
+            ttl_seconds: 리스너 연결 후 캐시 유효 시간 초
+                         (기본: CORPUS_VERSION_TTL 또는 5, 0이면 매번 조회)
+        """
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("CORPUS_VERSION_TTL", "5"))
+        self.listener_ttl_seconds = ttl_seconds
+        # 리스너가 없으면 다른 프로세스의 버전 증가를 알 수 없으므로 TTL 0
+        self.ttl_seconds = 0.0
+        # (버전, 조회 시각) - 튜플 교체라 잠금 없이 읽음
+        self._entry: Optional[Tuple[Optional[int], float]] = None
+
+    def _cached(self) -> Tuple[bool, Optional[int]]:
+        """(TTL 이내 여부, 캐시된 버전)"""
+        entry = self._entry
+        if entry is None or time.monotonic() - entry[1] >= self.ttl_seconds:
+            return False, None
+        return True, entry[0]
+
+    def get(self, pool) -> Optional[int]:
+        """현재 코퍼스 버전 (TTL 이내면 캐시, 아니면 get_corpus_version)"""
+        fresh, version = self._cached()
+        if fresh:
+            return version
+        version = get_corpus_version(pool)
+        self._entry = (version, time.monotonic())
+        return version
+
+    async def get_async(self, pool) -> Optional[int]:
+        """현재 코퍼스 버전 (asyncio 버전, get_corpus_version_async 사용)"""
+        fresh, version = self._cached()
+        if fresh:
+            return version
+        version = await get_corpus_version_async(pool)
+        self._entry = (version, time.monotonic())
+        return version
+
+    def update(self, version: int):
+        """NOTIFY로 받은 버전 반영 (캐시된 버전보다 클 때만)"""
+        entry = self._entry
+        if entry is None or entry[0] is None or version > entry[0]:
+            self._entry = (version, time.monotonic())
+
+    def invalidate(self):
+        """다음 조회 시 DB에서 다시 읽음"""
+        self._entry = None
+
+    def attach(self, listener: "CorpusVersionListener"):
+        """
+        리스너 연결: NOTIFY 콜백으로 버전을 갱신하고 이후 TTL 캐시 사용
+
+        콜백은 등록 순서대로 실행되므로 같은 버전에 맞춰 재로드할 콜백보다
+        먼저 호출합니다.
+
+        Args:
+            listener: CorpusVersionListener (start() 전)
+        """
+        listener.add_callback(lambda version, reason: self.update(version))
+        self.ttl_seconds = self.listener_ttl_seconds
+
+
+# postgres_url별 버전 캐시 (같은 프로세스의 sync/async retriever 공용)
+_version_caches: Dict[str, CorpusVersionCache] = {}
+_version_caches_lock = threading.Lock()
+
+
+def get_corpus_version_cache(postgres_url: str) -> CorpusVersionCache:
+    """
+    postgres_url별 공유 CorpusVersionCache (없으면 생성)
+
+    Args:
+        postgres_url: PostgreSQL 연결 문자열
+
+    Returns:
+        CorpusVersionCache
+    """
+    with _version_caches_lock:
+        cache = _version_caches.get(postgres_url)
+        if cache is None:
+            cache = _version_caches[postgres_url] = CorpusVersionCache()
+        return cache
+
+
+def bump_corpus_version(pg_conn, reason: str) -> Optional[int]:
+    """
+    코퍼스 버전 증가 (커밋 포함)
+
+    수집/임베딩 스크립트가 데이터 쓰기를 커밋한 뒤 호출합니다.
+    같은 트랜잭션에서 CORPUS_VERSION_CHANNEL로 NOTIFY를 보내므로 구독자는 커밋 후 새 버전을 받습니다.
+
+    Args:
+        pg_conn: PostgreSQL 연결 (psycopg2)
+        reason: 버전을 올린 스크립트/작업 이름 (corpus_version.reason에 기록)
+
+    Returns:
+        새 버전 번호 (corpus_version 테이블이 없으면 None)
+    """
+    cur = pg_conn.cursor()
+    try:
+        cur.execute("""
+            INSERT INTO corpus_version (id, version, reason, updated_at)
+            VALUES (1, 1, %s, now())
+            ON CONFLICT (id) DO UPDATE
+            SET version = corpus_version.version + 1,
+                reason = EXCLUDED.reason,
+                updated_at = EXCLUDED.updated_at
+            RETURNING version
+        """, (reason,))
+        version = cur.fetchone()[0]
+        cur.execute(
+            "SELECT pg_notify(%s, %s)",
+            (CORPUS_VERSION_CHANNEL, json.dumps({"version": version, "reason": reason}))
+        )
+        pg_conn.commit()
+    except pg_errors.UndefinedTable:
+        pg_conn.rollback()
+        logger.warning("corpus_version table not found (run alembic upgrade head); search cache is disabled")
+        return None
+    finally:
+        cur.close()
+
+    logger.info(f"Corpus version bumped to {version} ({reason})")
+    return version
+
+
+def bump_corpus_version_url(db_url: str, reason: str) -> Optional[int]:
+    """
+    별도 연결로 코퍼스 버전 증가 (작업마다 연결을 열고 닫는 수집 스크립트용)
+
+    Args:
+        db_url: PostgreSQL 연결 문자열
+        reason: 버전을 올린 스크립트/작업 이름
+
+    Returns:
+        새 버전 번호 (corpus_version 테이블이 없으면 None)
+    """
+    conn = psycopg2.connect(db_url)
+    try:
+        return bump_corpus_version(conn, reason)
+    finally:
+        conn.close()
+
+
+class CorpusVersionListener:
+    """
+    corpus_version NOTIFY 구독 스레드
+
+    전용 연결(autocommit)에서 LISTEN하고, 알림이 오면 등록된 콜백을 백그라운드 스레드에서
+    호출합니다. 연속된 알림(예: build_index와 수집 스크립트의 연이은 버전 증가)은
+    debounce_seconds 동안 새 알림이 없을 때 마지막 버전 1번으로 합칩니다.
+    self.version은 모든 콜백이 성공한 뒤에만 갱신되며, 콜백이 실패하면 retry_seconds 후
+    (그 사이 새 알림이 오면 합쳐서) 모든 콜백을 다시 호출합니다 (콜백은 멱등이어야 함).
+    연결이 끊기면 재연결 후 현재 버전을 다시 읽어, 끊긴 동안 놓친 변경도 반영합니다.
+    """
+
+    def __init__(self, postgres_url: str, retry_seconds: float = None, debounce_seconds: float = None):
+        """
+        Args:
+            postgres_url: PostgreSQL 연결 문자열
+            retry_seconds: 재연결/콜백 재시도 대기 초 (기본: CORPUS_LISTEN_RETRY_SECONDS 또는 5)
+            debounce_seconds: 알림 합치기 대기 초 (기본: CORPUS_LISTEN_DEBOUNCE_SECONDS 또는 2)
+        """
+        self.postgres_url = postgres_url
+        self.retry_seconds = retry_seconds or float(os.getenv("CORPUS_LISTEN_RETRY_SECONDS", "5"))
+        if debounce_seconds is None:
+            debounce_seconds = float(os.getenv("CORPUS_LISTEN_DEBOUNCE_SECONDS", "2"))
+        self.debounce_seconds = debounce_seconds
+        # 모든 콜백이 반영된 버전 (콜백 실패 시 이전 버전 유지)
+        self.version: Optional[int] = None
+        self._callbacks: List[Callable[[int, Optional[str]], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_callback(self, callback: Callable[[int, Optional[str]], None]):
+        """버전 변경 콜백 등록 (callback(version, reason), 예외 시 retry_seconds 후 재호출)"""
+        self._callbacks.append(callback)
+
+    def start(self):
+        """구독 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="corpus-version-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """구독 중지 (스레드 종료 대기)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.postgres_url)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CORPUS_VERSION_CHANNEL}")
+                    # 처음 연결이면 기준 버전만 기록, 재연결이면 놓친 변경 반영
+                    cur.execute("SELECT version FROM corpus_version WHERE id = 1")
+                    row = cur.fetchone()
+                self._listen(conn, row[0] if row else None)
+            except pg_errors.UndefinedTable:
+                logger.warning("corpus_version table not found (run alembic upgrade head); listener stopped")
+                return
+            except psycopg2.Error as e:
+                logger.warning(f"Corpus version listener disconnected: {e}; retrying in {self.retry_seconds}s")
+                self._stop.wait(self.retry_seconds)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _listen(self, conn, current_version: Optional[int]):
+        """
+        알림 대기 루프 (최대 1초마다 중지 여부 확인)
+
+        Args:
+            conn: LISTEN 중인 연결
+            current_version: 연결 직후 읽은 버전 (바로 반영, 실패 시 재시도)
+        """
+        pending_version, pending_reason = current_version, "reconnect"
+        due_at = time.monotonic()
+
+        while not self._stop.is_set():
+            if pending_version is not None and time.monotonic() >= due_at:
+                if self._handle(pending_version, pending_reason):
+                    pending_version = None
+                else:
+                    logger.warning(f"Retrying corpus version {pending_version} callbacks in {self.retry_seconds}s")
+                    due_at = time.monotonic() + self.retry_seconds
+
+            timeout = 1.0
+            if pending_version is not None:
+                timeout = min(timeout, max(0.0, due_at - time.monotonic()))
+            if select.select([conn], [], [], timeout) == ([], [], []):
+                continue
+            conn.poll()
+            if not conn.notifies:
+                continue
+
+            # 쌓인 알림은 마지막 버전으로 합치고, 마지막 알림부터 debounce_seconds 대기
+            for notify in conn.notifies:
+                try:
+                    payload = json.loads(notify.payload)
+                except ValueError:
+                    continue
+                if pending_version is None or payload["version"] >= pending_version:
+                    pending_version, pending_reason = payload["version"], payload.get("reason")
+            conn.notifies.clear()
+            due_at = time.monotonic() + self.debounce_seconds
+
+    def _handle(self, version: Optional[int], reason: Optional[str]) -> bool:
+        """
+        버전이 바뀌었으면 콜백 호출 (첫 기준 버전 기록 시에는 호출하지 않음)
+
+        Returns:
+            처리 완료 여부 (콜백이 하나라도 실패하면 False, self.version 유지)
+        """
+        if version is None:
+            return True
+        previous = self.version
+        if previous is None:
+            self.version = version
+            return True
+        if version <= previous:
+            return True
+
+        logger.info(f"Corpus version changed {previous} -> {version} ({reason})")
+        succeeded = True
+        for callback in self._callbacks:
+            try:
+                callback(version, reason)
+            except Exception as e:
+                logger.error(f"Corpus version callback failed: {e}")
+                succeeded = False
+
+        if succeeded:
+            self.version = version
+        return succeeded
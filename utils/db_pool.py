@@ -0,0 +1,164 @@
+"""
+PostgreSQL Connection Pool
+
+HybridRetriever, NLMapper, ContextAssembler 등이 공유하는 스레드 안전 연결 풀입니다.
+각 컴포넌트는 연결을 소유하지 않고 작업 단위로 빌려 쓰므로,
+API 서버의 동시 요청이 하나의 연결에서 직렬화되지 않습니다.
+
+설정 (환경 변수):
+    PG_POOL_MIN      최소 연결 수 (기본: 1)
+    PG_POOL_MAX      최대 연결 수 (기본: 10)
+    PG_POOL_TIMEOUT  연결 대기 타임아웃 초 (기본: 30)
+
+Usage:
+    from utils.db_pool import get_pool
+
+    pool = get_pool(postgres_url)
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT 1")
+
+    print(pool.stats())  # 대기 시간 등 메트릭
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+import psycopg2
+from psycopg2 import pool as pg_pool
+from psycopg2 import extensions
+
+
+class ConnectionPool:
+    """대기 가능한(bounded) 스레드 안전 연결 풀"""
+
+    def __init__(
+        self,
+        postgres_url: str,
+        minconn: int = None,
+        maxconn: int = None,
+        timeout: float = None
+    ):
+        """
+        Args:
+            postgres_url: PostgreSQL 연결 문자열
+            minconn: 최소 연결 수 (기본: PG_POOL_MIN 또는 1)
+            maxconn: 최대 연결 수 (기본: PG_POOL_MAX 또는 10)
+            timeout: 연결 대기 타임아웃 초 (기본: PG_POOL_TIMEOUT 또는 30)
+        """
+        self.postgres_url = postgres_url
+        self.minconn = minconn or int(os.getenv("PG_POOL_MIN", "1"))
+        self.maxconn = maxconn or int(os.getenv("PG_POOL_MAX", "10"))
+        self.timeout = timeout or float(os.getenv("PG_POOL_TIMEOUT", "30"))
+
+        self._pool = pg_pool.ThreadedConnectionPool(self.minconn, self.maxconn, postgres_url)
+
+        # ThreadedConnectionPool은 소진 시 즉시 PoolError를 던지므로
+        # 세마포어로 maxconn까지만 진입시키고 나머지는 대기
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "acquired": 0,
+            "timeouts": 0,
+            "in_use": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    @contextmanager
+    def connection(self) -> Iterator["extensions.connection"]:
+        """
+        연결 대여 (context manager)
+
+        블록 종료 시 열린 트랜잭션은 롤백됩니다 (읽기 작업 기준).
+        쓰기 작업은 블록 안에서 conn.commit()을 명시적으로 호출하세요.
+        """
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._stats_lock:
+                self._stats["timeouts"] += 1
+            raise pg_pool.PoolError(
+                f"Timed out after {self.timeout}s waiting for a PostgreSQL connection "
+                f"(PG_POOL_MAX={self.maxconn})"
+            )
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self._stats["acquired"] += 1
+            self._stats["in_use"] += 1
+            self._stats["total_wait_ms"] += wait_ms
+            self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+
+        conn = None
+        try:
+            conn = self._pool.getconn()
+            yield conn
+        finally:
+            if conn is not None:
+                self._release(conn)
+            with self._stats_lock:
+                self._stats["in_use"] -= 1
+            self._slots.release()
+
+    def _release(self, conn):
+        """연결 반환 (트랜잭션 정리, 끊어진 연결은 폐기)"""
+        if conn.closed:
+            self._pool.putconn(conn, close=True)
+            return
+
+        try:
+            if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            self._pool.putconn(conn)
+        except psycopg2.Error:
+            self._pool.putconn(conn, close=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 메트릭 반환 (대기 시간, 사용 중 연결 수 등)"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["min_size"] = self.minconn
+        stats["max_size"] = self.maxconn
+        stats["avg_wait_ms"] = round(stats["total_wait_ms"] / stats["acquired"], 3) if stats["acquired"] else 0.0
+        stats["total_wait_ms"] = round(stats["total_wait_ms"], 3)
+        stats["max_wait_ms"] = round(stats["max_wait_ms"], 3)
+        return stats
+
+    def closeall(self):
+        """모든 연결 종료"""
+        self._pool.closeall()
+
+
+# 프로세스 전역 풀 (postgres_url별 1개)
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(postgres_url: str = None) -> ConnectionPool:
+    """
+    postgres_url에 대한 공유 연결 풀 반환 (없으면 생성)
+
+    Args:
+        postgres_url: PostgreSQL 연결 문자열 (기본: POSTGRES_URL)
+    """
+    postgres_url = postgres_url or os.getenv("POSTGRES_URL")
+    if not postgres_url:
+        raise ValueError("POSTGRES_URL environment variable is required. Check .env file.")
+
+    with _pools_lock:
+        pool = _pools.get(postgres_url)
+        if pool is None:
+            pool = ConnectionPool(postgres_url)
+            _pools[postgres_url] = pool
+        return pool
+
+
+def close_all_pools():
+    """모든 공유 풀 종료 (서버 종료 시)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
@@ -0,0 +1,202 @@
+"""
+Keyword Matcher
+
+여러 키워드의 포함 여부를 텍스트당 한 번의 스캔으로 판단하는 매처입니다.
+(키워드 × 텍스트마다 `kw in text`를 반복하던 방식 대체)
+
+- KeywordMatcher: 키워드 전체를 하나의 정규식 alternation으로 컴파일하고, lookahead로
+  각 위치에서 시작하는 가장 긴 키워드를 찾습니다. 같은 위치에서 시작하는
+  짧은 키워드(예: "암진단" 안의 "암")나 내부에 포함된 키워드는 미리 계산한
+  부분 문자열 관계로 함께 매칭 처리되므로, 결과는 키워드별 `kw in text`와 같습니다.
+  (수십 개 키워드용, 부분 문자열 관계 계산이 키워드 수의 제곱)
+- AhoCorasickMatcher: 패턴별 payload를 가진 Aho-Corasick 오토마톤. 수천 개 패턴
+  (담보명, 질병 코드 등)도 텍스트 길이에 비례하는 한 번의 스캔으로 모든 출현을 찾습니다.
+
+Usage:
+    from utils.text_matcher import get_keyword_matcher, AhoCorasickMatcher
+
+    matcher = get_keyword_matcher(["암", "암진단", "수술비"])
+    matcher.find("암진단비 3,000만원")  # {"암", "암진단"}
+
+    automaton = AhoCorasickMatcher()
+    automaton.add("암진단비", ("coverage", 0))
+    automaton.add("samsung", ("company", 1), ignore_case=True)
+    automaton.build()
+    for start, end, payload in automaton.finditer("SAMSUNG 암진단비"):
+        ...
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class KeywordMatcher:
+    """컴파일된 다중 키워드 매처 (대소문자 무시)"""
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Args:
+            keywords: 매칭할 키워드 (빈 문자열 제외)
+        """
+        self.keywords: FrozenSet[str] = frozenset(kw.lower() for kw in keywords if kw)
+
+        # 키워드 → 자신에 포함된 모든 키워드 (자신 포함)
+        self._contained: Dict[str, FrozenSet[str]] = {
+            kw: frozenset(other for other in self.keywords if other in kw)
+            for kw in self.keywords
+        }
+
+        if self.keywords:
+            # 긴 키워드 우선 → 각 위치에서 가장 긴 키워드가 매칭됨
+            alternation = "|".join(
+                re.escape(kw) for kw in sorted(self.keywords, key=len, reverse=True)
+            )
+            self._pattern = re.compile(f"(?=({alternation}))", re.IGNORECASE)
+        else:
+            self._pattern = None
+
+    def find(self, text: str) -> Set[str]:
+        """
+        텍스트에 포함된 키워드 집합 반환 (소문자 기준)
+
+        Args:
+            text: 검사할 텍스트
+
+        Returns:
+            포함된 키워드 집합
+        """
+        if not text or self._pattern is None:
+            return set()
+
+        found: Set[str] = set()
+        for longest in {match.group(1).lower() for match in self._pattern.finditer(text)}:
+            found |= self._contained.get(longest, frozenset())
+        return found
+
+    def count(self, text: str) -> int:
+        """텍스트에 포함된 서로 다른 키워드 수"""
+        return len(self.find(text))
+
+    def contains_any(self, text: str) -> bool:
+        """키워드 중 하나라도 포함되면 True"""
+        if not text or self._pattern is None:
+            return False
+        return self._pattern.search(text) is not None
+
+
+class AhoCorasickMatcher:
+    """
+    Aho-Corasick 다중 패턴 매처 (패턴별 payload, 겹치는 출현 모두 반환)
+
+    오토마톤은 소문자 기준으로 만들고, 대소문자를 구분하는 패턴은 매칭 위치의 원문과
+    다시 비교합니다. 같은 패턴에 payload를 여러 개 등록할 수 있습니다.
+    """
+
+    def __init__(self):
+        # 노드별 전이 / 실패 링크 / 출력 (패턴 길이, payload, 대소문자 구분 시 원문 패턴)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, Any, Optional[str]]]] = [[]]
+        self._pattern_count = 0
+        self._built = False
+
+    def add(self, pattern: str, payload: Any, ignore_case: bool = False):
+        """
+        패턴 등록 (build() 전에만 가능, 빈 패턴은 무시)
+
+        Args:
+            pattern: 매칭할 문자열
+            payload: 매칭 시 함께 반환할 값
+            ignore_case: 대소문자 무시 여부
+        """
+        if self._built:
+            raise RuntimeError("AhoCorasickMatcher is already built")
+        if not pattern:
+            return
+
+        node = 0
+        for char in pattern.lower():
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append((len(pattern), payload, None if ignore_case else pattern))
+        self._pattern_count += 1
+
+    def build(self) -> "AhoCorasickMatcher":
+        """실패 링크 계산 (BFS), 접미사 패턴의 출력을 각 노드에 병합"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail_child = self._goto[fail].get(char, 0)
+                self._fail[child] = fail_child if fail_child != child else 0
+                if self._outputs[self._fail[child]]:
+                    self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+        self._built = True
+        return self
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        텍스트의 모든 패턴 출현 반환
+
+        Args:
+            text: 검사할 텍스트
+
+        Yields:
+            (시작 위치, 끝 위치, payload)
+        """
+        if not self._built:
+            raise RuntimeError("AhoCorasickMatcher.build() must be called before matching")
+        if not text or not self._pattern_count:
+            return
+
+        folded = text.lower()
+        # 소문자 변환으로 길이가 바뀌는 문자가 있으면 위치 대신 포함 여부로 원문 비교
+        aligned = len(folded) == len(text)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+
+        node = 0
+        for index, char in enumerate(folded):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, payload, exact in outputs[node]:
+                start = index + 1 - length
+                if exact is not None:
+                    if aligned and text[start:index + 1] != exact:
+                        continue
+                    if not aligned and exact not in text:
+                        continue
+                yield start, index + 1, payload
+
+    def __len__(self) -> int:
+        return self._pattern_count
+
+
+@lru_cache(maxsize=256)
+def _cached_matcher(keywords: FrozenSet[str]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def get_keyword_matcher(keywords: Iterable[str]) -> KeywordMatcher:
+    """
+    키워드 집합별로 캐시된 매처 반환 (같은 키워드 집합은 한 번만 컴파일)
+
+    Args:
+        keywords: 매칭할 키워드
+
+    Returns:
+        KeywordMatcher
+    """
+    return _cached_matcher(frozenset(kw.lower() for kw in keywords if kw))
@@ -5,5 +5,7 @@ Vector Index 모듈 (OpenAI 전용)
 """
 
 from .openai_embedder import OpenAIEmbedder
+from .embedding_cache import EmbeddingCache
+from .mmap_index import MmapVectorIndex, export_mmap_index
 
-__all__ = ['OpenAIEmbedder']
+__all__ = ['OpenAIEmbedder', 'EmbeddingCache', 'MmapVectorIndex', 'export_mmap_index']
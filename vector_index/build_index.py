@@ -7,6 +7,11 @@ OpenAI 임베딩을 생성하고 clause_embedding 테이블에 저장합니다.
 
 Usage:
     python vector_index/build_index.py [--batch-size 100]
+    python -m vector_index.build_index --backfill-amounts  # coverage_amount 컬럼만 채우기
+    python -m vector_index.build_index --export-mmap       # VECTOR_BACKEND=mmap 인덱스 내보내기
+    python -m vector_index.build_index --index-sizes       # 벡터 인덱스 크기 (float32 vs 양자화)
+    VECTOR_QUANTIZATION=halfvec python -m vector_index.build_index --drop-float32-indexes
+    python -m vector_index.build_index --create-float32-indexes   # VECTOR_QUANTIZATION=none으로 되돌릴 때
 """
 
 import os
@@ -14,14 +19,34 @@ import sys
 import json
 import argparse
 import psycopg2
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 from dotenv import load_dotenv
 
 from .openai_embedder import OpenAIEmbedder
+from .mmap_index import export_mmap_index
+from utils.corpus_version import bump_corpus_version
+from ontology.catalog import refresh_coverage_name_catalog
+from ingestion.parsers.table_parser import parse_amount
 
 # .env 파일 로드
 load_dotenv()
 
+# float32 전체 벡터 HNSW 인덱스 → partial doc_type (003_pgvector_setup.sql, 115329f15216)
+# 양자화 검색(VECTOR_QUANTIZATION=halfvec|binary)은 양자화 인덱스(e2b7f4a19c6d)만 사용
+FLOAT32_HNSW_INDEXES = {
+    "idx_clause_embedding_hnsw": None,
+    "idx_clause_embedding_hnsw_proposal": "proposal",
+    "idx_clause_embedding_hnsw_product_summary": "product_summary",
+    "idx_clause_embedding_hnsw_business_spec": "business_spec",
+    "idx_clause_embedding_hnsw_terms": "terms",
+}
+
+# 양자화 모드별로 있어야 하는 인덱스 (float32 인덱스 삭제 전 확인)
+QUANTIZED_HNSW_INDEXES = {
+    "halfvec": "idx_clause_embedding_hnsw_halfvec",
+    "binary": "idx_clause_embedding_hnsw_binary",
+}
+
 
 def fetch_clauses(pg_conn, limit: int = None, min_length: int = 50) -> List[Tuple[int, str, dict]]:
     """
@@ -44,12 +69,13 @@ def fetch_clauses(pg_conn, limit: int = None, min_length: int = 50) -> List[Tupl
                 dc.structured_data,
                 d.doc_type,
                 d.product_id,
+                d.company_id,
                 ARRAY_AGG(cc.coverage_id) FILTER (WHERE cc.coverage_id IS NOT NULL) as coverage_ids
             FROM document_clause dc
             JOIN document d ON dc.document_id = d.id
             LEFT JOIN clause_coverage cc ON dc.id = cc.clause_id
             WHERE LENGTH(dc.clause_text) >= {min_length}
-            GROUP BY dc.id, dc.clause_text, dc.clause_type, dc.structured_data, d.doc_type, d.product_id
+            GROUP BY dc.id, dc.clause_text, dc.clause_type, dc.structured_data, d.doc_type, d.product_id, d.company_id
             ORDER BY dc.id
         """
 
@@ -65,12 +91,14 @@ def fetch_clauses(pg_conn, limit: int = None, min_length: int = 50) -> List[Tupl
             structured_data = row[3]
             doc_type = row[4]
             product_id = row[5]
-            coverage_ids = row[6] if row[6] else []
+            company_id = row[6]
+            coverage_ids = row[7] if row[7] else []
 
             metadata = {
                 'clause_type': clause_type,
                 'doc_type': doc_type,
                 'product_id': product_id,
+                'company_id': company_id,
                 'coverage_ids': coverage_ids
             }
 
@@ -82,6 +110,171 @@ def fetch_clauses(pg_conn, limit: int = None, min_length: int = 50) -> List[Tupl
         return results
 
 
+def parse_coverage_amount(structured_data: Optional[dict]) -> Optional[int]:
+    """
+    structured_data.coverage_amount를 원 단위 정수로 변환합니다.
+
+    Examples:
+        "3,000만원" → 30000000
+        "2억5천만원" → 250000000
+        30000000 → 30000000 (이미 숫자인 경우)
+
+    Returns:
+        금액 (원) 또는 None
+    """
+    if not structured_data:
+        return None
+
+    value = structured_data.get('coverage_amount')
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    amount, _ = parse_amount(str(value))
+    return amount
+
+
+def backfill_coverage_amounts(pg_conn, batch_size: int = 1000) -> int:
+    """
+    기존 임베딩의 coverage_amount 컬럼을 채웁니다.
+
+    Args:
+        pg_conn: PostgreSQL 연결
+        batch_size: UPDATE 배치 크기
+
+    Returns:
+        갱신된 행 수
+    """
+    with pg_conn.cursor() as cur:
+        cur.execute("""
+            SELECT id, metadata->'structured_data'
+            FROM clause_embedding
+            WHERE coverage_amount IS NULL
+              AND metadata->'structured_data' ? 'coverage_amount'
+        """)
+        rows = cur.fetchall()
+
+    updates = []
+    for embedding_id, structured_data in rows:
+        amount = parse_coverage_amount(structured_data)
+        if amount is not None:
+            updates.append((amount, embedding_id))
+
+    with pg_conn.cursor() as cur:
+        for i in range(0, len(updates), batch_size):
+            cur.executemany(
+                "UPDATE clause_embedding SET coverage_amount = %s WHERE id = %s",
+                updates[i:i + batch_size]
+            )
+            pg_conn.commit()
+
+    print(f"💰 coverage_amount backfilled: {len(updates)} / {len(rows)} rows")
+    return len(updates)
+
+
+def report_index_sizes(pg_conn) -> List[Tuple[str, int]]:
+    """
+    clause_embedding 벡터 인덱스 크기를 출력합니다.
+
+    양자화 인덱스(halfvec/binary, 마이그레이션 e2b7f4a19c6d)는 표현식 인덱스라
+    INSERT 시 자동으로 채워지므로, 여기서는 float32 인덱스 대비 크기만 확인합니다.
+
+    Returns:
+        (인덱스 이름, 바이트) 리스트
+    """
+    with pg_conn.cursor() as cur:
+        cur.execute("""
+            SELECT indexrelname, pg_relation_size(indexrelid)
+            FROM pg_stat_user_indexes
+            WHERE relname = 'clause_embedding'
+              AND indexrelname LIKE 'idx_clause_embedding_hnsw%%'
+            ORDER BY indexrelname
+        """)
+        sizes = cur.fetchall()
+
+    print(f"{'index':<48} {'size (MB)':>10}")
+    print("-" * 60)
+    for name, size in sizes:
+        print(f"{name:<48} {size / 1024 / 1024:>10.1f}")
+
+    return sizes
+
+
+def drop_float32_indexes(pg_conn) -> List[str]:
+    """
+    float32 HNSW 인덱스를 삭제합니다 (양자화 검색 전용 DB의 인덱스 메모리 절감).
+
+    VECTOR_QUANTIZATION=halfvec|binary이고 해당 양자화 인덱스가 있을 때만 실행합니다.
+    (VECTOR_QUANTIZATION=none 검색은 float32 인덱스가 없으면 전체 스캔이 됨)
+    DROP INDEX CONCURRENTLY로 검색을 막지 않습니다.
+
+    Returns:
+        삭제한 인덱스 이름 리스트
+    """
+    quantization = os.getenv("VECTOR_QUANTIZATION", "none")
+    if quantization not in QUANTIZED_HNSW_INDEXES:
+        raise ValueError(
+            "--drop-float32-indexes requires VECTOR_QUANTIZATION=halfvec|binary "
+            f"(current: {quantization}, searches still use the float32 indexes)"
+        )
+
+    with pg_conn.cursor() as cur:
+        cur.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'clause_embedding' AND indexname = ANY(%s)",
+            (list(FLOAT32_HNSW_INDEXES) + [QUANTIZED_HNSW_INDEXES[quantization]],)
+        )
+        existing = {row[0] for row in cur.fetchall()}
+    pg_conn.commit()
+
+    if QUANTIZED_HNSW_INDEXES[quantization] not in existing:
+        raise RuntimeError(
+            f"{QUANTIZED_HNSW_INDEXES[quantization]} not found (run alembic upgrade head before dropping float32 indexes)"
+        )
+
+    dropped = [name for name in FLOAT32_HNSW_INDEXES if name in existing]
+    pg_conn.autocommit = True
+    try:
+        with pg_conn.cursor() as cur:
+            for name in dropped:
+                cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                print(f"🗑️  Dropped {name}")
+    finally:
+        pg_conn.autocommit = False
+
+    print(f"✅ Dropped {len(dropped)} float32 HNSW indexes (VECTOR_QUANTIZATION={quantization})")
+    return dropped
+
+
+def create_float32_indexes(pg_conn) -> List[str]:
+    """
+    float32 HNSW 인덱스를 다시 생성합니다 (VECTOR_QUANTIZATION=none으로 되돌릴 때).
+
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS이므로 이미 있는 인덱스는 건너뜁니다.
+
+    Returns:
+        생성 대상 인덱스 이름 리스트
+    """
+    pg_conn.commit()
+    pg_conn.autocommit = True
+    try:
+        with pg_conn.cursor() as cur:
+            for name, doc_type in FLOAT32_HNSW_INDEXES.items():
+                where = f"WHERE doc_type = '{doc_type}'" if doc_type else ""
+                cur.execute(f"""
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS {name}
+                    ON clause_embedding
+                    USING hnsw (embedding vector_cosine_ops)
+                    WITH (m = 16, ef_construction = 64)
+                    {where}
+                """)
+                print(f"🔨 Created {name}")
+    finally:
+        pg_conn.autocommit = False
+
+    return list(FLOAT32_HNSW_INDEXES)
+
+
 def build_embeddings(
     pg_conn,
     batch_size: int = 100,
@@ -100,8 +293,8 @@ def build_embeddings(
     print("🔧 Using OpenAI embeddings")
     print(f"   Min text length: {min_length} chars")
 
-    # OpenAI Embedder 생성
-    embedder = OpenAIEmbedder()
+    # OpenAI Embedder 생성 (문서 임베딩은 쿼리 캐시 불필요)
+    embedder = OpenAIEmbedder(use_cache=False)
     model_name = embedder.get_model_name()
     dimension = embedder.get_dimension()
 
@@ -163,12 +356,20 @@ def build_embeddings(
                 print(f"   ❌ Error generating embeddings: {e}")
                 continue
 
-            # DB에 저장
+            # DB에 저장 (필터 컬럼은 검색 시 JSONB/조인 없이 사용하도록 비정규화)
             for clause_id, embedding, metadata in zip(clause_ids, embeddings, metadatas):
                 cur.execute("""
-                    INSERT INTO clause_embedding (clause_id, embedding, model_name, metadata)
-                    VALUES (%s, %s, %s, %s)
-                """, (clause_id, embedding, model_name, json.dumps(metadata)))
+                    INSERT INTO clause_embedding (
+                        clause_id, embedding, model_name, metadata,
+                        company_id, product_id, doc_type, clause_type, coverage_amount
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, (
+                    clause_id, embedding, model_name, json.dumps(metadata),
+                    metadata['company_id'], metadata['product_id'],
+                    metadata['doc_type'], metadata['clause_type'],
+                    parse_coverage_amount(metadata.get('structured_data'))
+                ))
 
             pg_conn.commit()
 
@@ -205,6 +406,31 @@ def main():
         default=50,
         help="최소 텍스트 길이 (기본: 50자, 노이즈 필터링)"
     )
+    parser.add_argument(
+        "--backfill-amounts",
+        action="store_true",
+        help="임베딩 생성 없이 기존 행의 coverage_amount 컬럼만 채움"
+    )
+    parser.add_argument(
+        "--index-sizes",
+        action="store_true",
+        help="벡터 인덱스 크기 출력 (float32 / halfvec / binary 비교)"
+    )
+    parser.add_argument(
+        "--drop-float32-indexes",
+        action="store_true",
+        help="float32 HNSW 인덱스 삭제 (VECTOR_QUANTIZATION=halfvec|binary일 때만)"
+    )
+    parser.add_argument(
+        "--create-float32-indexes",
+        action="store_true",
+        help="float32 HNSW 인덱스 재생성 (VECTOR_QUANTIZATION=none으로 되돌릴 때)"
+    )
+    parser.add_argument(
+        "--export-mmap",
+        action="store_true",
+        help="임베딩 생성 없이 clause_embedding을 mmap 인덱스(VECTOR_MMAP_DIR)로 내보냄"
+    )
 
     args = parser.parse_args()
 
@@ -223,12 +449,33 @@ def main():
         print("✅ Connected to PostgreSQL")
         print()
 
-        build_embeddings(
-            pg_conn,
-            batch_size=args.batch_size,
-            limit=args.limit,
-            min_length=args.min_length
-        )
+        if args.backfill_amounts:
+            backfill_coverage_amounts(pg_conn)
+            bump_corpus_version(pg_conn, "build_index:backfill_amounts")
+        elif args.index_sizes:
+            report_index_sizes(pg_conn)
+        elif args.drop_float32_indexes:
+            drop_float32_indexes(pg_conn)
+            report_index_sizes(pg_conn)
+        elif args.create_float32_indexes:
+            create_float32_indexes(pg_conn)
+            report_index_sizes(pg_conn)
+        elif args.export_mmap:
+            manifest = export_mmap_index(pg_conn)
+            print(f"✅ Exported {manifest['count']} embeddings "
+                  f"({manifest['dimension']}d, {manifest['dtype']})")
+            # Redis에 공유된 이전 스냅샷 결과 무효화 (VECTOR_BACKEND=mmap)
+            bump_corpus_version(pg_conn, "build_index:export_mmap")
+        else:
+            build_embeddings(
+                pg_conn,
+                batch_size=args.batch_size,
+                limit=args.limit,
+                min_length=args.min_length
+            )
+            # 엔티티 카탈로그 담보명 뷰 갱신 후 검색 결과 캐시 무효화 (+ NOTIFY)
+            refresh_coverage_name_catalog(pg_conn)
+            bump_corpus_version(pg_conn, "build_index")
 
         pg_conn.close()
 
@@ -0,0 +1,285 @@
+"""
+쿼리 임베딩 캐시
+
+반복되는 쿼리("삼성 암진단비", "전체 보험사 유사암 비교" 등)의 임베딩 API 호출을
+줄이기 위한 2단계 캐시입니다.
+
+- L1: 프로세스 내 LRU (OrderedDict)
+- L2: SQLite 영구 저장소 (프로세스 재시작/다중 워커 간 공유)
+
+캐시 키는 (모델명, 정규화된 쿼리 텍스트)이며, L2는 최대 항목 수를 넘으면
+마지막 접근 시각이 오래된 순서로 제거됩니다. L2 히트의 접근 시각은 메모리에
+모았다가 저장/제거 시점에 한 번에 기록합니다.
+
+SQLite 오류는 검색을 실패시키지 않습니다 (조회는 미스, 저장은 L1만 반영).
+저장소를 열 수 없으면 경고 후 L1만 사용합니다.
+
+Usage:
+    from vector_index.embedding_cache import EmbeddingCache
+
+    cache = EmbeddingCache()
+    vector = cache.get("text-embedding-3-small", "삼성 암진단비")
+    if vector is None:
+        vector = embedder.embed_query(...)
+        cache.put("text-embedding-3-small", "삼성 암진단비", vector)
+    print(cache.stats())
+"""
+
+import os
+import re
+import time
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+
+
+# 기본 영구 캐시 경로 (프로젝트 루트 기준)
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "data" / "cache" / "query_embedding_cache.sqlite3"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# L2 히트 접근 시각을 모아 두는 최대 개수 (넘으면 즉시 기록)
+ACCESS_FLUSH_SIZE = 256
+
+
+def normalize_query(text: str) -> str:
+    """
+    캐시 키용 쿼리 정규화
+
+    유니코드 NFC 정규화 + 공백 압축만 수행합니다.
+    (대소문자는 임베딩 결과에 영향을 주므로 유지)
+    """
+    if not text:
+        return ""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class EmbeddingCache:
+    """쿼리 임베딩 2단계 캐시 (LRU + SQLite)"""
+
+    def __init__(
+        self,
+        path: str = None,
+        memory_size: int = None,
+        max_entries: int = None
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로 (None이면 EMBEDDING_CACHE_PATH 또는 기본 경로, "" 이면 L2 비활성화)
+            memory_size: L1 LRU 최대 항목 수 (기본: EMBEDDING_CACHE_MEMORY_SIZE 또는 1024)
+            max_entries: L2 최대 항목 수 (기본: EMBEDDING_CACHE_MAX_ENTRIES 또는 50000)
+        """
+        if path is None:
+            path = os.getenv("EMBEDDING_CACHE_PATH", str(DEFAULT_CACHE_PATH))
+        self.path = path
+        self.memory_size = memory_size or int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "1024"))
+        self.max_entries = max_entries or int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+
+        # 히트/미스 카운터
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "puts": 0,
+            "evictions": 0,
+            "disk_errors": 0,
+        }
+
+        self._db = None
+        self._disk_count = 0
+        # L2 히트의 last_access 갱신 대기분 (key → 접근 시각)
+        self._pending_access: Dict[Tuple[str, str], float] = {}
+        if self.path:
+            try:
+                self._open_disk_store()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: embedding cache disk store disabled ({self.path}: {e})")
+                if self._db is not None:
+                    self._db.close()
+                self._db = None
+
+    def _open_disk_store(self):
+        """SQLite 저장소 초기화"""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # 검색 경로는 멀티스레드(API 서버 요청 스레드)에서 호출되므로 lock으로 직렬화
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS query_embedding (
+                model_name TEXT NOT NULL,
+                query_text TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model_name, query_text)
+            )
+        """)
+        self._db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_query_embedding_last_access
+            ON query_embedding (last_access)
+        """)
+        self._db.commit()
+        self._disk_count = self._db.execute("SELECT COUNT(*) FROM query_embedding").fetchone()[0]
+
+    def get(self, model_name: str, text: str) -> Optional[List[float]]:
+        """
+        캐시 조회 (L1 → L2 순서)
+
+        Returns:
+            임베딩 벡터 또는 None (미스)
+        """
+        key = (model_name, normalize_query(text))
+
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return vector
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT embedding FROM query_embedding WHERE model_name = ? AND query_text = ?",
+                        key
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    self._record_disk_error("get", e)
+                    row = None
+                if row:
+                    vector = array("f", row[0]).tolist()
+                    self._pending_access[key] = time.time()
+                    if len(self._pending_access) >= ACCESS_FLUSH_SIZE:
+                        self._write_disk("flush", self._flush_access)
+                    self._remember(key, vector)
+                    self._counters["disk_hits"] += 1
+                    return vector
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, model_name: str, text: str, embedding: List[float]):
+        """캐시 저장 (L1 + L2)"""
+        key = (model_name, normalize_query(text))
+
+        with self._lock:
+            self._remember(key, embedding)
+            self._counters["puts"] += 1
+
+            if self._db is not None:
+                self._write_disk("put", self._store, key, array("f", embedding).tobytes())
+                if self._disk_count > self.max_entries:
+                    self._write_disk("evict", self._evict_disk)
+
+    def _store(self, key: Tuple[str, str], blob: bytes):
+        """L2 저장 + 대기 중인 접근 시각 기록 (lock 보유 상태에서 호출)"""
+        params = (blob, time.time(), *key)
+        cur = self._db.execute(
+            "INSERT OR IGNORE INTO query_embedding "
+            "(embedding, last_access, model_name, query_text) VALUES (?, ?, ?, ?)",
+            params
+        )
+        if cur.rowcount:
+            # 새 항목만 카운트 (기존 키는 아래에서 갱신)
+            self._disk_count += 1
+        else:
+            self._db.execute(
+                "UPDATE query_embedding SET embedding = ?, last_access = ? "
+                "WHERE model_name = ? AND query_text = ?",
+                params
+            )
+        self._flush_access(commit=False)
+        self._db.commit()
+
+    def _flush_access(self, commit: bool = True):
+        """L2 히트 접근 시각 일괄 기록 (lock 보유 상태에서 호출)"""
+        if not self._pending_access:
+            return
+        self._db.executemany(
+            "UPDATE query_embedding SET last_access = ? WHERE model_name = ? AND query_text = ?",
+            [(accessed_at, *key) for key, accessed_at in self._pending_access.items()]
+        )
+        self._pending_access.clear()
+        if commit:
+            self._db.commit()
+
+    def _write_disk(self, operation: str, func, *args):
+        """L2 쓰기 실행 (SQLite 오류는 기록 후 무시, lock 보유 상태에서 호출)"""
+        try:
+            func(*args)
+        except sqlite3.Error as e:
+            self._record_disk_error(operation, e)
+            try:
+                self._db.rollback()
+            except sqlite3.Error:
+                pass
+
+    def _record_disk_error(self, operation: str, error: Exception):
+        """L2 오류 카운트 (경고는 첫 오류만 출력)"""
+        if self._counters["disk_errors"] == 0:
+            print(f"Warning: embedding cache disk {operation} failed, falling back to memory: {error}")
+        self._counters["disk_errors"] += 1
+
+    def _remember(self, key: Tuple[str, str], vector: List[float]):
+        """L1 LRU 저장 (lock 보유 상태에서 호출)"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """L2 크기 초과 시 오래된 항목 제거 (최대치의 90%까지)"""
+        self._flush_access()
+        self._disk_count = self._db.execute("SELECT COUNT(*) FROM query_embedding").fetchone()[0]
+        overflow = self._disk_count - int(self.max_entries * 0.9)
+        if overflow <= 0:
+            return
+
+        self._db.execute("""
+            DELETE FROM query_embedding
+            WHERE rowid IN (
+                SELECT rowid FROM query_embedding
+                ORDER BY last_access ASC
+                LIMIT ?
+            )
+        """, (overflow,))
+        self._db.commit()
+        self._disk_count -= overflow
+        self._counters["evictions"] += overflow
+
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스 통계 반환"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters["memory_entries"] = len(self._memory)
+            counters["disk_entries"] = self._disk_count if self._db is not None else 0
+
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return counters
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+            self._pending_access.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM query_embedding")
+                self._db.commit()
+                self._disk_count = 0
+
+    def close(self):
+        """SQLite 연결 종료"""
+        with self._lock:
+            if self._db is not None:
+                self._write_disk("flush", self._flush_access)
+                self._db.close()
+                self._db = None
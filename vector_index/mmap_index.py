@@ -0,0 +1,343 @@
+"""
+Memory-mapped Vector Index
+
+clause_embedding을 디스크의 행렬 파일로 내보내고, 프로세스 안에서
+NumPy로 필터링된 exact top-k 검색을 수행하는 백엔드입니다 (VECTOR_BACKEND=mmap).
+
+- embeddings.npy: 정규화된 임베딩 행렬 (N × dim, float32 또는 float16)
+  → np.load(mmap_mode="r")로 열어 여러 uvicorn 워커가 같은 page cache를 공유
+- meta.npz: clause_id, company_id, product_id, doc_type/clause_type 코드, coverage_amount
+- manifest.json: 차원, dtype, doc_type/clause_type 어휘, 생성 시각
+
+벡터는 L2 정규화되어 저장되므로 코사인 유사도 = 내적이며,
+pgvector의 (1 - (embedding <=> query))와 같은 값을 반환합니다.
+
+지원 필터: company_id, product_id, doc_type, clause_type, amount
+(coverage_ids, gender, age 필터는 DB 조인이 필요하므로 pgvector 백엔드 사용)
+
+설정 (환경 변수):
+    VECTOR_BACKEND      pgvector (기본) | mmap
+    VECTOR_MMAP_DIR     인덱스 디렉토리 (기본: data/vector_index)
+    VECTOR_MMAP_DTYPE   내보내기 dtype (기본: float32, float16이면 메모리 절반)
+
+Usage:
+    # 내보내기
+    python -m vector_index.build_index --export-mmap
+
+    # 검색
+    index = MmapVectorIndex("data/vector_index")
+    hits, candidate_count = index.search(query_embedding, {"company_id": 1, "doc_type": "proposal"}, top_k=30)
+    # hits: [(clause_id, similarity), ...]
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+
+DEFAULT_MMAP_DIR = "data/vector_index"
+
+# mmap 백엔드가 처리할 수 있는 필터 (clause_embedding 비정규화 컬럼)
+SUPPORTED_FILTER_KEYS = {"company_id", "product_id", "doc_type", "clause_type", "amount"}
+
+# 행렬-벡터 곱을 나누어 수행할 행 수 (float16 → float32 변환 메모리 제한)
+SEARCH_CHUNK_ROWS = 16384
+
+# NULL을 나타내는 정수 값
+NULL_ID = -1
+
+
+def export_mmap_index(
+    pg_conn,
+    output_dir: str = None,
+    dtype: str = None,
+    fetch_size: int = 2000
+) -> Dict[str, Any]:
+    """
+    clause_embedding을 memory-mapped 인덱스 파일로 내보냅니다.
+
+    임시 디렉토리에 쓴 뒤 교체하므로, 검색 중인 프로세스는 기존 파일을 계속 사용합니다.
+
+    Args:
+        pg_conn: PostgreSQL 연결
+        output_dir: 출력 디렉토리 (기본: VECTOR_MMAP_DIR 또는 data/vector_index)
+        dtype: float32 | float16 (기본: VECTOR_MMAP_DTYPE 또는 float32)
+        fetch_size: 서버 사이드 커서 fetch 크기
+
+    Returns:
+        manifest 딕셔너리
+    """
+    output_dir = Path(output_dir or os.getenv("VECTOR_MMAP_DIR", DEFAULT_MMAP_DIR))
+    dtype = dtype or os.getenv("VECTOR_MMAP_DTYPE", "float32")
+    if dtype not in ("float32", "float16"):
+        raise ValueError(f"Unsupported dtype: {dtype} (float32 | float16)")
+
+    # 행 수 조회와 스트리밍이 같은 스냅샷을 보도록 REPEATABLE READ 트랜잭션에서 실행
+    pg_conn.rollback()
+    with pg_conn.cursor() as cur:
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        cur.execute("SELECT COUNT(*), MAX(vector_dims(embedding)) FROM clause_embedding")
+        count, dimension = cur.fetchone()
+
+    if not count:
+        pg_conn.rollback()
+        raise ValueError("clause_embedding is empty. Run build_index first.")
+
+    tmp_dir = output_dir.with_name(output_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    matrix = np.lib.format.open_memmap(
+        tmp_dir / "embeddings.npy", mode="w+", dtype=dtype, shape=(count, dimension)
+    )
+    clause_ids = np.empty(count, dtype=np.int64)
+    company_ids = np.full(count, NULL_ID, dtype=np.int32)
+    product_ids = np.full(count, NULL_ID, dtype=np.int32)
+    doc_type_codes = np.full(count, NULL_ID, dtype=np.int16)
+    clause_type_codes = np.full(count, NULL_ID, dtype=np.int16)
+    coverage_amounts = np.full(count, NULL_ID, dtype=np.int64)
+
+    doc_types: Dict[str, int] = {}
+    clause_types: Dict[str, int] = {}
+
+    row_index = 0
+    # 서버 사이드(named) 커서로 스트리밍 → 전체 임베딩을 클라이언트 메모리에 올리지 않음
+    with pg_conn.cursor(name="export_mmap_index") as cur:
+        cur.itersize = fetch_size
+        cur.execute("""
+            SELECT clause_id, embedding::text, company_id, product_id,
+                   doc_type, clause_type, coverage_amount
+            FROM clause_embedding
+            ORDER BY clause_id
+        """)
+
+        for row in cur:
+            vector = np.array(json.loads(row[1]), dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            matrix[row_index] = vector / norm if norm else vector
+
+            clause_ids[row_index] = row[0]
+            if row[2] is not None:
+                company_ids[row_index] = row[2]
+            if row[3] is not None:
+                product_ids[row_index] = row[3]
+            if row[4] is not None:
+                doc_type_codes[row_index] = doc_types.setdefault(row[4], len(doc_types))
+            if row[5] is not None:
+                clause_type_codes[row_index] = clause_types.setdefault(row[5], len(clause_types))
+            if row[6] is not None:
+                coverage_amounts[row_index] = row[6]
+
+            row_index += 1
+
+    pg_conn.rollback()
+    matrix.flush()
+    del matrix
+
+    np.savez(
+        tmp_dir / "meta.npz",
+        clause_ids=clause_ids,
+        company_ids=company_ids,
+        product_ids=product_ids,
+        doc_type_codes=doc_type_codes,
+        clause_type_codes=clause_type_codes,
+        coverage_amounts=coverage_amounts,
+    )
+
+    manifest = {
+        "count": count,
+        "dimension": dimension,
+        "dtype": dtype,
+        "doc_types": sorted(doc_types, key=doc_types.get),
+        "clause_types": sorted(clause_types, key=clause_types.get),
+        "created_at": datetime.now().isoformat(),
+    }
+    with open(tmp_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # 디렉토리 교체 (기존 파일을 mmap 중인 프로세스는 삭제된 inode를 계속 사용)
+    if output_dir.exists():
+        old_dir = output_dir.with_name(output_dir.name + ".old")
+        if old_dir.exists():
+            shutil.rmtree(old_dir)
+        os.replace(output_dir, old_dir)
+        os.replace(tmp_dir, output_dir)
+        shutil.rmtree(old_dir)
+    else:
+        os.replace(tmp_dir, output_dir)
+
+    return manifest
+
+
+class MmapVectorIndex:
+    """memory-mapped 임베딩 행렬 기반 exact 벡터 검색"""
+
+    def __init__(self, index_dir: str = None):
+        """
+        Args:
+            index_dir: export_mmap_index() 출력 디렉토리
+                       (기본: VECTOR_MMAP_DIR 또는 data/vector_index)
+        """
+        self.index_dir = Path(index_dir or os.getenv("VECTOR_MMAP_DIR", DEFAULT_MMAP_DIR))
+        manifest_path = self.index_dir / "manifest.json"
+        if not manifest_path.exists():
+            raise FileNotFoundError(
+                f"mmap vector index not found: {self.index_dir} "
+                f"(python -m vector_index.build_index --export-mmap)"
+            )
+
+        # export_mmap_index()는 디렉토리를 통째로 교체하므로 manifest 수정 시각으로 재내보내기 감지
+        self.manifest_mtime_ns = manifest_path.stat().st_mtime_ns
+        with open(manifest_path, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+
+        self.matrix = np.load(self.index_dir / "embeddings.npy", mmap_mode="r")
+
+        meta = np.load(self.index_dir / "meta.npz")
+        self.clause_ids = meta["clause_ids"]
+        self.company_ids = meta["company_ids"]
+        self.product_ids = meta["product_ids"]
+        self.doc_type_codes = meta["doc_type_codes"]
+        self.clause_type_codes = meta["clause_type_codes"]
+        self.coverage_amounts = meta["coverage_amounts"]
+
+        self.doc_types: List[str] = self.manifest["doc_types"]
+        self.clause_types: List[str] = self.manifest["clause_types"]
+        self._doc_type_codes = {name: code for code, name in enumerate(self.doc_types)}
+        self._clause_type_codes = {name: code for code, name in enumerate(self.clause_types)}
+
+    def __len__(self) -> int:
+        return len(self.clause_ids)
+
+    def changed_on_disk(self) -> bool:
+        """
+        인덱스 디렉토리가 다시 내보내졌는지 여부 (--export-mmap 후 재오픈 판단용)
+
+        교체 도중(manifest가 잠시 없음)에는 False를 반환하고 다음 확인에서 감지
+        """
+        try:
+            mtime_ns = (self.index_dir / "manifest.json").stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        return mtime_ns != self.manifest_mtime_ns
+
+    @staticmethod
+    def supports(filters: Dict[str, Any]) -> bool:
+        """필터를 mmap 인덱스만으로 처리할 수 있는지 여부"""
+        return all(key in SUPPORTED_FILTER_KEYS for key, value in filters.items() if value)
+
+    def _build_mask(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """필터 → boolean mask (필터가 없으면 None)"""
+        mask = None
+
+        def combine(condition: np.ndarray):
+            nonlocal mask
+            mask = condition if mask is None else (mask & condition)
+
+        if filters.get("company_id"):
+            combine(self.company_ids == filters["company_id"])
+        if filters.get("product_id"):
+            combine(self.product_ids == filters["product_id"])
+        if filters.get("doc_type"):
+            combine(self.doc_type_codes == self._doc_type_codes.get(filters["doc_type"], -2))
+        if filters.get("clause_type"):
+            combine(self.clause_type_codes == self._clause_type_codes.get(filters["clause_type"], -2))
+        if filters.get("amount"):
+            amount_filter = filters["amount"]
+            has_amount = self.coverage_amounts != NULL_ID
+            if amount_filter.get("min"):
+                combine(has_amount & (self.coverage_amounts >= amount_filter["min"]))
+            if amount_filter.get("max"):
+                combine(has_amount & (self.coverage_amounts <= amount_filter["max"]))
+
+        return mask
+
+    def normalize_query(self, query_embedding: List[float]) -> np.ndarray:
+        """쿼리 임베딩 L2 정규화 (float32)"""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        return query / norm if norm else query
+
+    def search(
+        self,
+        query_embedding: Any,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = 10
+    ) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        필터링된 exact top-k 검색
+
+        Args:
+            query_embedding: 쿼리 임베딩 (list 또는 normalize_query() 결과)
+            filters: 필터 조건 (SUPPORTED_FILTER_KEYS)
+            top_k: 반환할 결과 개수
+
+        Returns:
+            ([(clause_id, similarity), ...] 유사도 내림차순, 필터 통과 행 수)
+        """
+        query = (
+            query_embedding if isinstance(query_embedding, np.ndarray)
+            else self.normalize_query(query_embedding)
+        )
+
+        mask = self._build_mask(filters or {})
+        rows = np.flatnonzero(mask) if mask is not None else None
+        candidate_count = len(self) if rows is None else len(rows)
+        if candidate_count == 0 or top_k <= 0:
+            return [], candidate_count
+
+        # 청크 단위 행렬-벡터 곱 + 청크별 top-k 후보만 유지
+        best_rows: List[np.ndarray] = []
+        best_scores: List[np.ndarray] = []
+        for start in range(0, candidate_count, SEARCH_CHUNK_ROWS):
+            if rows is None:
+                chunk_rows = np.arange(start, min(start + SEARCH_CHUNK_ROWS, candidate_count))
+                chunk = self.matrix[start:start + SEARCH_CHUNK_ROWS]
+            else:
+                chunk_rows = rows[start:start + SEARCH_CHUNK_ROWS]
+                chunk = self.matrix[chunk_rows]
+
+            scores = np.asarray(chunk, dtype=np.float32) @ query
+            if len(scores) > top_k:
+                keep = np.argpartition(-scores, top_k - 1)[:top_k]
+                chunk_rows, scores = chunk_rows[keep], scores[keep]
+            best_rows.append(chunk_rows)
+            best_scores.append(scores)
+
+        all_rows = np.concatenate(best_rows)
+        all_scores = np.concatenate(best_scores)
+        order = np.argsort(-all_scores, kind="stable")[:top_k]
+
+        hits = [
+            (int(self.clause_ids[all_rows[i]]), float(all_scores[i]))
+            for i in order
+        ]
+        return hits, candidate_count
+
+    def row_metadata(self, clause_id: int) -> Dict[str, Any]:
+        """clause_id의 필터 메타데이터 (clause_type, doc_type, product_id)"""
+        row = int(np.searchsorted(self.clause_ids, clause_id))
+        doc_type_code = int(self.doc_type_codes[row])
+        clause_type_code = int(self.clause_type_codes[row])
+        product_id = int(self.product_ids[row])
+        return {
+            "clause_type": self.clause_types[clause_type_code] if clause_type_code != NULL_ID else None,
+            "doc_type": self.doc_types[doc_type_code] if doc_type_code != NULL_ID else None,
+            "product_id": str(product_id) if product_id != NULL_ID else None,
+        }
+
+    def info(self) -> Dict[str, Any]:
+        """인덱스 정보 (/health 용)"""
+        return {
+            "index_dir": str(self.index_dir),
+            "count": len(self),
+            "dimension": self.manifest["dimension"],
+            "dtype": self.manifest["dtype"],
+            "created_at": self.manifest["created_at"],
+        }
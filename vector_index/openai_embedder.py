@@ -10,10 +10,12 @@ Reference: https://platform.openai.com/docs/guides/embeddings
 """
 
 import os
-from typing import List
+from typing import List, Optional, Dict, Any
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from .embedding_cache import EmbeddingCache
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -24,12 +26,16 @@ class OpenAIEmbedder:
     def __init__(
         self,
         api_key: str = None,
-        model: str = "text-embedding-3-small"
+        model: str = "text-embedding-3-small",
+        cache: Optional[EmbeddingCache] = None,
+        use_cache: bool = None
     ):
         """
         Args:
             api_key: OpenAI API Key (환경 변수에서 자동 로드)
             model: 모델 이름 (text-embedding-3-small, text-embedding-3-large)
+            cache: 쿼리 임베딩 캐시 (None이면 기본 캐시 생성)
+            use_cache: 쿼리 캐시 사용 여부 (기본: EMBEDDING_CACHE 환경 변수, 미설정 시 사용)
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -54,6 +60,11 @@ class OpenAIEmbedder:
                 f"Supported: {list(self.dimension_map.keys())}"
             )
 
+        # 쿼리 임베딩 캐시 (embed_query 전용, 문서 임베딩은 캐시하지 않음)
+        if use_cache is None:
+            use_cache = os.getenv("EMBEDDING_CACHE", "1").lower() not in ("0", "false", "off")
+        self.cache = (cache or EmbeddingCache()) if use_cache else None
+
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
         문서를 임베딩합니다.
@@ -78,6 +89,7 @@ class OpenAIEmbedder:
         쿼리를 임베딩합니다.
 
         OpenAI는 문서와 쿼리를 동일하게 처리합니다.
+        캐시가 활성화되어 있으면 동일 쿼리는 API를 호출하지 않습니다.
 
         Args:
             text: 임베딩할 쿼리
@@ -85,12 +97,58 @@ class OpenAIEmbedder:
         Returns:
             임베딩 벡터
         """
+        if self.cache is not None:
+            cached = self.cache.get(self.model, text)
+            if cached is not None:
+                return cached
+
         response = self.client.embeddings.create(
             model=self.model,
             input=[text]
         )
+        embedding = response.data[0].embedding
+
+        if self.cache is not None:
+            self.cache.put(self.model, text, embedding)
+
+        return embedding
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        여러 쿼리를 한 번의 API 호출로 임베딩합니다.
 
-        return response.data[0].embedding
+        캐시에 있는 쿼리는 제외하고, 나머지(중복 제거)만 embed_documents로
+        한 번에 요청합니다. 반환 순서는 입력 순서와 같습니다.
+
+        Args:
+            texts: 임베딩할 쿼리 리스트
+
+        Returns:
+            임베딩 벡터 리스트
+        """
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+
+        for i, text in enumerate(texts):
+            cached = self.cache.get(self.model, text) if self.cache is not None else None
+            if cached is not None:
+                embeddings[i] = cached
+            else:
+                missing.setdefault(text, []).append(i)
+
+        if missing:
+            missing_texts = list(missing.keys())
+            for text, embedding in zip(missing_texts, self.embed_documents(missing_texts)):
+                for i in missing[text]:
+                    embeddings[i] = embedding
+                if self.cache is not None:
+                    self.cache.put(self.model, text, embedding)
+
+        return embeddings
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """쿼리 캐시 히트/미스 통계 반환 (캐시 비활성화 시 빈 딕셔너리)"""
+        return self.cache.stats() if self.cache is not None else {}
 
     def get_dimension(self) -> int:
         """임베딩 차원 반환"""